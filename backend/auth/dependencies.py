@@ -4,11 +4,29 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
 
 from auth import security
-from auth_supabase import get_user_by_username_supabase
+from auth.principal_cache import PrincipalCache
+from auth_supabase import get_user_principal_supabase
+from config import settings
+from events.handlers import cache_invalidation_handler
 from models import UserRead
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
+# Authenticated users, so protected requests do not each hit the user table
+principal_cache = PrincipalCache(
+    ttl_seconds=settings.principal_cache_ttl_seconds,
+    max_size=settings.principal_cache_max_size
+)
+
+def invalidate_user_principal(username: str) -> None:
+    """Forget a cached principal after its role, active status or password changes"""
+    principal_cache.invalidate(username)
+
+# User changes recorded in the event outbox drop the cached principal in every worker (events.invalidation)
+cache_invalidation_handler.register(
+    "user", lambda event: invalidate_user_principal((event.get("payload") or {}).get("username", ""))
+)
+
 async def get_current_user(
     token: str = Depends(oauth2_scheme)
 ) -> UserRead:
@@ -23,8 +41,20 @@ async def get_current_user(
     username: str = payload.get("sub")
     if username is None:
         raise credentials_exception
+    # Tokens issued before token versioning carry no "ver" claim
+    token_version = payload.get("ver", 0)
 
-    user = await get_user_by_username_supabase(username=username)
-    if user is None:
+    user = principal_cache.get(username, token_version)
+    if user is not None:
+        return user
+
+    principal = await get_user_principal_supabase(username=username)
+    if principal is None:
+        raise credentials_exception
+    user, current_version = principal
+    if token_version != current_version:
+        # Token was issued before the user's tokens were revoked
         raise credentials_exception
-    return UserRead.model_validate(user)
\ No newline at end of file
+
+    principal_cache.set(username, token_version, user)
+    return user
@@ -0,0 +1,92 @@
+# auth/password_pool.py
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from tracing.tracer import tracer
+
+class PasswordPoolBusy(Exception):
+    """Raised when too many password operations are already queued"""
+
+class PasswordPool:
+    """Bounded thread pool for bcrypt work.
+
+    bcrypt releases the GIL while hashing, so a few threads keep hashes off
+    the event loop without the pickling overhead of a process pool. At most
+    `max_pending` operations may be running or queued; beyond that callers
+    get PasswordPoolBusy instead of waiting behind a login burst.
+    """
+
+    def __init__(self, max_workers: int = 0, max_pending: int = 64):
+        self.max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self._busy_seconds = 0.0
+        self._wait_seconds = 0.0
+
+    def _timed(self, queued_at: float, func: Callable[..., Any], *args: Any) -> Any:
+        started = time.perf_counter()
+        with self._lock:
+            self.running += 1
+            self._wait_seconds += started - queued_at
+        try:
+            return func(*args)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.completed += 1
+                self._busy_seconds += time.perf_counter() - started
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolBusy("Password hashing queue is full")
+            self.pending += 1
+        try:
+            with tracer.start_span(f"password {getattr(func, '__name__', 'operation')}", attributes={"password_pool.pending": self.pending}):
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self._executor, self._timed, time.perf_counter(), func, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    async def warm(self) -> None:
+        """Start every worker thread up front instead of on the first logins"""
+        loop = asyncio.get_running_loop()
+        barrier = threading.Barrier(self.max_workers, timeout=5)
+        await asyncio.gather(*[
+            loop.run_in_executor(self._executor, barrier.wait) for _ in range(self.max_workers)
+        ])
+
+    def record_rehash(self) -> None:
+        with self._lock:
+            self.rehashed += 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            completed = self.completed or 1
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "queued": self.pending - self.running,
+                "running": self.running,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "rehashed": self.rehashed,
+                "avg_hash_ms": round(self._busy_seconds / completed * 1000, 2),
+                "avg_wait_ms": round(self._wait_seconds / completed * 1000, 2),
+            }
@@ -0,0 +1,59 @@
+# auth/principal_cache.py
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple, Hashable
+
+from models import UserRead
+
+class PrincipalCache:
+    """Short-lived, size-bounded cache of authenticated users.
+
+    Entries are keyed by (subject, token version), expire after `ttl_seconds`
+    and are evicted least-recently-used once `max_size` is reached. The TTL
+    bounds how long a role, active-status or password change made by another
+    process can go unnoticed; changes made in this process call `invalidate`.
+    """
+
+    def __init__(self, ttl_seconds: float = 30.0, max_size: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, UserRead]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subject: str, token_version: Hashable) -> Optional[UserRead]:
+        key = (subject, token_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, subject: str, token_version: Hashable, user: UserRead) -> None:
+        key = (subject, token_version)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, subject: str) -> None:
+        """Drop every cached token version for a subject"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == subject]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -4,9 +4,44 @@ Supabase-compatible authentication functions
 """
 
 from supabase_client import supabase
-from auth.security import get_password_hash, verify_password
+from auth.security import get_password_hash, get_password_hash_async, verify_password
 from models import User, UserRead, UserCreate
-from typing import Optional
+from typing import Optional, Tuple
+
+# Columns UserRead needs, plus the token version used to validate access tokens
+USER_PRINCIPAL_COLUMNS = "id, username, email, role, is_active, reputation_score, token_version, created_at, updated_at"
+
+class UserConflictError(Exception):
+    """Raised when registration hits an existing username or email"""
+
+    def __init__(self, field: str):
+        super().__init__(f"{field} already registered")
+        self.field = field
+
+def _user_from_row(user_data: dict) -> User:
+    return User(
+        id=user_data["id"],
+        username=user_data["username"],
+        email=user_data["email"],
+        hashed_password=user_data["hashed_password"],
+        role=user_data.get("role", "user"),
+        is_active=user_data.get("is_active", True),
+        reputation_score=user_data.get("reputation_score", 0),
+        token_version=user_data.get("token_version", 0),
+        created_at=user_data["created_at"],
+        updated_at=user_data["updated_at"]
+    )
+
+async def get_user_by_login_identifier_supabase(identifier: str) -> Optional[User]:
+    """Get user by username or email in one round-trip, preferring a username match"""
+    try:
+        result = supabase.rpc('get_user_by_login', {'p_identifier': identifier}).execute()
+        if result.data:
+            return _user_from_row(result.data[0])
+        return None
+    except Exception as e:
+        print(f"Error getting user by login identifier: {e}")
+        return None
 
 async def get_user_by_username_supabase(username: str) -> Optional[User]:
     """Get user by username using Supabase"""
@@ -14,72 +49,75 @@ async def get_user_by_username_supabase(username: str) -> Optional[User]:
         result = supabase.table("user").select("*").eq("username", username).execute()
         if result.data:
             user_data = result.data[0]
-            return User(
-                id=user_data["id"],
-                username=user_data["username"],
-                email=user_data["email"],
-                hashed_password=user_data["hashed_password"],
-                role=user_data.get("role", "user"),
-                is_active=user_data.get("is_active", True),
-                reputation_score=user_data.get("reputation_score", 0),
-                created_at=user_data["created_at"],
-                updated_at=user_data["updated_at"]
-            )
+            return _user_from_row(user_data)
         return None
     except Exception as e:
         print(f"Error getting user by username: {e}")
         return None
 
+async def get_user_principal_supabase(username: str) -> Optional[Tuple[UserRead, int]]:
+    """Get the authenticated principal for a username without loading the password hash"""
+    try:
+        result = supabase.table("user").select(USER_PRINCIPAL_COLUMNS).eq("username", username).execute()
+        if result.data:
+            user_data = result.data[0]
+            return UserRead.model_validate(user_data), user_data.get("token_version") or 0
+        return None
+    except Exception as e:
+        print(f"Error getting user principal: {e}")
+        return None
+
 async def get_user_by_email_supabase(email: str) -> Optional[User]:
     """Get user by email using Supabase"""
     try:
         result = supabase.table("user").select("*").eq("email", email).execute()
         if result.data:
             user_data = result.data[0]
-            return User(
-                id=user_data["id"],
-                username=user_data["username"],
-                email=user_data["email"],
-                hashed_password=user_data["hashed_password"],
-                role=user_data.get("role", "user"),
-                is_active=user_data.get("is_active", True),
-                reputation_score=user_data.get("reputation_score", 0),
-                created_at=user_data["created_at"],
-                updated_at=user_data["updated_at"]
-            )
+            return _user_from_row(user_data)
         return None
     except Exception as e:
         print(f"Error getting user by email: {e}")
         return None
 
 async def create_user_supabase(user_in: UserCreate) -> User:
-    """Create user using Supabase"""
+    """Create user using Supabase.
+
+    The insert is atomic against the case-insensitive unique indexes on
+    username and email; a clash raises UserConflictError naming the field.
+    """
     try:
-        hashed_password = get_password_hash(user_in.password)
-        result = supabase.table("user").insert({
-            "username": user_in.username,
-            "email": user_in.email,
-            "hashed_password": hashed_password
+        hashed_password = await get_password_hash_async(user_in.password)
+        result = supabase.rpc('register_user', {
+            'p_username': user_in.username,
+            'p_email': user_in.email,
+            'p_hashed_password': hashed_password
         }).execute()
-        
-        if result.data:
-            user_data = result.data[0]
-            return User(
-                id=user_data["id"],
-                username=user_data["username"],
-                email=user_data["email"],
-                hashed_password=user_data["hashed_password"],
-                role=user_data.get("role", "user"),
-                is_active=user_data.get("is_active", True),
-                reputation_score=user_data.get("reputation_score", 0),
-                created_at=user_data["created_at"],
-                updated_at=user_data["updated_at"]
-            )
+
+        outcome = result.data or {}
+        if outcome.get("conflict"):
+            raise UserConflictError(outcome["conflict"])
+        if outcome.get("user"):
+            return _user_from_row(outcome["user"])
         raise Exception("Failed to create user")
+    except UserConflictError:
+        raise
     except Exception as e:
         print(f"Error creating user: {e}")
         raise
 
+async def rehash_user_password_supabase(user_id: int, old_hash: str, new_hash: str) -> bool:
+    """Replace a password hash with one using current parameters, keeping issued tokens valid"""
+    try:
+        result = supabase.rpc('rehash_user_password', {
+            'p_user_id': user_id,
+            'p_old_hash': old_hash,
+            'p_new_hash': new_hash
+        }).execute()
+        return bool(result.data)
+    except Exception as e:
+        print(f"Error rehashing user password: {e}")
+        return False
+
 def create_admin_user():
     """Create admin user for testing"""
     try:
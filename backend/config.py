@@ -1,7 +1,7 @@
 # config.py
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from functools import lru_cache
-from typing import Optional
+from typing import Optional, List, Dict
 
 class Settings(BaseSettings):
     # Supabase configuration
@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     jwt_secret: str
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30  # Reduced from 60 for better security
+    principal_cache_ttl_seconds: float = 30.0
+    principal_cache_max_size: int = 10000
+    bcrypt_rounds: int = 12  # Raising this upgrades existing hashes as users log in
+    password_hash_workers: int = 0  # 0 picks min(4, cpu count)
+    password_hash_max_pending: int = 64
     
     # SSL Configuration
     ssl_enabled: bool = False
@@ -28,10 +33,56 @@ class Settings(BaseSettings):
     log_level: str = "INFO"
     log_file: str = "logs/afropedia.log"
     log_format: str = "standard"  # "standard" or "json"
+    log_queue_size: int = 10000  # Records beyond this are dropped rather than blocking requests
+    log_max_bytes: int = 10 * 1024 * 1024
+    log_backup_count: int = 5
+    log_success_sample_rate: float = 0.1  # Share of fast 2xx/3xx requests logged; errors and slow requests always are
+    log_slow_request_ms: float = 1000.0
+    log_headers: List[str] = ["user-agent", "referer", "origin", "content-type", "content-length", "accept"]
     
     # Search Configuration
     meilisearch_url: str = "http://localhost:7700"
     meilisearch_master_key: str = "masterKey"
+    title_catalog_ttl_seconds: float = 60.0
+    reference_cache_size: int = 512  # Revisions whose parsed references are kept in memory
+    metrics_multiprocess_dir: str = ""  # Shared by uvicorn workers so /metrics covers all of them
+    metrics_flush_interval_seconds: float = 15.0
+    query_tracing_enabled: bool = True
+    tracing_enabled: bool = False
+    tracing_exporter: str = "console"  # "console", "file", "none" or a registered exporter
+    tracing_file: str = "logs/traces.jsonl"
+    tracing_sample_rate: float = 1.0  # Share of new traces recorded; incoming traceparent flags take precedence
+    health_check_timeout_seconds: float = 5.0
+    health_check_intervals: Dict[str, float] = {"database": 10.0, "search": 30.0, "system_resources": 15.0}
+    slow_request_capture_ms: float = 2000.0  # Requests slower than this keep a stack sample and query trace; 0 disables
+    profiler_max_seconds: float = 60.0
+    query_repeat_warning_threshold: int = 10  # Same query shape more often than this in one request logs a possible N+1
+    search_index_warmup_enabled: bool = False  # Re-apply MeiliSearch index settings at startup
+    
+    # Event Outbox Worker
+    outbox_worker_enabled: bool = True
+    outbox_batch_size: int = 20
+    outbox_poll_interval_seconds: float = 2.0
+    outbox_max_attempts: int = 5
+    event_broker_url: str = "memory://"  # redis://host:6379/0 so SSE clients hear events published by any worker
+    cache_invalidation_poll_seconds: float = 2.0  # Every worker reads user/article events to drop its cached copies
+    overdue_scan_interval_seconds: float = 300.0
+    
+    # Bulk Import
+    import_batch_size: int = 200  # Records per database round trip
+    import_media_concurrency: int = 4  # Media files encoded and uploaded at once
+    import_checkpoint_dir: str = "imports"  # Progress of uploaded archives, keyed by content hash
+    
+    # Startup
+    warmup_mode: str = "blocking"  # "blocking" warms before serving, "background" serves immediately, "off"
+    lazy_router_loading: bool = False  # Import on_demand_routers on their first request
+    on_demand_routers: List[str] = ["supabase_router"]
+    
+    # Rate Limiting
+    rate_limit_enabled: bool = True
+    rate_limit_storage_url: str = "memory://"  # redis://host:6379/0 to share budgets across workers
+    rate_limits: Dict[str, str] = {}  # Per-budget overrides, e.g. {"search": "120/minute"}
+    trusted_proxies: List[str] = []  # CIDRs allowed to set X-Forwarded-For, e.g. ["10.0.0.0/8"]
     
     # SSL Certificate Bundle Configuration (for fixing certificate verification issues)
     requests_ca_bundle: Optional[str] = None  
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Script to create the event outbox table, its claim function and the moderation triggers that feed it
+"""
+
+from supabase_client import supabase
+
+def create_outbox_table():
+    """Create the event_outbox table"""
+    try:
+        outbox_sql = """
+        CREATE TABLE IF NOT EXISTS event_outbox (
+            id BIGSERIAL PRIMARY KEY,
+            event_type VARCHAR(100) NOT NULL,
+            aggregate_type VARCHAR(50) NOT NULL,
+            aggregate_id INTEGER NOT NULL,
+            payload JSONB NOT NULL DEFAULT '{}'::JSONB,
+            idempotency_key VARCHAR(255) NOT NULL UNIQUE,
+            status VARCHAR(20) NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            completed_handlers TEXT[] NOT NULL DEFAULT '{}',
+            last_error TEXT,
+            available_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            locked_until TIMESTAMP WITH TIME ZONE,
+            created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+            processed_at TIMESTAMP WITH TIME ZONE
+        );
+        """
+
+        supabase.rpc('exec_sql', {'sql': outbox_sql}).execute()
+        print("✅ event_outbox table created successfully")
+
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_event_outbox_ready ON event_outbox(status, available_at);
+        CREATE INDEX IF NOT EXISTS idx_event_outbox_aggregate ON event_outbox(aggregate_type, aggregate_id);
+        -- Every worker polls recent events of the types it caches
+        CREATE INDEX IF NOT EXISTS idx_event_outbox_recent ON event_outbox(aggregate_type, created_at);
+        """
+
+        supabase.rpc('exec_sql', {'sql': index_sql}).execute()
+        print("✅ event_outbox indexes created successfully")
+
+    except Exception as e:
+        print(f"❌ Error creating event_outbox table: {e}")
+
+def create_claim_function():
+    """Create the function workers use to lease ready events"""
+    try:
+        claim_sql = """
+        CREATE OR REPLACE FUNCTION claim_outbox_events(
+            p_limit INTEGER DEFAULT 20,
+            p_lease_seconds INTEGER DEFAULT 60
+        ) RETURNS SETOF event_outbox
+        LANGUAGE sql AS $$
+            WITH picked AS (
+                SELECT id FROM event_outbox
+                WHERE (status = 'pending' AND available_at <= NOW())
+                   OR (status = 'processing' AND locked_until < NOW())
+                ORDER BY id
+                LIMIT p_limit
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE event_outbox e
+            SET status = 'processing',
+                attempts = e.attempts + 1,
+                locked_until = NOW() + make_interval(secs => p_lease_seconds)
+            FROM picked
+            WHERE e.id = picked.id
+            RETURNING e.*;
+        $$;
+        """
+
+        supabase.rpc('exec_sql', {'sql': claim_sql}).execute()
+        print("✅ claim_outbox_events created successfully")
+
+    except Exception as e:
+        print(f"❌ Error creating claim function: {e}")
+
+def create_moderation_triggers():
+    """Write outbox events in the same transaction as revision and article state changes"""
+    try:
+        trigger_sql = """
+        -- Trace context of the API request behind the change. PostgREST exposes
+        -- request headers as request.headers and the API sends traceparent on
+        -- every query while tracing is on; empty outside a traced request.
+        CREATE OR REPLACE FUNCTION outbox_trace_context() RETURNS JSONB
+        LANGUAGE sql STABLE AS $$
+            SELECT jsonb_strip_nulls(jsonb_build_object(
+                'traceparent', headers->>'traceparent',
+                'tracestate', headers->>'tracestate'
+            ))
+            FROM (SELECT NULLIF(current_setting('request.headers', TRUE), '')::JSONB AS headers) AS request;
+        $$;
+
+        CREATE OR REPLACE FUNCTION enqueue_revision_status_event() RETURNS TRIGGER
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF NEW.status IS DISTINCT FROM OLD.status THEN
+                INSERT INTO event_outbox (event_type, aggregate_type, aggregate_id, payload, idempotency_key)
+                VALUES (
+                    'revision.status_changed',
+                    'revision',
+                    NEW.id,
+                    jsonb_build_object(
+                        'revision_id', NEW.id,
+                        'article_id', NEW.article_id,
+                        'user_id', NEW.user_id,
+                        'old_status', OLD.status,
+                        'status', NEW.status
+                    ) || outbox_trace_context(),
+                    format('revision.status_changed:%s:%s:%s', NEW.id, NEW.status, txid_current())
+                )
+                ON CONFLICT (idempotency_key) DO NOTHING;
+            END IF;
+            RETURN NEW;
+        END;
+        $$;
+
+        DROP TRIGGER IF EXISTS revision_status_outbox_trigger ON revision;
+        CREATE TRIGGER revision_status_outbox_trigger
+            AFTER UPDATE OF status ON revision
+            FOR EACH ROW EXECUTE FUNCTION enqueue_revision_status_event();
+
+        CREATE OR REPLACE FUNCTION enqueue_article_updated_event() RETURNS TRIGGER
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF NEW.status IS DISTINCT FROM OLD.status
+               OR NEW.current_revision_id IS DISTINCT FROM OLD.current_revision_id THEN
+                INSERT INTO event_outbox (event_type, aggregate_type, aggregate_id, payload, idempotency_key)
+                VALUES (
+                    'article.updated',
+                    'article',
+                    NEW.id,
+                    jsonb_build_object(
+                        'article_id', NEW.id,
+                        'title', NEW.title,
+                        'status', NEW.status,
+                        'current_revision_id', NEW.current_revision_id
+                    ) || outbox_trace_context(),
+                    format('article.updated:%s:%s', NEW.id, txid_current())
+                )
+                ON CONFLICT (idempotency_key) DO NOTHING;
+            END IF;
+            RETURN NEW;
+        END;
+        $$;
+
+        DROP TRIGGER IF EXISTS article_outbox_trigger ON article;
+        CREATE TRIGGER article_outbox_trigger
+            AFTER UPDATE OF status, current_revision_id ON article
+            FOR EACH ROW EXECUTE FUNCTION enqueue_article_updated_event();
+        """
+
+        supabase.rpc('exec_sql', {'sql': trigger_sql}).execute()
+        print("✅ Outbox triggers created successfully")
+
+    except Exception as e:
+        print(f"❌ Error creating outbox triggers: {e}")
+
+def test_tables():
+    """Test that the outbox is accessible"""
+    try:
+        supabase.table("event_outbox").select("id").limit(1).execute()
+        print("✅ event_outbox table is accessible")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing event_outbox: {e}")
+        return False
+
+def main():
+    print("🚀 Creating the moderation event outbox...")
+
+    create_outbox_table()
+    create_claim_function()
+    create_moderation_triggers()
+
+    if test_tables():
+        print("✅ Event outbox ready!")
+        print("\n📋 Objects created:")
+        print("  - event_outbox: Events written alongside moderation state changes")
+        print("  - claim_outbox_events: Leases ready events to a worker (SKIP LOCKED)")
+        print("  - outbox_trace_context: Trace context of the request behind a triggered event")
+        print("  - revision_status_outbox_trigger: revision.status_changed events")
+        print("  - article_outbox_trigger: article.updated events")
+    else:
+        print("❌ Event outbox setup failed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Script to create the batched article import function in Supabase
+"""
+
+from supabase_client import supabase
+
+def create_import_functions():
+    """Create the function that inserts a batch of articles with their revisions, comments and references"""
+    try:
+        functions_sql = """
+        -- p_articles: [{title, content, comment, user_id, created_at,
+        --               comments: [{content, user_id, created_at}],
+        --               references: [{source_id, context, page_number, section}]}]
+        -- One transaction per batch. Titles that already exist are skipped, so
+        -- re-running a partly imported batch is safe; only new articles are returned.
+        CREATE OR REPLACE FUNCTION import_article_batch(p_articles JSONB)
+        RETURNS TABLE (out_title TEXT, out_article_id INTEGER, out_revision_id INTEGER)
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            item JSONB;
+            item_created_at TIMESTAMP;
+            new_article_id INTEGER;
+            new_revision_id INTEGER;
+        BEGIN
+            -- Keeps the reference triggers from replacing imported updated_at values
+            PERFORM set_config('afropedia.importing', 'on', TRUE);
+            FOR item IN SELECT value FROM jsonb_array_elements(p_articles) LOOP
+                item_created_at := COALESCE((item->>'created_at')::TIMESTAMP, NOW()::TIMESTAMP);
+                new_article_id := NULL;
+
+                INSERT INTO article (title, created_at, updated_at)
+                VALUES (item->>'title', item_created_at, item_created_at)
+                ON CONFLICT (title) DO NOTHING
+                RETURNING id INTO new_article_id;
+
+                CONTINUE WHEN new_article_id IS NULL;
+
+                INSERT INTO revision (content, comment, article_id, user_id, timestamp)
+                VALUES (item->>'content', item->>'comment', new_article_id, (item->>'user_id')::INTEGER, item_created_at)
+                RETURNING id INTO new_revision_id;
+
+                UPDATE article SET current_revision_id = new_revision_id WHERE id = new_article_id;
+
+                INSERT INTO comment (content, revision_id, user_id, created_at)
+                SELECT c->>'content', new_revision_id, (c->>'user_id')::INTEGER,
+                       COALESCE((c->>'created_at')::TIMESTAMP, item_created_at)
+                FROM jsonb_array_elements(COALESCE(item->'comments', '[]'::JSONB)) AS c;
+
+                INSERT INTO reference (article_id, source_id, reference_number, context, page_number, section, created_by)
+                SELECT new_article_id, (r->>'source_id')::INTEGER, n::INTEGER,
+                       r->>'context', r->>'page_number', r->>'section', (item->>'user_id')::INTEGER
+                FROM jsonb_array_elements(COALESCE(item->'references', '[]'::JSONB)) WITH ORDINALITY AS refs(r, n);
+
+                out_title := item->>'title';
+                out_article_id := new_article_id;
+                out_revision_id := new_revision_id;
+                RETURN NEXT;
+            END LOOP;
+            PERFORM set_config('afropedia.importing', 'off', TRUE);
+        END;
+        $$;
+        """
+
+        supabase.rpc('exec_sql', {'sql': functions_sql}).execute()
+        print("✅ Import functions created successfully")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error creating import functions: {e}")
+        return False
+
+def create_import_indexes():
+    """Create indexes used to resolve existing books and sources in bulk"""
+    try:
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_book_title ON book(title);
+        CREATE INDEX IF NOT EXISTS idx_source_url ON source(url);
+        """
+
+        supabase.rpc('exec_sql', {'sql': index_sql}).execute()
+        print("✅ Import indexes created successfully")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error creating import indexes: {e}")
+        return False
+
+def test_functions():
+    """Test that the import function is callable"""
+    try:
+        supabase.rpc('import_article_batch', {'p_articles': []}).execute()
+        print("✅ Import functions are accessible")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing import functions: {e}")
+        return False
+
+def main():
+    print("🚀 Setting up bulk import...")
+
+    create_import_indexes()
+    create_import_functions()
+
+    if test_functions():
+        print("✅ Bulk import ready!")
+        print("\n📋 Objects created:")
+        print("  - import_article_batch: Articles, revisions, comments and references in one transaction")
+        print("  - idx_book_title / idx_source_url: Bulk duplicate and source lookups")
+    else:
+        print("❌ Bulk import setup failed")
+
+if __name__ == "__main__":
+    main()
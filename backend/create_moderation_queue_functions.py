@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Script to add leasing columns and work-queue functions to moderation_queue in Supabase
+"""
+
+from supabase_client import supabase
+
+def add_lease_columns():
+    """Add lease tracking columns and the priority-ordered index"""
+    try:
+        columns_sql = """
+        ALTER TABLE moderation_queue ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP WITH TIME ZONE;
+        ALTER TABLE moderation_queue ADD COLUMN IF NOT EXISTS priority_rank SMALLINT GENERATED ALWAYS AS (
+            CASE priority
+                WHEN 'urgent' THEN 3
+                WHEN 'high' THEN 2
+                WHEN 'normal' THEN 1
+                ELSE 0
+            END
+        ) STORED;
+        """
+
+        supabase.rpc('exec_sql', {'sql': columns_sql}).execute()
+        print("✅ Lease columns added successfully")
+
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_moderation_queue_claim
+            ON moderation_queue(status, priority_rank DESC, created_at ASC);
+        CREATE INDEX IF NOT EXISTS idx_moderation_queue_lease_expires_at
+            ON moderation_queue(lease_expires_at) WHERE status = 'in_review';
+        """
+
+        supabase.rpc('exec_sql', {'sql': index_sql}).execute()
+        print("✅ Work-queue indexes created successfully")
+
+    except Exception as e:
+        print(f"❌ Error adding lease columns: {e}")
+
+def create_queue_functions():
+    """Create the claim, renew, release and requeue functions"""
+    try:
+        claim_sql = """
+        CREATE OR REPLACE FUNCTION claim_moderation_items(
+            p_moderator_id INTEGER,
+            p_limit INTEGER DEFAULT 10,
+            p_lease_seconds INTEGER DEFAULT 900
+        ) RETURNS SETOF moderation_queue
+        LANGUAGE sql AS $$
+            WITH picked AS (
+                SELECT id FROM moderation_queue
+                WHERE status = 'pending'
+                   OR (status = 'in_review' AND lease_expires_at < NOW())
+                ORDER BY priority_rank DESC, created_at ASC
+                LIMIT p_limit
+                FOR UPDATE SKIP LOCKED
+            )
+            UPDATE moderation_queue q
+            SET status = 'in_review',
+                assigned_to = p_moderator_id,
+                lease_expires_at = NOW() + make_interval(secs => p_lease_seconds),
+                updated_at = NOW()
+            FROM picked
+            WHERE q.id = picked.id
+            RETURNING q.*;
+        $$;
+        """
+
+        supabase.rpc('exec_sql', {'sql': claim_sql}).execute()
+        print("✅ claim_moderation_items created successfully")
+
+        lease_sql = """
+        CREATE OR REPLACE FUNCTION renew_moderation_lease(
+            p_item_id INTEGER,
+            p_moderator_id INTEGER,
+            p_lease_seconds INTEGER DEFAULT 900
+        ) RETURNS BOOLEAN
+        LANGUAGE sql AS $$
+            WITH renewed AS (
+                UPDATE moderation_queue
+                SET lease_expires_at = NOW() + make_interval(secs => p_lease_seconds),
+                    updated_at = NOW()
+                WHERE id = p_item_id
+                  AND assigned_to = p_moderator_id
+                  AND status = 'in_review'
+                  AND lease_expires_at >= NOW()
+                RETURNING id
+            )
+            SELECT EXISTS (SELECT 1 FROM renewed);
+        $$;
+
+        CREATE OR REPLACE FUNCTION release_moderation_lease(
+            p_item_id INTEGER,
+            p_moderator_id INTEGER
+        ) RETURNS BOOLEAN
+        LANGUAGE sql AS $$
+            WITH released AS (
+                UPDATE moderation_queue
+                SET status = 'pending',
+                    assigned_to = NULL,
+                    lease_expires_at = NULL,
+                    updated_at = NOW()
+                WHERE id = p_item_id
+                  AND assigned_to = p_moderator_id
+                  AND status = 'in_review'
+                RETURNING id
+            )
+            SELECT EXISTS (SELECT 1 FROM released);
+        $$;
+
+        CREATE OR REPLACE FUNCTION requeue_expired_moderation_leases()
+        RETURNS INTEGER
+        LANGUAGE sql AS $$
+            WITH expired AS (
+                UPDATE moderation_queue
+                SET status = 'pending',
+                    assigned_to = NULL,
+                    lease_expires_at = NULL,
+                    updated_at = NOW()
+                WHERE status = 'in_review'
+                  AND lease_expires_at < NOW()
+                RETURNING id
+            )
+            SELECT COUNT(*)::INTEGER FROM expired;
+        $$;
+        """
+
+        supabase.rpc('exec_sql', {'sql': lease_sql}).execute()
+        print("✅ Lease functions created successfully")
+
+    except Exception as e:
+        print(f"❌ Error creating queue functions: {e}")
+
+def test_functions():
+    """Test that the functions are callable"""
+    try:
+        supabase.rpc('requeue_expired_moderation_leases', {}).execute()
+        print("✅ Work-queue functions are accessible")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing functions: {e}")
+        return False
+
+def main():
+    print("🚀 Setting up the moderation work queue...")
+
+    add_lease_columns()
+    create_queue_functions()
+
+    if test_functions():
+        print("✅ Moderation work queue ready!")
+        print("\n📋 Functions created:")
+        print("  - claim_moderation_items: Lease the next N items by priority, then age (SKIP LOCKED)")
+        print("  - renew_moderation_lease: Extend a lease held by a moderator")
+        print("  - release_moderation_lease: Hand an item back to the queue")
+        print("  - requeue_expired_moderation_leases: Return expired leases to pending")
+    else:
+        print("❌ Work queue setup failed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Script to create the (sort key, id) indexes behind keyset pagination in Supabase
+"""
+
+from supabase_client import supabase
+
+# One index per cursor listing: (sort column, id) in the listing's order
+PAGINATION_INDEXES = [
+    ('idx_article_title_id', 'article', 'title, id'),
+    ('idx_article_created_at_id', 'article', 'created_at, id'),
+    ('idx_article_updated_at_id', 'article', 'updated_at, id'),
+    ('idx_book_title_id', 'book', 'title, id'),
+    ('idx_book_created_at_id', 'book', 'created_at, id'),
+    ('idx_book_updated_at_id', 'book', 'updated_at, id'),
+    ('idx_moderation_queue_created_at_id', 'moderation_queue', 'created_at DESC, id DESC'),
+    ('idx_moderation_action_created_at_id', 'moderation_action', 'created_at DESC, id DESC'),
+    ('idx_content_flag_created_at_id', 'content_flag', 'created_at DESC, id DESC'),
+    ('idx_peer_review_reviewer_created_at_id', 'peer_review', 'reviewer_id, created_at DESC, id DESC'),
+    # Change timestamps filtered by incremental exports (article and book use the indexes above)
+    ('idx_image_metadata_uploaded_at', 'image_metadata', 'uploaded_at'),
+    ('idx_videos_timestamp', 'videos', 'timestamp'),
+]
+
+def create_pagination_indexes():
+    """Create the keyset pagination indexes"""
+    created = 0
+    for name, table, columns in PAGINATION_INDEXES:
+        try:
+            index_sql = f'CREATE INDEX IF NOT EXISTS {name} ON "{table}"({columns});'
+            supabase.rpc('exec_sql', {'sql': index_sql}).execute()
+            print(f"✅ {name} created")
+            created += 1
+        except Exception as e:
+            # A missing optional table (e.g. peer review) should not stop the others
+            print(f"❌ Error creating {name}: {e}")
+    return created
+
+def main():
+    print("🚀 Setting up keyset pagination indexes...")
+
+    created = create_pagination_indexes()
+    print(f"\n📋 {created}/{len(PAGINATION_INDEXES)} indexes ready")
+    print("  - Media listings page by primary key and need no extra index")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Script to create the batched reference functions in Supabase
+"""
+
+from supabase_client import supabase
+
+def create_reference_functions():
+    """Create functions that add, replace, renumber and delete an article's references atomically"""
+    try:
+        functions_sql = """
+        -- An article's references as a JSON array in citation order, each with its source embedded
+        CREATE OR REPLACE FUNCTION article_references_json(p_article_id INTEGER)
+        RETURNS JSONB
+        LANGUAGE sql STABLE AS $$
+            SELECT COALESCE(jsonb_agg(to_jsonb(r) || jsonb_build_object('source', to_jsonb(s))
+                                      ORDER BY r.reference_number), '[]'::JSONB)
+            FROM reference r
+            JOIN source s ON s.id = r.source_id
+            WHERE r.article_id = p_article_id;
+        $$;
+
+        -- Close the gaps in an article's numbering, keeping the current order.
+        -- Numbers pass through negatives so UNIQUE(article_id, reference_number)
+        -- never sees a transient duplicate. Callers hold the article row lock.
+        CREATE OR REPLACE FUNCTION renumber_article_references(p_article_id INTEGER)
+        RETURNS INTEGER
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            total INTEGER;
+        BEGIN
+            PERFORM 1 FROM article WHERE id = p_article_id FOR UPDATE;
+
+            UPDATE reference r
+            SET reference_number = -ordered.n
+            FROM (
+                SELECT id, row_number() OVER (ORDER BY reference_number, created_at, id) AS n
+                FROM reference
+                WHERE article_id = p_article_id
+            ) AS ordered
+            WHERE r.id = ordered.id;
+            GET DIAGNOSTICS total = ROW_COUNT;
+
+            UPDATE reference SET reference_number = -reference_number
+            WHERE article_id = p_article_id AND reference_number < 0;
+
+            RETURN total;
+        END;
+        $$;
+
+        -- Append one reference; the article row lock makes concurrent adds take distinct numbers
+        CREATE OR REPLACE FUNCTION add_article_reference(
+            p_article_id INTEGER,
+            p_source_id INTEGER,
+            p_context TEXT,
+            p_page_number TEXT,
+            p_section TEXT,
+            p_created_by INTEGER
+        )
+        RETURNS JSONB
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            new_reference reference;
+        BEGIN
+            PERFORM 1 FROM article WHERE id = p_article_id FOR UPDATE;
+
+            INSERT INTO reference (article_id, source_id, reference_number, context, page_number, section, created_by)
+            SELECT p_article_id, p_source_id, COALESCE(MAX(reference_number), 0) + 1,
+                   p_context, p_page_number, p_section, p_created_by
+            FROM reference
+            WHERE article_id = p_article_id
+            RETURNING * INTO new_reference;
+
+            RETURN to_jsonb(new_reference) ||
+                   jsonb_build_object('source', (SELECT to_jsonb(s) FROM source s WHERE s.id = p_source_id));
+        END;
+        $$;
+
+        -- p_references: the article's full list in citation order,
+        --               [{id?, source_id, context, page_number, section}]
+        -- Entries with the id of one of the article's references update it, the
+        -- rest are inserted, and references missing from the list are deleted.
+        -- Numbers follow list order. Returns the new list, hydrated.
+        CREATE OR REPLACE FUNCTION replace_article_references(
+            p_article_id INTEGER,
+            p_references JSONB,
+            p_user_id INTEGER
+        )
+        RETURNS JSONB
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            PERFORM 1 FROM article WHERE id = p_article_id FOR UPDATE;
+
+            CREATE TEMP TABLE IF NOT EXISTS pending_reference (
+                id INTEGER, source_id INTEGER, reference_number INTEGER,
+                context TEXT, page_number TEXT, section TEXT
+            ) ON COMMIT DROP;
+            TRUNCATE pending_reference;
+
+            INSERT INTO pending_reference
+            SELECT (item->>'id')::INTEGER, (item->>'source_id')::INTEGER, n::INTEGER,
+                   item->>'context', item->>'page_number', item->>'section'
+            FROM jsonb_array_elements(COALESCE(p_references, '[]'::JSONB)) WITH ORDINALITY AS items(item, n);
+
+            DELETE FROM reference r
+            WHERE r.article_id = p_article_id
+              AND NOT EXISTS (SELECT 1 FROM pending_reference p WHERE p.id = r.id);
+
+            -- Park kept references on negative numbers before renumbering them
+            UPDATE reference SET reference_number = -reference_number
+            WHERE article_id = p_article_id;
+
+            UPDATE reference r
+            SET source_id = p.source_id,
+                reference_number = p.reference_number,
+                context = p.context,
+                page_number = p.page_number,
+                section = p.section
+            FROM pending_reference p
+            WHERE r.id = p.id AND r.article_id = p_article_id;
+
+            INSERT INTO reference (article_id, source_id, reference_number, context, page_number, section, created_by)
+            SELECT p_article_id, p.source_id, p.reference_number, p.context, p.page_number, p.section, p_user_id
+            FROM pending_reference p
+            WHERE p.id IS NULL
+               OR NOT EXISTS (SELECT 1 FROM reference r WHERE r.id = p.id AND r.article_id = p_article_id);
+
+            RETURN article_references_json(p_article_id);
+        END;
+        $$;
+
+        -- Delete one reference and renumber the rest of its article; returns the article id
+        CREATE OR REPLACE FUNCTION delete_article_reference(p_reference_id INTEGER)
+        RETURNS INTEGER
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            target_article_id INTEGER;
+        BEGIN
+            SELECT article_id INTO target_article_id FROM reference WHERE id = p_reference_id;
+            IF target_article_id IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            PERFORM 1 FROM article WHERE id = target_article_id FOR UPDATE;
+            DELETE FROM reference WHERE id = p_reference_id;
+            PERFORM renumber_article_references(target_article_id);
+            RETURN target_article_id;
+        END;
+        $$;
+
+        -- Delete a source (its references go with it through ON DELETE CASCADE)
+        -- and renumber every article that cited it; returns those article ids
+        CREATE OR REPLACE FUNCTION delete_source_and_renumber(p_source_id INTEGER)
+        RETURNS INTEGER[]
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            affected INTEGER[];
+            target_article_id INTEGER;
+        BEGIN
+            SELECT COALESCE(array_agg(DISTINCT article_id ORDER BY article_id), '{}')
+            INTO affected
+            FROM reference WHERE source_id = p_source_id;
+
+            -- Locked in id order so concurrent deletes cannot deadlock
+            PERFORM 1 FROM article WHERE id = ANY(affected) ORDER BY id FOR UPDATE;
+            DELETE FROM source WHERE id = p_source_id;
+
+            FOREACH target_article_id IN ARRAY affected LOOP
+                PERFORM renumber_article_references(target_article_id);
+            END LOOP;
+            RETURN affected;
+        END;
+        $$;
+        """
+
+        supabase.rpc('exec_sql', {'sql': functions_sql}).execute()
+        print("✅ Reference functions created successfully")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error creating reference functions: {e}")
+        return False
+
+def create_reference_triggers():
+    """Create triggers that mark articles changed when their references or sources change"""
+    try:
+        trigger_sql = """
+        -- Incremental exports select articles by updated_at, so citation edits have
+        -- to move it. Statement-level, so a bulk replace touches each article once.
+        -- The bulk importer sets afropedia.importing to keep imported timestamps.
+        CREATE OR REPLACE FUNCTION touch_articles_on_reference_change() RETURNS TRIGGER
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF current_setting('afropedia.importing', TRUE) = 'on' THEN
+                RETURN NULL;
+            END IF;
+            IF TG_OP = 'INSERT' THEN
+                UPDATE article SET updated_at = NOW()
+                WHERE id IN (SELECT article_id FROM new_references);
+            ELSIF TG_OP = 'DELETE' THEN
+                UPDATE article SET updated_at = NOW()
+                WHERE id IN (SELECT article_id FROM old_references);
+            ELSE
+                UPDATE article SET updated_at = NOW()
+                WHERE id IN (SELECT article_id FROM new_references UNION SELECT article_id FROM old_references);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+
+        -- Transition tables allow one event per trigger
+        DROP TRIGGER IF EXISTS reference_insert_touch_articles ON reference;
+        CREATE TRIGGER reference_insert_touch_articles
+            AFTER INSERT ON reference
+            REFERENCING NEW TABLE AS new_references
+            FOR EACH STATEMENT EXECUTE FUNCTION touch_articles_on_reference_change();
+
+        DROP TRIGGER IF EXISTS reference_update_touch_articles ON reference;
+        CREATE TRIGGER reference_update_touch_articles
+            AFTER UPDATE ON reference
+            REFERENCING OLD TABLE AS old_references NEW TABLE AS new_references
+            FOR EACH STATEMENT EXECUTE FUNCTION touch_articles_on_reference_change();
+
+        DROP TRIGGER IF EXISTS reference_delete_touch_articles ON reference;
+        CREATE TRIGGER reference_delete_touch_articles
+            AFTER DELETE ON reference
+            REFERENCING OLD TABLE AS old_references
+            FOR EACH STATEMENT EXECUTE FUNCTION touch_articles_on_reference_change();
+
+        -- Source edits change what every citing article exports
+        CREATE OR REPLACE FUNCTION touch_articles_on_source_change() RETURNS TRIGGER
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            UPDATE article SET updated_at = NOW()
+            WHERE id IN (
+                SELECT r.article_id FROM reference r JOIN changed_sources s ON s.id = r.source_id
+            );
+            RETURN NULL;
+        END;
+        $$;
+
+        DROP TRIGGER IF EXISTS source_update_touch_articles ON source;
+        CREATE TRIGGER source_update_touch_articles
+            AFTER UPDATE ON source
+            REFERENCING NEW TABLE AS changed_sources
+            FOR EACH STATEMENT EXECUTE FUNCTION touch_articles_on_source_change();
+        """
+
+        supabase.rpc('exec_sql', {'sql': trigger_sql}).execute()
+        print("✅ Reference triggers created successfully")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error creating reference triggers: {e}")
+        return False
+
+def create_reference_indexes():
+    """Create indexes for looking up references by source"""
+    try:
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_reference_source_id ON reference(source_id);
+        """
+
+        supabase.rpc('exec_sql', {'sql': index_sql}).execute()
+        print("✅ Reference indexes created successfully")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error creating reference indexes: {e}")
+        return False
+
+def test_functions():
+    """Test that the reference functions are callable"""
+    try:
+        supabase.rpc('article_references_json', {'p_article_id': 0}).execute()
+        supabase.rpc('renumber_article_references', {'p_article_id': 0}).execute()
+        print("✅ Reference functions are accessible")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing reference functions: {e}")
+        return False
+
+def main():
+    print("🚀 Setting up batched references...")
+
+    create_reference_indexes()
+    create_reference_functions()
+    create_reference_triggers()
+
+    if test_functions():
+        print("✅ Batched references ready!")
+        print("\n📋 Objects created:")
+        print("  - article_references_json: An article's references with their sources in one read")
+        print("  - renumber_article_references: Gap-free renumbering in one call")
+        print("  - add_article_reference: Append with the next number under the article lock")
+        print("  - replace_article_references: Bulk upsert of an article's full reference list")
+        print("  - delete_article_reference / delete_source_and_renumber: Deletes that keep numbering contiguous")
+        print("  - reference_*_touch_articles / source_update_touch_articles: Citation edits bump article.updated_at")
+        print("  - idx_reference_source_id: Source deletes without a reference scan")
+    else:
+        print("❌ Batched reference setup failed")
+
+if __name__ == "__main__":
+    main()
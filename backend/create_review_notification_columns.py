@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Script to add overdue-notification tracking to review_assignment in Supabase
+"""
+
+from supabase_client import supabase
+
+def add_overdue_columns():
+    """Add the overdue notification column and the due-date index used by the scanner"""
+    try:
+        columns_sql = """
+        ALTER TABLE review_assignment ADD COLUMN IF NOT EXISTS overdue_notified_at TIMESTAMP WITH TIME ZONE;
+        """
+
+        supabase.rpc('exec_sql', {'sql': columns_sql}).execute()
+        print("✅ overdue_notified_at column added successfully")
+
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_review_assignment_open_due
+            ON review_assignment(due_date)
+            WHERE status IN ('pending', 'accepted');
+        CREATE INDEX IF NOT EXISTS idx_review_assignment_assigned_to_status
+            ON review_assignment(assigned_to, status);
+        """
+
+        supabase.rpc('exec_sql', {'sql': index_sql}).execute()
+        print("✅ Overdue scanner indexes created successfully")
+
+    except Exception as e:
+        print(f"❌ Error adding overdue columns: {e}")
+
+def test_columns():
+    """Test that the column is selectable"""
+    try:
+        supabase.table("review_assignment").select("id, overdue_notified_at").limit(1).execute()
+        print("✅ review_assignment.overdue_notified_at is accessible")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing columns: {e}")
+        return False
+
+def main():
+    print("🚀 Adding review notification columns...")
+
+    add_overdue_columns()
+
+    if test_columns():
+        print("✅ Review notification columns ready!")
+    else:
+        print("❌ Review notification column setup failed")
+
+if __name__ == "__main__":
+    main()
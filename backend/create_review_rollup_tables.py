@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Script to create peer review analytics rollup tables and their maintenance triggers in Supabase
+"""
+
+from supabase_client import supabase
+
+def create_rollup_tables():
+    """Create the per-reviewer and daily rollup tables"""
+    try:
+        rollup_sql = """
+        CREATE TABLE IF NOT EXISTS reviewer_review_rollup (
+            reviewer_id INTEGER PRIMARY KEY REFERENCES "user"(id) ON DELETE CASCADE,
+            total_reviews INTEGER NOT NULL DEFAULT 0,
+            completed_reviews INTEGER NOT NULL DEFAULT 0,
+            score_sum NUMERIC NOT NULL DEFAULT 0,
+            score_count INTEGER NOT NULL DEFAULT 0,
+            time_sum BIGINT NOT NULL DEFAULT 0,
+            time_count INTEGER NOT NULL DEFAULT 0,
+            last_review_at TIMESTAMP WITH TIME ZONE,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+        );
+
+        CREATE TABLE IF NOT EXISTS review_daily_rollup (
+            day DATE PRIMARY KEY,
+            reviews_created INTEGER NOT NULL DEFAULT 0,
+            reviews_completed INTEGER NOT NULL DEFAULT 0,
+            score_sum NUMERIC NOT NULL DEFAULT 0,
+            score_count INTEGER NOT NULL DEFAULT 0,
+            time_sum BIGINT NOT NULL DEFAULT 0,
+            time_count INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE OR REPLACE VIEW review_rollup_totals AS
+        SELECT
+            COALESCE(SUM(total_reviews), 0)::INTEGER AS total_reviews,
+            COALESCE(SUM(completed_reviews), 0)::INTEGER AS completed_reviews,
+            COALESCE(SUM(score_sum), 0) AS score_sum,
+            COALESCE(SUM(score_count), 0)::INTEGER AS score_count,
+            COALESCE(SUM(time_sum), 0)::BIGINT AS time_sum,
+            COALESCE(SUM(time_count), 0)::INTEGER AS time_count,
+            -- Reviewers whose reviews were all deleted keep a zeroed row
+            COUNT(*) FILTER (WHERE total_reviews > 0)::INTEGER AS reviewer_count
+        FROM reviewer_review_rollup;
+        """
+
+        supabase.rpc('exec_sql', {'sql': rollup_sql}).execute()
+        print("✅ Rollup tables created successfully")
+
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_reviewer_review_rollup_total ON reviewer_review_rollup(total_reviews DESC);
+        """
+
+        supabase.rpc('exec_sql', {'sql': index_sql}).execute()
+        print("✅ Rollup indexes created successfully")
+
+    except Exception as e:
+        print(f"❌ Error creating rollup tables: {e}")
+
+def create_rollup_triggers():
+    """Create the trigger that applies each peer_review change to the rollups"""
+    try:
+        trigger_sql = """
+        -- Adds (p_sign = 1) or removes (p_sign = -1) one review's contribution.
+        -- Completions are bucketed by COALESCE(completed_at, created_at), the same
+        -- day rebuild_review_rollups uses, so incremental and rebuilt values agree.
+        CREATE OR REPLACE FUNCTION apply_peer_review_rollup_row(p_review peer_review, p_sign INTEGER) RETURNS VOID
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            is_done BOOLEAN := p_review.status IN ('approved', 'rejected', 'needs_changes');
+        BEGIN
+            INSERT INTO reviewer_review_rollup AS r (
+                reviewer_id, total_reviews, completed_reviews,
+                score_sum, score_count, time_sum, time_count, last_review_at, updated_at
+            ) VALUES (
+                p_review.reviewer_id,
+                p_sign,
+                p_sign * is_done::INTEGER,
+                p_sign * COALESCE(p_review.overall_score, 0),
+                p_sign * (p_review.overall_score IS NOT NULL)::INTEGER,
+                p_sign * COALESCE(p_review.time_spent_minutes, 0),
+                p_sign * (p_review.time_spent_minutes IS NOT NULL)::INTEGER,
+                CASE WHEN p_sign > 0 THEN p_review.created_at END,
+                NOW()
+            )
+            ON CONFLICT (reviewer_id) DO UPDATE SET
+                total_reviews = r.total_reviews + EXCLUDED.total_reviews,
+                completed_reviews = r.completed_reviews + EXCLUDED.completed_reviews,
+                score_sum = r.score_sum + EXCLUDED.score_sum,
+                score_count = r.score_count + EXCLUDED.score_count,
+                time_sum = r.time_sum + EXCLUDED.time_sum,
+                time_count = r.time_count + EXCLUDED.time_count,
+                last_review_at = GREATEST(r.last_review_at, EXCLUDED.last_review_at),
+                updated_at = NOW();
+
+            IF p_sign < 0 THEN
+                -- The removed review may have been the reviewer's latest
+                UPDATE reviewer_review_rollup
+                SET last_review_at = (
+                    SELECT MAX(created_at) FROM peer_review
+                    WHERE reviewer_id = p_review.reviewer_id AND id <> p_review.id
+                )
+                WHERE reviewer_id = p_review.reviewer_id AND last_review_at <= p_review.created_at;
+            END IF;
+
+            INSERT INTO review_daily_rollup AS d (day, reviews_created)
+            VALUES (p_review.created_at::DATE, p_sign)
+            ON CONFLICT (day) DO UPDATE SET reviews_created = d.reviews_created + EXCLUDED.reviews_created;
+
+            IF is_done THEN
+                INSERT INTO review_daily_rollup AS d (
+                    day, reviews_completed, score_sum, score_count, time_sum, time_count
+                ) VALUES (
+                    COALESCE(p_review.completed_at, p_review.created_at)::DATE,
+                    p_sign,
+                    p_sign * COALESCE(p_review.overall_score, 0),
+                    p_sign * (p_review.overall_score IS NOT NULL)::INTEGER,
+                    p_sign * COALESCE(p_review.time_spent_minutes, 0),
+                    p_sign * (p_review.time_spent_minutes IS NOT NULL)::INTEGER
+                )
+                ON CONFLICT (day) DO UPDATE SET
+                    reviews_completed = d.reviews_completed + EXCLUDED.reviews_completed,
+                    score_sum = d.score_sum + EXCLUDED.score_sum,
+                    score_count = d.score_count + EXCLUDED.score_count,
+                    time_sum = d.time_sum + EXCLUDED.time_sum,
+                    time_count = d.time_count + EXCLUDED.time_count;
+            END IF;
+        END;
+        $$;
+
+        -- An update is the old row's removal plus the new row's addition
+        CREATE OR REPLACE FUNCTION apply_peer_review_rollup() RETURNS TRIGGER
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                PERFORM apply_peer_review_rollup_row(OLD, -1);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                PERFORM apply_peer_review_rollup_row(NEW, 1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$;
+
+        DROP TRIGGER IF EXISTS peer_review_rollup_trigger ON peer_review;
+        CREATE TRIGGER peer_review_rollup_trigger
+            AFTER INSERT OR DELETE
+               OR UPDATE OF reviewer_id, status, overall_score, time_spent_minutes, completed_at, created_at
+            ON peer_review
+            FOR EACH ROW EXECUTE FUNCTION apply_peer_review_rollup();
+        """
+
+        supabase.rpc('exec_sql', {'sql': trigger_sql}).execute()
+        print("✅ Rollup trigger created successfully")
+
+        rebuild_sql = """
+        CREATE OR REPLACE FUNCTION rebuild_review_rollups() RETURNS VOID
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            LOCK TABLE reviewer_review_rollup, review_daily_rollup IN EXCLUSIVE MODE;
+            DELETE FROM reviewer_review_rollup;
+            DELETE FROM review_daily_rollup;
+
+            INSERT INTO reviewer_review_rollup (
+                reviewer_id, total_reviews, completed_reviews,
+                score_sum, score_count, time_sum, time_count, last_review_at, updated_at
+            )
+            SELECT
+                reviewer_id,
+                COUNT(*),
+                COUNT(*) FILTER (WHERE status IN ('approved', 'rejected', 'needs_changes')),
+                COALESCE(SUM(overall_score), 0),
+                COUNT(overall_score),
+                COALESCE(SUM(time_spent_minutes), 0),
+                COUNT(time_spent_minutes),
+                MAX(created_at),
+                NOW()
+            FROM peer_review
+            GROUP BY reviewer_id;
+
+            INSERT INTO review_daily_rollup (day, reviews_created)
+            SELECT created_at::DATE, COUNT(*)
+            FROM peer_review
+            GROUP BY created_at::DATE;
+
+            INSERT INTO review_daily_rollup AS d (
+                day, reviews_completed, score_sum, score_count, time_sum, time_count
+            )
+            SELECT
+                COALESCE(completed_at, created_at)::DATE,
+                COUNT(*),
+                COALESCE(SUM(overall_score), 0),
+                COUNT(overall_score),
+                COALESCE(SUM(time_spent_minutes), 0),
+                COUNT(time_spent_minutes)
+            FROM peer_review
+            WHERE status IN ('approved', 'rejected', 'needs_changes')
+            GROUP BY COALESCE(completed_at, created_at)::DATE
+            ON CONFLICT (day) DO UPDATE SET
+                reviews_completed = EXCLUDED.reviews_completed,
+                score_sum = EXCLUDED.score_sum,
+                score_count = EXCLUDED.score_count,
+                time_sum = EXCLUDED.time_sum,
+                time_count = EXCLUDED.time_count;
+        END;
+        $$;
+        """
+
+        supabase.rpc('exec_sql', {'sql': rebuild_sql}).execute()
+        print("✅ Rollup rebuild function created successfully")
+
+    except Exception as e:
+        print(f"❌ Error creating rollup triggers: {e}")
+
+def backfill_rollups():
+    """Populate the rollups from existing peer reviews"""
+    try:
+        supabase.rpc('rebuild_review_rollups', {}).execute()
+        print("✅ Rollups backfilled from existing reviews")
+        return True
+    except Exception as e:
+        print(f"❌ Error backfilling rollups: {e}")
+        return False
+
+def main():
+    print("🚀 Creating peer review analytics rollups...")
+
+    create_rollup_tables()
+    create_rollup_triggers()
+
+    if backfill_rollups():
+        print("✅ Review rollups ready!")
+        print("\n📋 Objects created:")
+        print("  - reviewer_review_rollup: Per-reviewer counts, score sums and time sums")
+        print("  - review_daily_rollup: Daily created/completed buckets for trends")
+        print("  - review_rollup_totals: Platform-wide totals view")
+        print("  - peer_review_rollup_trigger: Keeps rollups current on every review insert, update and delete")
+        print("  - rebuild_review_rollups(): Periodic or manual full rebuild")
+    else:
+        print("❌ Rollup setup failed")
+
+if __name__ == "__main__":
+    main()
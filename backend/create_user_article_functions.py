@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Script to create the indexed "articles by user" lookup functions in Supabase
+"""
+
+from supabase_client import supabase
+
+def create_user_article_indexes():
+    """Create indexes for finding a user's revisions and the articles they belong to"""
+    try:
+        index_sql = """
+        CREATE INDEX IF NOT EXISTS idx_revision_user_id ON revision(user_id);
+        CREATE INDEX IF NOT EXISTS idx_revision_user_article ON revision(user_id, article_id);
+        CREATE INDEX IF NOT EXISTS idx_article_current_revision_id ON article(current_revision_id);
+        """
+
+        supabase.rpc('exec_sql', {'sql': index_sql}).execute()
+        print("✅ User article indexes created successfully")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error creating user article indexes: {e}")
+        return False
+
+def create_user_article_functions():
+    """Create the paged user article lookup and its counts"""
+    try:
+        functions_sql = """
+        -- p_scope 'authored': articles whose current revision is by the user
+        -- p_scope 'contributed': articles with any revision by the user
+        -- Ordered by (updated_at, id) descending; pass the last row's pair to continue
+        CREATE OR REPLACE FUNCTION get_user_articles(
+            p_user_id INTEGER,
+            p_scope TEXT DEFAULT 'authored',
+            p_limit INTEGER DEFAULT 50,
+            p_after_updated_at TIMESTAMP DEFAULT NULL,
+            p_after_id INTEGER DEFAULT NULL,
+            p_offset INTEGER DEFAULT 0
+        ) RETURNS TABLE (
+            id INTEGER,
+            title TEXT,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP,
+            revision_count BIGINT,
+            last_contributed_at TIMESTAMP
+        )
+        LANGUAGE sql STABLE AS $$
+            WITH contributions AS (
+                SELECT r.article_id, count(*) AS revision_count, max(r.timestamp) AS last_contributed_at
+                FROM revision r
+                WHERE r.user_id = p_user_id
+                GROUP BY r.article_id
+            )
+            SELECT a.id, a.title::TEXT, a.created_at::TIMESTAMP, a.updated_at::TIMESTAMP,
+                   c.revision_count, c.last_contributed_at::TIMESTAMP
+            FROM contributions c
+            JOIN article a ON a.id = c.article_id
+            LEFT JOIN revision cur ON cur.id = a.current_revision_id
+            WHERE (p_scope = 'contributed' OR cur.user_id = p_user_id)
+              AND (p_after_id IS NULL OR (a.updated_at, a.id) < (p_after_updated_at, p_after_id))
+            ORDER BY a.updated_at DESC, a.id DESC
+            LIMIT p_limit OFFSET p_offset;
+        $$;
+
+        CREATE OR REPLACE FUNCTION count_user_articles(p_user_id INTEGER)
+        RETURNS JSONB
+        LANGUAGE sql STABLE AS $$
+            SELECT jsonb_build_object(
+                'authored', (
+                    SELECT count(*) FROM article a
+                    JOIN revision cur ON cur.id = a.current_revision_id
+                    WHERE cur.user_id = p_user_id
+                ),
+                'contributed', (
+                    SELECT count(DISTINCT article_id) FROM revision WHERE user_id = p_user_id
+                ),
+                'revisions', (
+                    SELECT count(*) FROM revision WHERE user_id = p_user_id
+                )
+            );
+        $$;
+        """
+
+        supabase.rpc('exec_sql', {'sql': functions_sql}).execute()
+        print("✅ User article functions created successfully")
+        return True
+
+    except Exception as e:
+        print(f"❌ Error creating user article functions: {e}")
+        return False
+
+def test_functions():
+    """Test that the lookup functions are callable"""
+    try:
+        supabase.rpc('get_user_articles', {'p_user_id': 0, 'p_limit': 1}).execute()
+        supabase.rpc('count_user_articles', {'p_user_id': 0}).execute()
+        print("✅ User article functions are accessible")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing user article functions: {e}")
+        return False
+
+def main():
+    print("🚀 Setting up user article lookups...")
+
+    create_user_article_indexes()
+    create_user_article_functions()
+
+    if test_functions():
+        print("✅ User article lookups ready!")
+        print("\n📋 Objects created:")
+        print("  - idx_revision_user_id / idx_revision_user_article: A user's revisions by article")
+        print("  - get_user_articles: Authored or contributed articles, keyset paged")
+        print("  - count_user_articles: Authored, contributed and revision counts")
+    else:
+        print("❌ User article setup failed")
+
+if __name__ == "__main__":
+    main()
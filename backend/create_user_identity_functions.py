@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Script to create case-insensitive identity indexes and the login/registration functions in Supabase
+"""
+
+from supabase_client import supabase
+
+def create_identity_indexes():
+    """Create unique indexes on lower-cased username and email"""
+    try:
+        index_sql = """
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_user_username_lower ON "user"(lower(username));
+        CREATE UNIQUE INDEX IF NOT EXISTS idx_user_email_lower ON "user"(lower(email));
+        """
+
+        supabase.rpc('exec_sql', {'sql': index_sql}).execute()
+        print("✅ Identity indexes created successfully")
+        return True
+
+    except Exception as e:
+        # Fails when existing rows differ only by case; resolve those accounts first
+        print(f"❌ Error creating identity indexes: {e}")
+        return False
+
+def create_identity_functions():
+    """Create the single-query login lookup and the atomic registration insert"""
+    try:
+        functions_sql = """
+        CREATE OR REPLACE FUNCTION get_user_by_login(p_identifier TEXT)
+        RETURNS SETOF "user"
+        LANGUAGE sql STABLE AS $$
+            SELECT * FROM "user"
+            WHERE lower(username) = lower(p_identifier)
+               OR lower(email) = lower(p_identifier)
+            ORDER BY (lower(username) = lower(p_identifier)) DESC
+            LIMIT 1;
+        $$;
+
+        CREATE OR REPLACE FUNCTION register_user(
+            p_username TEXT,
+            p_email TEXT,
+            p_hashed_password TEXT
+        ) RETURNS JSONB
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            new_user "user";
+            v_constraint TEXT;
+        BEGIN
+            INSERT INTO "user" (username, email, hashed_password)
+            VALUES (p_username, p_email, p_hashed_password)
+            RETURNING * INTO new_user;
+            RETURN jsonb_build_object('user', to_jsonb(new_user));
+        EXCEPTION WHEN unique_violation THEN
+            GET STACKED DIAGNOSTICS v_constraint = CONSTRAINT_NAME;
+            RETURN jsonb_build_object(
+                'conflict',
+                CASE WHEN v_constraint ILIKE '%email%' THEN 'email' ELSE 'username' END
+            );
+        END;
+        $$;
+        """
+
+        supabase.rpc('exec_sql', {'sql': functions_sql}).execute()
+        print("✅ Identity functions created successfully")
+
+    except Exception as e:
+        print(f"❌ Error creating identity functions: {e}")
+
+def test_functions():
+    """Test that the lookup function is callable"""
+    try:
+        supabase.rpc('get_user_by_login', {'p_identifier': ''}).execute()
+        print("✅ Identity functions are accessible")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing identity functions: {e}")
+        return False
+
+def main():
+    print("🚀 Setting up user identity lookups...")
+
+    if not create_identity_indexes():
+        print("⚠️  Usernames or emails that differ only by case must be merged before retrying")
+        return
+    create_identity_functions()
+
+    if test_functions():
+        print("✅ User identity lookups ready!")
+        print("\n📋 Objects created:")
+        print("  - idx_user_username_lower / idx_user_email_lower: Case-insensitive uniqueness")
+        print("  - get_user_by_login: Username-or-email lookup in one query")
+        print("  - register_user: Atomic insert that reports the conflicting field")
+    else:
+        print("❌ Identity setup failed")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Script to add access-token versioning to the user table in Supabase
+"""
+
+from supabase_client import supabase
+
+def add_token_version_column():
+    """Add the token_version column"""
+    try:
+        column_sql = """
+        ALTER TABLE "user" ADD COLUMN IF NOT EXISTS token_version INTEGER NOT NULL DEFAULT 0;
+        """
+
+        supabase.rpc('exec_sql', {'sql': column_sql}).execute()
+        print("✅ token_version column added successfully")
+
+    except Exception as e:
+        print(f"❌ Error adding token_version column: {e}")
+
+def create_user_triggers():
+    """Revoke tokens on password change and publish principal changes to the event outbox"""
+    try:
+        trigger_sql = """
+        CREATE OR REPLACE FUNCTION bump_user_token_version() RETURNS TRIGGER
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            -- Rehashing the same password with new cost parameters is not a credential change
+            IF NEW.hashed_password IS DISTINCT FROM OLD.hashed_password
+               AND NEW.token_version IS NOT DISTINCT FROM OLD.token_version
+               AND COALESCE(current_setting('afropedia.password_rehash', TRUE), '') <> 'on' THEN
+                NEW.token_version := OLD.token_version + 1;
+            END IF;
+            RETURN NEW;
+        END;
+        $$;
+
+        DROP TRIGGER IF EXISTS user_token_version_trigger ON "user";
+        CREATE TRIGGER user_token_version_trigger
+            BEFORE UPDATE OF hashed_password ON "user"
+            FOR EACH ROW EXECUTE FUNCTION bump_user_token_version();
+
+        CREATE OR REPLACE FUNCTION enqueue_user_updated_event() RETURNS TRIGGER
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF NEW.role IS DISTINCT FROM OLD.role
+               OR NEW.is_active IS DISTINCT FROM OLD.is_active
+               OR NEW.token_version IS DISTINCT FROM OLD.token_version THEN
+                INSERT INTO event_outbox (event_type, aggregate_type, aggregate_id, payload, idempotency_key)
+                VALUES (
+                    'user.updated',
+                    'user',
+                    NEW.id,
+                    jsonb_build_object('user_id', NEW.id, 'username', OLD.username) || outbox_trace_context(),
+                    format('user.updated:%s:%s', NEW.id, txid_current())
+                )
+                ON CONFLICT (idempotency_key) DO NOTHING;
+            END IF;
+            RETURN NEW;
+        END;
+        $$;
+
+        -- token_version is usually bumped by the BEFORE trigger above, which an
+        -- UPDATE OF column list does not see, so password changes are listed too
+        DROP TRIGGER IF EXISTS user_outbox_trigger ON "user";
+        CREATE TRIGGER user_outbox_trigger
+            AFTER UPDATE OF role, is_active, token_version, hashed_password ON "user"
+            FOR EACH ROW EXECUTE FUNCTION enqueue_user_updated_event();
+        """
+
+        supabase.rpc('exec_sql', {'sql': trigger_sql}).execute()
+        print("✅ User token triggers created successfully")
+
+    except Exception as e:
+        print(f"❌ Error creating user token triggers: {e}")
+
+def create_rehash_function():
+    """Create the function login uses to upgrade outdated password hashes"""
+    try:
+        rehash_sql = """
+        CREATE OR REPLACE FUNCTION rehash_user_password(
+            p_user_id INTEGER,
+            p_old_hash TEXT,
+            p_new_hash TEXT
+        ) RETURNS BOOLEAN
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            updated INTEGER;
+        BEGIN
+            PERFORM set_config('afropedia.password_rehash', 'on', TRUE);
+            -- Only replace the hash that was verified, never a concurrent password change
+            UPDATE "user" SET hashed_password = p_new_hash
+            WHERE id = p_user_id AND hashed_password = p_old_hash;
+            GET DIAGNOSTICS updated = ROW_COUNT;
+            PERFORM set_config('afropedia.password_rehash', 'off', TRUE);
+            RETURN updated > 0;
+        END;
+        $$;
+        """
+
+        supabase.rpc('exec_sql', {'sql': rehash_sql}).execute()
+        print("✅ rehash_user_password created successfully")
+
+    except Exception as e:
+        print(f"❌ Error creating rehash function: {e}")
+
+def test_columns():
+    """Test that the column is selectable"""
+    try:
+        supabase.table("user").select("id, token_version").limit(1).execute()
+        print("✅ user.token_version is accessible")
+        return True
+    except Exception as e:
+        print(f"❌ Error testing token_version: {e}")
+        return False
+
+def main():
+    print("🚀 Adding access-token versioning...")
+
+    add_token_version_column()
+    create_user_triggers()
+    create_rehash_function()
+
+    if test_columns():
+        print("✅ Token versioning ready!")
+        print("\n📋 Objects created:")
+        print("  - user.token_version: Included in access tokens as the 'ver' claim")
+        print("  - user_token_version_trigger: Password changes revoke existing tokens")
+        print("  - user_outbox_trigger: Role, status and token changes invalidate cached principals")
+        print("  - rehash_user_password: Upgrades bcrypt cost on login without revoking tokens")
+        print("\n⚠️  Run create_event_outbox_table.py first")
+    else:
+        print("❌ Token versioning setup failed")
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,9 @@
 # crud/moderation_crud.py
-from typing import List, Optional
+from typing import List, Optional, Dict, Tuple
 from sqlmodel import select, and_, or_
-from datetime import datetime
+from datetime import datetime, timedelta
 from supabase_client import supabase
+from utils.pagination import InvalidCursor, keyset_page
 from moderation_models import (
     ModerationQueue, ModerationQueueCreate, ModerationQueueUpdate,
     PeerReview, PeerReviewCreate, PeerReviewUpdate,
@@ -12,6 +13,13 @@ from moderation_models import (
     ModerationStatus, ReviewStatus, Priority, ActionType, FlagType
 )
 
+# Default time a moderator may hold a queue item before it returns to the queue
+DEFAULT_LEASE_SECONDS = 900
+
+def _decided(status: str) -> Dict[str, Optional[str]]:
+    """Queue update for a decided item; dropping the lease keeps it from being reassigned"""
+    return {"status": status, "assigned_to": None, "lease_expires_at": None}
+
 # Moderation Queue CRUD
 async def create_moderation_queue_item(item: ModerationQueueCreate) -> Optional[ModerationQueue]:
     """Create a new moderation queue item"""
@@ -32,19 +40,44 @@ async def get_moderation_queue_items(
 ) -> List[ModerationQueue]:
     """Get moderation queue items with optional filters"""
     try:
-        query = supabase.table("moderation_queue").select("*")
-        
-        if status and hasattr(status, 'value'):
-            query = query.eq("status", status.value)
-        if assigned_to and isinstance(assigned_to, int):
-            query = query.eq("assigned_to", assigned_to)
-            
-        result = query.order("created_at", desc=True).limit(limit).execute()
+        result = _moderation_queue_query(status, assigned_to).order("created_at", desc=True).order("id", desc=True).range(offset, offset + limit - 1).execute()
         return [ModerationQueue(**item) for item in result.data or []]
     except Exception as e:
         print(f"Error getting moderation queue items: {e}")
         return []
 
+def _moderation_queue_query(status: Optional[ModerationStatus], assigned_to: Optional[int]):
+    query = supabase.table("moderation_queue").select("*")
+    if status and hasattr(status, 'value'):
+        query = query.eq("status", status.value)
+    if assigned_to and isinstance(assigned_to, int):
+        query = query.eq("assigned_to", assigned_to)
+    return query
+
+async def get_moderation_queue_page(
+    status: Optional[ModerationStatus] = None,
+    assigned_to: Optional[int] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> Tuple[List[ModerationQueue], Optional[str]]:
+    """Get one keyset page of moderation queue items, newest first"""
+    try:
+        rows, next_cursor = keyset_page(_moderation_queue_query(status, assigned_to), limit, cursor, "created_at", descending=True)
+        return [ModerationQueue(**item) for item in rows], next_cursor
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"Error getting moderation queue page: {e}")
+        return [], None
+
+async def count_moderation_queue_items(status: Optional[ModerationStatus] = None) -> int:
+    """Count moderation queue items without fetching the rows"""
+    query = supabase.table("moderation_queue").select("id", count="exact")
+    if status and hasattr(status, 'value'):
+        query = query.eq("status", status.value)
+    result = query.limit(1).execute()
+    return result.count or 0
+
 async def update_moderation_queue_item(
     item_id: int, 
     update_data: ModerationQueueUpdate
@@ -92,6 +125,20 @@ async def get_peer_reviews_for_revision(revision_id: int) -> List[PeerReview]:
         print(f"Error getting peer reviews: {e}")
         return []
 
+async def get_peer_reviews_for_revisions(revision_ids: List[int]) -> Dict[int, List[PeerReview]]:
+    """Get peer reviews for many revisions in a single query, grouped by revision"""
+    reviews_by_revision: Dict[int, List[PeerReview]] = {revision_id: [] for revision_id in revision_ids}
+    if not revision_ids:
+        return reviews_by_revision
+    try:
+        result = supabase.table("peer_review").select("*").in_("revision_id", revision_ids).execute()
+        for item in result.data or []:
+            reviews_by_revision.setdefault(item["revision_id"], []).append(PeerReview(**item))
+        return reviews_by_revision
+    except Exception as e:
+        print(f"Error getting peer reviews for revisions: {e}")
+        return reviews_by_revision
+
 async def get_peer_reviews_by_reviewer(reviewer_id: int) -> List[PeerReview]:
     """Get all peer reviews by a specific reviewer"""
     try:
@@ -137,6 +184,17 @@ async def get_moderation_actions(
     limit: int = 50
 ) -> List[ModerationAction]:
     """Get moderation actions with optional filters"""
+    actions, _ = await get_moderation_actions_page(moderator_id, content_type, content_id, limit)
+    return actions
+
+async def get_moderation_actions_page(
+    moderator_id: Optional[int] = None,
+    content_type: Optional[str] = None,
+    content_id: Optional[int] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> Tuple[List[ModerationAction], Optional[str]]:
+    """Get one keyset page of moderation actions, newest first"""
     try:
         query = supabase.table("moderation_action").select("*")
         
@@ -147,11 +205,13 @@ async def get_moderation_actions(
         if content_id:
             query = query.eq("content_id", content_id)
             
-        result = query.order("created_at", desc=True).limit(limit).execute()
-        return [ModerationAction(**item) for item in result.data or []]
+        rows, next_cursor = keyset_page(query, limit, cursor, "created_at", descending=True)
+        return [ModerationAction(**item) for item in rows], next_cursor
+    except InvalidCursor:
+        raise
     except Exception as e:
         print(f"Error getting moderation actions: {e}")
-        return []
+        return [], None
 
 # Content Flags CRUD
 async def create_content_flag(flag: ContentFlagCreate) -> Optional[ContentFlag]:
@@ -171,6 +231,16 @@ async def get_content_flags(
     limit: int = 50
 ) -> List[ContentFlag]:
     """Get content flags with optional filters"""
+    flags, _ = await get_content_flags_page(status, flag_type, limit)
+    return flags
+
+async def get_content_flags_page(
+    status: Optional[str] = None,
+    flag_type: Optional[FlagType] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> Tuple[List[ContentFlag], Optional[str]]:
+    """Get one keyset page of content flags, newest first"""
     try:
         query = supabase.table("content_flag").select("*")
         
@@ -179,11 +249,21 @@ async def get_content_flags(
         if flag_type and hasattr(flag_type, 'value'):
             query = query.eq("flag_type", flag_type.value)
             
-        result = query.order("created_at", desc=True).limit(limit).execute()
-        return [ContentFlag(**item) for item in result.data or []]
+        rows, next_cursor = keyset_page(query, limit, cursor, "created_at", descending=True)
+        return [ContentFlag(**item) for item in rows], next_cursor
+    except InvalidCursor:
+        raise
     except Exception as e:
         print(f"Error getting content flags: {e}")
-        return []
+        return [], None
+
+async def count_content_flags(status: Optional[str] = None) -> int:
+    """Count content flags without fetching the rows"""
+    query = supabase.table("content_flag").select("id", count="exact")
+    if status:
+        query = query.eq("status", status)
+    result = query.limit(1).execute()
+    return result.count or 0
 
 async def update_content_flag(
     flag_id: int, 
@@ -262,19 +342,86 @@ async def submit_for_moderation(
 
 async def assign_moderation_item(
     item_id: int,
-    assigned_to: int
+    assigned_to: int,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS
 ) -> Optional[ModerationQueue]:
-    """Assign a moderation item to a moderator"""
+    """Assign a moderation item to a moderator if nobody else holds a live lease on it"""
     try:
-        update_data = ModerationQueueUpdate(
-            assigned_to=assigned_to,
-            status=ModerationStatus.IN_REVIEW
-        )
-        return await update_moderation_queue_item(item_id, update_data)
+        now = datetime.utcnow()
+        result = supabase.table("moderation_queue").update({
+            "assigned_to": assigned_to,
+            "status": ModerationStatus.IN_REVIEW.value,
+            "lease_expires_at": (now + timedelta(seconds=lease_seconds)).isoformat(),
+            "updated_at": now.isoformat()
+        }).eq("id", item_id).in_(
+            "status", [ModerationStatus.PENDING.value, ModerationStatus.IN_REVIEW.value]
+        ).or_(
+            f"status.eq.pending,lease_expires_at.lt.{now.isoformat()},assigned_to.eq.{assigned_to}"
+        ).execute()
+        
+        if result.data:
+            return ModerationQueue(**result.data[0])
+        return None
     except Exception as e:
         print(f"Error assigning moderation item: {e}")
         return None
 
+# Moderation Work Queue (leases are taken atomically by database functions)
+async def claim_moderation_items(
+    moderator_id: int,
+    limit: int = 10,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS
+) -> List[ModerationQueue]:
+    """Lease the next items by priority, then age, skipping rows other moderators are claiming"""
+    try:
+        result = supabase.rpc("claim_moderation_items", {
+            "p_moderator_id": moderator_id,
+            "p_limit": limit,
+            "p_lease_seconds": lease_seconds
+        }).execute()
+        return [ModerationQueue(**item) for item in result.data or []]
+    except Exception as e:
+        print(f"Error claiming moderation items: {e}")
+        return []
+
+async def renew_moderation_lease(
+    item_id: int,
+    moderator_id: int,
+    lease_seconds: int = DEFAULT_LEASE_SECONDS
+) -> bool:
+    """Extend a live lease held by the moderator"""
+    try:
+        result = supabase.rpc("renew_moderation_lease", {
+            "p_item_id": item_id,
+            "p_moderator_id": moderator_id,
+            "p_lease_seconds": lease_seconds
+        }).execute()
+        return bool(result.data)
+    except Exception as e:
+        print(f"Error renewing moderation lease: {e}")
+        return False
+
+async def release_moderation_lease(item_id: int, moderator_id: int) -> bool:
+    """Hand a leased item back to the pending queue"""
+    try:
+        result = supabase.rpc("release_moderation_lease", {
+            "p_item_id": item_id,
+            "p_moderator_id": moderator_id
+        }).execute()
+        return bool(result.data)
+    except Exception as e:
+        print(f"Error releasing moderation lease: {e}")
+        return False
+
+async def requeue_expired_moderation_leases() -> int:
+    """Return items whose lease has expired to the pending queue"""
+    try:
+        result = supabase.rpc("requeue_expired_moderation_leases", {}).execute()
+        return result.data or 0
+    except Exception as e:
+        print(f"Error requeueing expired moderation leases: {e}")
+        return 0
+
 async def approve_content(
     content_type: str,
     content_id: int,
@@ -315,9 +462,7 @@ async def approve_content(
                 }).eq("id", article_id).execute()
         
         # Update moderation queue items for this content
-        supabase.table("moderation_queue").update({
-            "status": "approved"
-        }).eq("content_type", content_type).eq("content_id", content_id).execute()
+        supabase.table("moderation_queue").update(_decided("approved")).eq("content_type", content_type).eq("content_id", content_id).execute()
         
         return True
     except Exception as e:
@@ -363,15 +508,131 @@ async def reject_content(
                 }).eq("id", article_id).execute()
         
         # Update moderation queue items for this content
-        supabase.table("moderation_queue").update({
-            "status": "rejected"
-        }).eq("content_type", content_type).eq("content_id", content_id).execute()
+        supabase.table("moderation_queue").update(_decided("rejected")).eq("content_type", content_type).eq("content_id", content_id).execute()
         
         return True
     except Exception as e:
         print(f"Error rejecting content: {e}")
         return False
 
+def _group_content_ids(items: List[Tuple[str, int]]) -> Dict[str, List[int]]:
+    """Group (content_type, content_id) pairs by content type, dropping duplicates"""
+    grouped: Dict[str, List[int]] = {}
+    for content_type, content_id in items:
+        ids = grouped.setdefault(content_type, [])
+        if content_id not in ids:
+            ids.append(content_id)
+    return grouped
+
+async def bulk_approve_content(
+    items: List[Tuple[str, int]],
+    moderator_id: int,
+    reason: Optional[str] = None
+) -> Dict[str, List[int]]:
+    """Approve many content items with one statement per table where possible.
+    
+    Returns the approved content ids grouped by content type.
+    """
+    grouped = _group_content_ids(items)
+    if not grouped:
+        return {}
+    
+    # Record all moderation actions in a single insert
+    actions = [
+        ModerationActionCreate(
+            moderator_id=moderator_id,
+            content_type=content_type,
+            content_id=content_id,
+            action_type=ActionType.APPROVE,
+            reason=reason
+        ).dict()
+        for content_type, ids in grouped.items()
+        for content_id in ids
+    ]
+    supabase.table("moderation_action").insert(actions).execute()
+    
+    if grouped.get("article"):
+        supabase.table("article").update({"status": "approved"}).in_("id", grouped["article"]).execute()
+    
+    revision_ids = grouped.get("revision")
+    if revision_ids:
+        supabase.table("revision").update({
+            "status": "approved",
+            "is_approved": True,
+            "needs_review": False
+        }).in_("id", revision_ids).execute()
+        
+        # Each article moves to its newest approved revision
+        revision_result = supabase.table("revision").select("id, article_id").in_("id", revision_ids).execute()
+        latest_by_article: Dict[int, int] = {}
+        for row in revision_result.data or []:
+            article_id = row["article_id"]
+            if article_id is not None and row["id"] > latest_by_article.get(article_id, 0):
+                latest_by_article[article_id] = row["id"]
+        
+        updated_at = datetime.utcnow().isoformat()
+        for article_id, revision_id in latest_by_article.items():
+            supabase.table("article").update({
+                "current_revision_id": revision_id,
+                "status": "approved",
+                "updated_at": updated_at
+            }).eq("id", article_id).execute()
+    
+    for content_type, ids in grouped.items():
+        supabase.table("moderation_queue").update(_decided("approved")).eq("content_type", content_type).in_("content_id", ids).execute()
+    
+    return grouped
+
+async def bulk_reject_content(
+    items: List[Tuple[str, int]],
+    moderator_id: int,
+    reason: Optional[str] = None
+) -> Dict[str, List[int]]:
+    """Reject many content items with one statement per table.
+    
+    Returns the rejected content ids grouped by content type.
+    """
+    grouped = _group_content_ids(items)
+    if not grouped:
+        return {}
+    
+    actions = [
+        ModerationActionCreate(
+            moderator_id=moderator_id,
+            content_type=content_type,
+            content_id=content_id,
+            action_type=ActionType.REJECT,
+            reason=reason
+        ).dict()
+        for content_type, ids in grouped.items()
+        for content_id in ids
+    ]
+    supabase.table("moderation_action").insert(actions).execute()
+    
+    if grouped.get("article"):
+        supabase.table("article").update({"status": "rejected"}).in_("id", grouped["article"]).execute()
+    
+    revision_ids = grouped.get("revision")
+    if revision_ids:
+        supabase.table("revision").update({
+            "status": "rejected",
+            "is_approved": False,
+            "needs_review": True
+        }).in_("id", revision_ids).execute()
+        
+        # Articles keep their current revision but are marked as having pending changes
+        revision_result = supabase.table("revision").select("article_id").in_("id", revision_ids).execute()
+        article_ids = list({row["article_id"] for row in revision_result.data or [] if row.get("article_id") is not None})
+        if article_ids:
+            supabase.table("article").update({
+                "status": "pending_review"
+            }).in_("id", article_ids).execute()
+    
+    for content_type, ids in grouped.items():
+        supabase.table("moderation_queue").update(_decided("rejected")).eq("content_type", content_type).in_("content_id", ids).execute()
+    
+    return grouped
+
 async def flag_content(
     content_type: str,
     content_id: int,
@@ -404,10 +665,14 @@ async def get_pending_revisions_for_review() -> List[dict]:
             user:user_id(id, username)
         """).eq("needs_review", True).eq("status", "pending").order("timestamp", desc=True).execute()
         
+        rows = result.data or []
+        
+        # Get existing reviews for all pending revisions in one query
+        reviews_by_revision = await get_peer_reviews_for_revisions([rev_data["id"] for rev_data in rows])
+        
         revisions = []
-        for rev_data in result.data or []:
-            # Get existing reviews for this revision
-            reviews = await get_peer_reviews_for_revision(rev_data["id"])
+        for rev_data in rows:
+            reviews = reviews_by_revision.get(rev_data["id"], [])
             
             revisions.append({
                 "id": rev_data["id"],
@@ -551,9 +816,7 @@ async def auto_approve_revision_if_consensus(revision_id: int) -> bool:
                 }).eq("id", article_id).execute()
             
             # Update moderation queue
-            supabase.table("moderation_queue").update({
-                "status": "approved"
-            }).eq("content_type", "revision").eq("content_id", revision_id).execute()
+            supabase.table("moderation_queue").update(_decided("approved")).eq("content_type", "revision").eq("content_id", revision_id).execute()
             
             return True
         
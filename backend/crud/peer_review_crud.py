@@ -11,6 +11,9 @@ from peer_review_models import (
     ReviewMetrics, ReviewMetricsRead, ReviewAnalytics, ReviewerProfile,
     ReviewStatus, ReviewPriority, ReviewCategory, ReviewerLevel
 )
+from events.notifications import notify_assignments_created
+from utils.pagination import InvalidCursor, keyset_page
+from review_assignment_service import OPEN_ASSIGNMENT_STATUSES
 import json
 
 # Advanced Peer Review CRUD
@@ -88,6 +91,24 @@ async def get_peer_reviews_for_revision(
         print(f"Error getting peer reviews for revision: {e}")
         return []
 
+def _reviewer_reviews_query(reviewer_id: int, status: Optional[ReviewStatus]):
+    query = supabase.table("peer_review").select("""
+        *,
+        revision:revision!peer_review_revision_id_fkey(id, content, timestamp),
+        article:revision!peer_review_revision_id_fkey(article:article!revision_article_id_fkey(title))
+    """).eq("reviewer_id", reviewer_id)
+    if status:
+        query = query.eq("status", status.value)
+    return query
+
+def _peer_review_read(review_data: Dict[str, Any]) -> PeerReviewRead:
+    if review_data.get('criteria_scores'):
+        try:
+            review_data['criteria_scores'] = json.loads(review_data['criteria_scores'])
+        except:
+            review_data['criteria_scores'] = None
+    return PeerReviewRead(**review_data)
+
 async def get_peer_reviews_by_reviewer(
     reviewer_id: int,
     status: Optional[ReviewStatus] = None,
@@ -100,28 +121,8 @@ async def get_peer_reviews_by_reviewer(
         if not reviewer_id or reviewer_id <= 0:
             return []
             
-        query = supabase.table("peer_review").select("""
-            *,
-            revision:revision!peer_review_revision_id_fkey(id, content, timestamp),
-            article:revision!peer_review_revision_id_fkey(article:article!revision_article_id_fkey(title))
-        """).eq("reviewer_id", reviewer_id)
-        
-        if status:
-            query = query.eq("status", status.value)
-        
-        result = query.order("created_at", desc=True).range(offset, offset + limit - 1).execute()
-        
-        reviews = []
-        for review_data in result.data or []:
-            if review_data.get('criteria_scores'):
-                try:
-                    review_data['criteria_scores'] = json.loads(review_data['criteria_scores'])
-                except:
-                    review_data['criteria_scores'] = None
-            
-            reviews.append(PeerReviewRead(**review_data))
-        
-        return reviews
+        result = _reviewer_reviews_query(reviewer_id, status).order("created_at", desc=True).order("id", desc=True).range(offset, offset + limit - 1).execute()
+        return [_peer_review_read(review_data) for review_data in result.data or []]
     except Exception as e:
         print(f"Error getting peer reviews by reviewer: {e}")
         # If table doesn't exist, return empty list
@@ -129,6 +130,24 @@ async def get_peer_reviews_by_reviewer(
             return []
         return []
 
+async def get_peer_reviews_by_reviewer_page(
+    reviewer_id: int,
+    status: Optional[ReviewStatus] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None
+) -> Tuple[List[PeerReviewRead], Optional[str]]:
+    """Get one keyset page of a reviewer's peer reviews, newest first"""
+    try:
+        if not reviewer_id or reviewer_id <= 0:
+            return [], None
+        rows, next_cursor = keyset_page(_reviewer_reviews_query(reviewer_id, status), limit, cursor, "created_at", descending=True)
+        return [_peer_review_read(review_data) for review_data in rows], next_cursor
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"Error getting peer reviews page by reviewer: {e}")
+        return [], None
+
 async def update_peer_review(
     review_id: int, 
     update_data: PeerReviewUpdate
@@ -216,6 +235,7 @@ async def create_review_assignment(assignment: ReviewAssignmentCreate) -> Option
     try:
         result = supabase.table("review_assignment").insert(assignment.dict()).execute()
         if result.data:
+            await notify_assignments_created(result.data)
             return ReviewAssignment(**result.data[0])
         return None
     except Exception as e:
@@ -249,6 +269,34 @@ async def get_pending_assignments(user_id: int) -> List[ReviewAssignmentRead]:
             return []
         return []
 
+async def get_overdue_assignments(user_id: int) -> List[ReviewAssignmentRead]:
+    """Get open review assignments for a user that are past their due date"""
+    try:
+        if not user_id or user_id <= 0:
+            return []
+        
+        result = supabase.table("review_assignment").select("*").eq(
+            "assigned_to", user_id
+        ).in_("status", OPEN_ASSIGNMENT_STATUSES).lt(
+            "due_date", datetime.utcnow().isoformat()
+        ).order("due_date").execute()
+        
+        return [ReviewAssignmentRead(**assignment_data) for assignment_data in result.data or []]
+    except Exception as e:
+        print(f"Error getting overdue assignments: {e}")
+        return []
+
+async def claim_overdue_assignment_notifications() -> List[Dict[str, Any]]:
+    """Stamp overdue open assignments that have not been notified yet and return them.
+    
+    The conditional update means concurrent scanners never claim the same assignment.
+    """
+    now = datetime.utcnow().isoformat()
+    result = supabase.table("review_assignment").update({
+        "overdue_notified_at": now
+    }).in_("status", OPEN_ASSIGNMENT_STATUSES).lt("due_date", now).is_("overdue_notified_at", "null").execute()
+    return result.data or []
+
 async def accept_assignment(assignment_id: int) -> bool:
     """Accept a review assignment"""
     try:
@@ -304,19 +352,21 @@ async def get_review_comments(review_id: int) -> List[ReviewCommentRead]:
         print(f"Error getting review comments: {e}")
         return []
 
-# Review Analytics and Metrics
+# Review Analytics and Metrics (read from rollups kept current by peer_review triggers)
+def _average(total: float, count: int) -> float:
+    """Average of a rollup sum, 0.0 when nothing was counted"""
+    return float(total) / count if count else 0.0
+
 async def get_reviewer_metrics(reviewer_id: int) -> Optional[ReviewMetricsRead]:
     """Get comprehensive metrics for a reviewer"""
     try:
         # Check if reviewer_id is valid
         if not reviewer_id or reviewer_id <= 0:
             return None
-            
-        # Get basic review data
-        reviews_result = supabase.table("peer_review").select("*").eq("reviewer_id", reviewer_id).execute()
-        reviews = reviews_result.data or []
         
-        if not reviews:
+        rollup_result = supabase.table("reviewer_review_rollup").select("*").eq("reviewer_id", reviewer_id).execute()
+        
+        if not rollup_result.data or not rollup_result.data[0].get("total_reviews"):
             # Return empty metrics for new reviewers
             return ReviewMetricsRead(
                 reviewer_id=reviewer_id,
@@ -331,18 +381,9 @@ async def get_reviewer_metrics(reviewer_id: int) -> Optional[ReviewMetricsRead]:
                 reviewer_level="user"
             )
         
-        # Calculate metrics
-        total_reviews = len(reviews)
-        completed_reviews = len([r for r in reviews if r.get('status') in ['approved', 'rejected', 'needs_changes']])
-        completion_rate = (completed_reviews / total_reviews) * 100 if total_reviews > 0 else 0
-        
-        # Calculate average score
-        scores = [r.get('overall_score') for r in reviews if r.get('overall_score')]
-        average_score = sum(scores) / len(scores) if scores else 0.0
-        
-        # Calculate average time
-        times = [r.get('time_spent_minutes') for r in reviews if r.get('time_spent_minutes')]
-        average_time = sum(times) / len(times) if times else 0.0
+        rollup = rollup_result.data[0]
+        total_reviews = rollup["total_reviews"]
+        completion_rate = (rollup["completed_reviews"] / total_reviews) * 100
         
         # Get reviewer info
         user_result = supabase.table("user").select("username, role").eq("id", reviewer_id).execute()
@@ -352,12 +393,12 @@ async def get_reviewer_metrics(reviewer_id: int) -> Optional[ReviewMetricsRead]:
         return ReviewMetricsRead(
             reviewer_id=reviewer_id,
             total_reviews=total_reviews,
-            average_score=average_score,
+            average_score=_average(rollup["score_sum"], rollup["score_count"]),
             completion_rate=completion_rate,
-            average_time_minutes=average_time,
+            average_time_minutes=_average(rollup["time_sum"], rollup["time_count"]),
             accuracy_score=0.0,  # Would need more complex calculation
             helpfulness_score=0.0,  # Would need feedback system
-            last_review_date=reviews[0].get('created_at') if reviews else None,
+            last_review_date=rollup.get("last_review_at"),
             reviewer_name=reviewer_name,
             reviewer_level=reviewer_level
         )
@@ -365,54 +406,65 @@ async def get_reviewer_metrics(reviewer_id: int) -> Optional[ReviewMetricsRead]:
         print(f"Error getting reviewer metrics: {e}")
         return None
 
-async def get_review_analytics() -> Optional[ReviewAnalytics]:
+async def get_review_trends(days: int = 30) -> List[Dict[str, Any]]:
+    """Get daily review activity for the last `days` days"""
+    since = (datetime.utcnow() - timedelta(days=days)).date().isoformat()
+    result = supabase.table("review_daily_rollup").select("*").gte("day", since).order("day").execute()
+    
+    return [
+        {
+            "date": bucket["day"],
+            "reviews_created": bucket["reviews_created"],
+            "reviews_completed": bucket["reviews_completed"],
+            "average_score": round(_average(bucket["score_sum"], bucket["score_count"]), 2),
+            "average_review_time": round(_average(bucket["time_sum"], bucket["time_count"]), 2)
+        }
+        for bucket in result.data or []
+    ]
+
+async def get_review_analytics(trend_days: int = 30) -> Optional[ReviewAnalytics]:
     """Get comprehensive review analytics"""
     try:
-        # Get all reviews
-        reviews_result = supabase.table("peer_review").select("*").execute()
-        reviews = reviews_result.data or []
+        totals_result = supabase.table("review_rollup_totals").select("*").execute()
+        totals = totals_result.data[0] if totals_result.data else None
         
-        if not reviews:
+        if not totals or not totals.get("total_reviews"):
             return None
         
-        # Calculate basic metrics
-        total_reviews = len(reviews)
-        completed_reviews = len([r for r in reviews if r.get('status') in ['approved', 'rejected', 'needs_changes']])
-        completion_rate = (completed_reviews / total_reviews) * 100 if total_reviews > 0 else 0
-        
-        # Calculate average score
-        scores = [r.get('overall_score') for r in reviews if r.get('overall_score')]
-        average_score = sum(scores) / len(scores) if scores else 0.0
+        total_reviews = totals["total_reviews"]
+        completion_rate = (totals["completed_reviews"] / total_reviews) * 100
         
-        # Calculate average time
-        times = [r.get('time_spent_minutes') for r in reviews if r.get('time_spent_minutes')]
-        average_review_time = sum(times) / len(times) if times else 0.0
-        
-        # Get top reviewers (simplified)
-        reviewer_counts = {}
-        for review in reviews:
-            reviewer_id = review.get('reviewer_id')
-            if reviewer_id:
-                reviewer_counts[reviewer_id] = reviewer_counts.get(reviewer_id, 0) + 1
+        top_result = supabase.table("reviewer_review_rollup").select(
+            "reviewer_id, total_reviews"
+        ).order("total_reviews", desc=True).limit(5).execute()
         
         top_reviewers = [
-            {"reviewer_id": rid, "review_count": count}
-            for rid, count in sorted(reviewer_counts.items(), key=lambda x: x[1], reverse=True)[:5]
+            {"reviewer_id": row["reviewer_id"], "review_count": row["total_reviews"]}
+            for row in top_result.data or []
         ]
         
         return ReviewAnalytics(
             total_reviews=total_reviews,
-            average_score=average_score,
+            average_score=_average(totals["score_sum"], totals["score_count"]),
             completion_rate=completion_rate,
-            average_review_time=average_review_time,
+            average_review_time=_average(totals["time_sum"], totals["time_count"]),
             top_reviewers=top_reviewers,
-            review_trends=[],  # Would need time-series analysis
+            review_trends=await get_review_trends(trend_days),
             quality_metrics={}  # Would need more complex calculations
         )
     except Exception as e:
         print(f"Error getting review analytics: {e}")
         return None
 
+async def rebuild_review_rollups() -> bool:
+    """Recompute all review rollups from the peer_review table"""
+    try:
+        supabase.rpc("rebuild_review_rollups", {}).execute()
+        return True
+    except Exception as e:
+        print(f"Error rebuilding review rollups: {e}")
+        return False
+
 # Review Templates
 async def create_review_template(template: ReviewTemplateCreate) -> Optional[ReviewTemplate]:
     """Create a new review template"""
@@ -463,26 +515,29 @@ async def assign_reviewers_to_revision(
     reviewer_ids: List[int],
     priority: ReviewPriority = ReviewPriority.NORMAL,
     due_date: Optional[datetime] = None,
-    instructions: Optional[str] = None
+    instructions: Optional[str] = None,
+    assigned_by: int = 1  # System user
 ) -> List[ReviewAssignment]:
-    """Assign multiple reviewers to a revision"""
+    """Assign multiple reviewers to a revision with a single batched insert"""
     try:
-        assignments = []
-        for reviewer_id in reviewer_ids:
-            assignment = ReviewAssignmentCreate(
-                revision_id=revision_id,
-                assigned_to=reviewer_id,
-                assigned_by=1,  # System user
-                priority=priority,
-                due_date=due_date,
-                instructions=instructions
-            )
-            
-            result = await create_review_assignment(assignment)
-            if result:
-                assignments.append(result)
+        if not reviewer_ids:
+            return []
         
-        return assignments
+        rows = [
+            {
+                "revision_id": revision_id,
+                "assigned_to": reviewer_id,
+                "assigned_by": assigned_by,
+                "priority": priority.value,
+                "due_date": due_date.isoformat() if due_date else None,
+                "instructions": instructions
+            }
+            for reviewer_id in dict.fromkeys(reviewer_ids)
+        ]
+        
+        result = supabase.table("review_assignment").insert(rows).execute()
+        await notify_assignments_created(result.data or [])
+        return [ReviewAssignment(**item) for item in result.data or []]
     except Exception as e:
         print(f"Error assigning reviewers: {e}")
         return []
@@ -1,8 +1,5 @@
-from supabase import create_client
-from config import settings
-
-# Initialize Supabase client
-supabase = create_client(settings.supabase_url, settings.supabase_key)
+# Same lazily created client as supabase_client, instead of a second one built at import
+from supabase_client import supabase
 
 # For backward compatibility with existing code
 async def get_session():
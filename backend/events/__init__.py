@@ -0,0 +1 @@
+# events/__init__.py
@@ -0,0 +1,73 @@
+# events/handlers.py
+import logging
+from typing import Callable, Dict, List, Any, Awaitable, Union
+
+logger = logging.getLogger("afropedia.events")
+
+class OutboxHandler:
+    """Base class for outbox event handlers.
+
+    Handlers must be idempotent: an event is retried until every handler has
+    succeeded, and handlers that already succeeded are skipped on retry.
+    """
+
+    name: str = "handler"
+    event_types: List[str] = []  # "*" subscribes to every event
+
+    def handles(self, event_type: str) -> bool:
+        return "*" in self.event_types or event_type in self.event_types
+
+    async def handle(self, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+class SearchIndexHandler(OutboxHandler):
+    """Keeps the MeiliSearch article index in step with moderation decisions"""
+
+    name = "search_index"
+    event_types = ["article.updated", "revision.status_changed"]
+
+    async def handle(self, event: Dict[str, Any]) -> None:
+        payload = event.get("payload") or {}
+        if event["event_type"] == "revision.status_changed" and payload.get("status") != "approved":
+            return
+        article_id = payload.get("article_id")
+        if article_id is None:
+            return
+
+        # Imported lazily so workers without search configured can still start
+        from search_service import search_service
+        if not await search_service.index_article(article_id):
+            raise RuntimeError(f"Search indexing failed for article {article_id}")
+
+Invalidator = Callable[[Dict[str, Any]], Union[None, Awaitable[None]]]
+
+class CacheInvalidationHandler(OutboxHandler):
+    """Fans events out to registered cache invalidators, keyed by aggregate type.
+
+    Caches are per process, so this is driven by events.invalidation's
+    CacheInvalidationFeed in every worker rather than by the outbox worker,
+    which would only reach the process that claimed the event.
+    """
+
+    name = "cache_invalidation"
+    event_types = ["*"]
+
+    def __init__(self):
+        self.invalidators: Dict[str, List[Invalidator]] = {}
+
+    def register(self, aggregate_type: str, invalidator: Invalidator) -> None:
+        self.invalidators.setdefault(aggregate_type, []).append(invalidator)
+
+    async def handle(self, event: Dict[str, Any]) -> None:
+        for invalidator in self.invalidators.get(event["aggregate_type"], []):
+            result = invalidator(event)
+            if result is not None and hasattr(result, "__await__"):
+                await result
+
+# Shared instance so caches elsewhere in the app can register invalidators
+cache_invalidation_handler = CacheInvalidationHandler()
+
+def default_handlers() -> List[OutboxHandler]:
+    """Handlers run by the outbox worker unless configured otherwise"""
+    from events.notifications import NotificationHandler
+    return [SearchIndexHandler(), NotificationHandler()]
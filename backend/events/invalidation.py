@@ -0,0 +1,98 @@
+# events/invalidation.py
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Any, Optional
+
+from supabase_client import supabase
+from events.handlers import CacheInvalidationHandler, cache_invalidation_handler
+from events.outbox import OUTBOX_TABLE
+
+logger = logging.getLogger("afropedia.events")
+
+class CacheInvalidationFeed:
+    """Applies the outbox's cache invalidations in every process.
+
+    Outbox events are claimed by a single worker, but each uvicorn worker
+    keeps its own principal and title caches. Every process therefore reads
+    recent events of the registered aggregate types itself and runs the
+    invalidators. Invalidation is idempotent, so each poll looks back
+    `lookback_seconds` to cover commits that land out of id order and clock
+    skew against the database, skipping events it has already applied.
+    """
+
+    def __init__(
+        self,
+        dispatcher: CacheInvalidationHandler = cache_invalidation_handler,
+        poll_interval: float = 2.0,
+        lookback_seconds: float = 30.0,
+        page_size: int = 500
+    ):
+        self.dispatcher = dispatcher
+        self.poll_interval = poll_interval
+        self.lookback_seconds = lookback_seconds
+        self.page_size = page_size
+        self._applied: Dict[int, datetime] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def _fetch(self, since: datetime, after_id: int) -> List[Dict[str, Any]]:
+        result = supabase.table(OUTBOX_TABLE) \
+            .select("id, event_type, aggregate_type, aggregate_id, payload") \
+            .in_("aggregate_type", sorted(self.dispatcher.invalidators)) \
+            .gte("created_at", since.isoformat()) \
+            .gt("id", after_id) \
+            .order("id") \
+            .limit(self.page_size) \
+            .execute()
+        return result.data or []
+
+    async def poll_once(self) -> int:
+        """Apply events recorded in the lookback window; returns how many were new"""
+        if not self.dispatcher.invalidators:
+            return 0
+        now = datetime.now(timezone.utc)
+        since = now - timedelta(seconds=self.lookback_seconds)
+        applied = 0
+        after_id = 0
+        while True:
+            events = await asyncio.to_thread(self._fetch, since, after_id)
+            for event in events:
+                if event["id"] in self._applied:
+                    continue
+                try:
+                    await self.dispatcher.handle(event)
+                except Exception as e:
+                    logger.warning(f"Cache invalidation failed for event {event['id']}: {e}")
+                self._applied[event["id"]] = now
+                applied += 1
+            if len(events) < self.page_size:
+                break
+            after_id = events[-1]["id"]
+
+        # Forget events that have left the window; they will not be read again
+        self._applied = {event_id: seen for event_id, seen in self._applied.items() if seen >= since}
+        return applied
+
+    async def run_forever(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.error(f"Cache invalidation poll failed: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> asyncio.Task:
+        """Poll as a background task on the current event loop"""
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task:
+            await self._task
+            self._task = None
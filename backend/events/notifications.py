@@ -0,0 +1,100 @@
+# events/notifications.py
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from events.handlers import OutboxHandler
+from events.pubsub import get_broker, user_channel, REVIEWERS_CHANNEL
+
+logger = logging.getLogger("afropedia.events")
+
+def _message(event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    return {"type": event_type, "data": data, "timestamp": datetime.utcnow().isoformat()}
+
+async def notify_user(user_id: int, event_type: str, data: Dict[str, Any]) -> None:
+    """Push a notification to one user's connected clients"""
+    await get_broker().publish(user_channel(user_id), _message(event_type, data))
+
+async def notify_reviewers(event_type: str, data: Dict[str, Any]) -> None:
+    """Push a notification to every connected reviewer"""
+    await get_broker().publish(REVIEWERS_CHANNEL, _message(event_type, data))
+
+async def notify_assignments_created(assignments: List[Any]) -> None:
+    """Tell each assignee about new review assignments (rows or models)"""
+    for assignment in assignments:
+        row = assignment if isinstance(assignment, dict) else assignment.dict()
+        try:
+            await notify_user(row["assigned_to"], "assignment.created", {
+                "assignment_id": row.get("id"),
+                "revision_id": row.get("revision_id"),
+                "priority": row.get("priority"),
+                "due_date": row.get("due_date")
+            })
+        except Exception as e:
+            logger.warning(f"Failed to publish assignment notification: {e}")
+
+class NotificationHandler(OutboxHandler):
+    """Turns moderation outbox events into real-time notifications"""
+
+    name = "notifications"
+    event_types = ["revision.status_changed"]
+
+    async def handle(self, event: Dict[str, Any]) -> None:
+        # Trace context is for the worker, not for clients
+        payload = {
+            key: value for key, value in (event.get("payload") or {}).items()
+            if key not in ("traceparent", "tracestate")
+        }
+        await notify_reviewers("moderation.revision_status_changed", payload)
+        if payload.get("user_id"):
+            await notify_user(payload["user_id"], "moderation.revision_status_changed", payload)
+
+class OverdueAssignmentScanner:
+    """Periodically finds review assignments past their due date and notifies the assignee once.
+
+    Each overdue assignment is claimed by stamping overdue_notified_at, so
+    only one scanner notifies even when several workers run it.
+    """
+
+    def __init__(self, interval_seconds: float = 300.0):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    async def scan_once(self) -> int:
+        # Imported lazily to keep crud out of the events package import graph
+        from crud.peer_review_crud import claim_overdue_assignment_notifications
+
+        overdue = await claim_overdue_assignment_notifications()
+        for row in overdue:
+            await notify_user(row["assigned_to"], "assignment.overdue", {
+                "assignment_id": row["id"],
+                "revision_id": row.get("revision_id"),
+                "due_date": row.get("due_date")
+            })
+        return len(overdue)
+
+    async def run_forever(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                notified = await self.scan_once()
+                if notified:
+                    logger.info(f"Notified {notified} overdue review assignments")
+            except Exception as e:
+                logger.error(f"Overdue assignment scan failed: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> asyncio.Task:
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task:
+            await self._task
+            self._task = None
@@ -0,0 +1,89 @@
+# events/outbox.py
+import uuid
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional
+
+from supabase_client import supabase
+from tracing.tracer import inject_trace_context
+
+logger = logging.getLogger("afropedia.events")
+
+OUTBOX_TABLE = "event_outbox"
+
+def enqueue_event(
+    event_type: str,
+    aggregate_type: str,
+    aggregate_id: int,
+    payload: Optional[Dict[str, Any]] = None,
+    idempotency_key: Optional[str] = None
+) -> bool:
+    """Write an event to the outbox.
+
+    Moderation state changes are captured by database triggers in the same
+    transaction; this is for events raised from application code. Events with
+    an idempotency key that is already present are ignored.
+    """
+    payload = dict(payload or {})
+    # The worker continues the trace of the request that raised the event
+    inject_trace_context(payload)
+    try:
+        supabase.table(OUTBOX_TABLE).upsert({
+            "event_type": event_type,
+            "aggregate_type": aggregate_type,
+            "aggregate_id": aggregate_id,
+            "payload": payload,
+            "idempotency_key": idempotency_key or f"{event_type}:{aggregate_type}:{aggregate_id}:{uuid.uuid4()}"
+        }, on_conflict="idempotency_key", ignore_duplicates=True).execute()
+        return True
+    except Exception as e:
+        logger.error(f"Error enqueueing {event_type} event: {e}")
+        return False
+
+def claim_events(limit: int, lease_seconds: int) -> List[Dict[str, Any]]:
+    """Lease ready events to this worker; other workers skip them until the lease ends"""
+    result = supabase.rpc("claim_outbox_events", {
+        "p_limit": limit,
+        "p_lease_seconds": lease_seconds
+    }).execute()
+    return result.data or []
+
+def mark_event_done(event_id: int, completed_handlers: List[str]) -> None:
+    """Record that every handler has processed the event"""
+    supabase.table(OUTBOX_TABLE).update({
+        "status": "done",
+        "completed_handlers": completed_handlers,
+        "locked_until": None,
+        "last_error": None,
+        "processed_at": datetime.utcnow().isoformat()
+    }).eq("id", event_id).execute()
+
+def mark_event_failed(
+    event_id: int,
+    attempts: int,
+    max_attempts: int,
+    completed_handlers: List[str],
+    error: str,
+    base_backoff_seconds: float
+) -> None:
+    """Schedule a retry with exponential backoff, or park the event once attempts run out"""
+    update = {
+        "completed_handlers": completed_handlers,
+        "locked_until": None,
+        "last_error": error[:2000]
+    }
+    if attempts >= max_attempts:
+        update["status"] = "failed"
+    else:
+        delay = base_backoff_seconds * (2 ** (attempts - 1))
+        update["status"] = "pending"
+        update["available_at"] = (datetime.utcnow() + timedelta(seconds=delay)).isoformat()
+    supabase.table(OUTBOX_TABLE).update(update).eq("id", event_id).execute()
+
+def get_outbox_stats() -> Dict[str, int]:
+    """Count outbox events by status"""
+    stats = {}
+    for status in ("pending", "processing", "done", "failed"):
+        result = supabase.table(OUTBOX_TABLE).select("id", count="exact").eq("status", status).limit(1).execute()
+        stats[status] = result.count or 0
+    return stats
@@ -0,0 +1,132 @@
+# events/pubsub.py
+import asyncio
+import contextlib
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Any, Set, AsyncIterator
+
+logger = logging.getLogger("afropedia.events")
+
+# Broadcast channel every connected reviewer listens on
+REVIEWERS_CHANNEL = "reviewers"
+
+def user_channel(user_id: int) -> str:
+    """Channel for notifications addressed to one user"""
+    return f"user:{user_id}"
+
+class Broker:
+    """Publish/subscribe contract for real-time notifications.
+
+    `subscribe` is an async context manager yielding an object whose
+    `get()` coroutine returns the next message. The in-memory broker only
+    reaches subscribers in the same process; run several workers behind a
+    shared broker (e.g. Redis pub/sub) implementing the same contract.
+    """
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def subscribe(self, *channels: str):
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+class InMemoryBroker(Broker):
+    """Process-local broker backed by one bounded queue per subscriber"""
+
+    def __init__(self, max_queue_size: int = 100):
+        self.max_queue_size = max_queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        for queue in list(self._subscribers.get(channel, ())):
+            if queue.full():
+                # Slow consumer: drop its oldest message rather than block publishers
+                queue.get_nowait()
+            queue.put_nowait(message)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, *channels: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        for channel in channels:
+            self._subscribers[channel].add(queue)
+        try:
+            yield queue
+        finally:
+            for channel in channels:
+                self._subscribers[channel].discard(queue)
+                if not self._subscribers[channel]:
+                    del self._subscribers[channel]
+
+    def subscriber_count(self) -> int:
+        return len({id(queue) for queues in self._subscribers.values() for queue in queues})
+
+class RedisBroker(Broker):
+    """Broker shared by every worker through Redis pub/sub"""
+
+    def __init__(self, url: str, prefix: str = "afropedia:events:", max_queue_size: int = 100):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("event_broker_url points at Redis but the redis package is not installed") from e
+        self.prefix = prefix
+        self.max_queue_size = max_queue_size
+        self._client = redis.from_url(url)
+
+    async def publish(self, channel: str, message: Dict[str, Any]) -> None:
+        await self._client.publish(self.prefix + channel, json.dumps(message, default=str))
+
+    async def _pump(self, pubsub, queue: asyncio.Queue) -> None:
+        # Only this task reads the connection, so subscribers can time out
+        # on the queue without cancelling a Redis read halfway through
+        async for message in pubsub.listen():
+            if message["type"] != "message":
+                continue
+            try:
+                payload = json.loads(message["data"])
+            except (TypeError, ValueError):
+                logger.warning(f"Dropping malformed message on {message['channel']}")
+                continue
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(payload)
+
+    @contextlib.asynccontextmanager
+    async def subscribe(self, *channels: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue_size)
+        pubsub = self._client.pubsub()
+        await pubsub.subscribe(*(self.prefix + channel for channel in channels))
+        reader = asyncio.create_task(self._pump(pubsub, queue))
+        try:
+            yield queue
+        finally:
+            reader.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await reader
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+def is_shared_url(url: str) -> bool:
+    """Whether a broker or rate-limit storage URL is visible to every worker"""
+    return url.startswith(("redis://", "rediss://", "unix://"))
+
+def create_broker(url: str) -> Broker:
+    if is_shared_url(url):
+        return RedisBroker(url)
+    if url.startswith("memory://"):
+        return InMemoryBroker()
+    raise ValueError(f"Unsupported event broker: {url}")
+
+_broker: Broker = InMemoryBroker()
+
+def get_broker() -> Broker:
+    return _broker
+
+def set_broker(broker: Broker) -> None:
+    """Replace the process-wide broker (call before the app starts serving)"""
+    global _broker
+    _broker = broker
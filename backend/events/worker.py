@@ -0,0 +1,131 @@
+# events/worker.py
+import asyncio
+import logging
+from typing import List, Dict, Any, Optional
+
+from events import outbox
+from events.handlers import OutboxHandler, default_handlers
+from tracing.tracer import parse_traceparent, tracer
+
+logger = logging.getLogger("afropedia.events")
+
+class OutboxWorker:
+    """Drains the event outbox and fans each event out to its handlers.
+
+    Several workers (in-process or standalone) can run at once: events are
+    leased through claim_outbox_events, so each is processed by one worker at
+    a time and re-leased if that worker dies mid-batch.
+    """
+
+    def __init__(
+        self,
+        handlers: Optional[List[OutboxHandler]] = None,
+        batch_size: int = 20,
+        poll_interval: float = 2.0,
+        lease_seconds: int = 60,
+        max_attempts: int = 5,
+        base_backoff_seconds: float = 5.0
+    ):
+        self.handlers = handlers if handlers is not None else default_handlers()
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.base_backoff_seconds = base_backoff_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    async def process_event(self, event: Dict[str, Any]) -> bool:
+        """Run every pending handler for one event; returns True once all have succeeded"""
+        # Recorded when the event was written, so handlers join the originating request's trace
+        payload = event.get("payload") or {}
+        with tracer.start_span(
+            f"outbox {event['event_type']}",
+            kind="consumer",
+            parent=parse_traceparent(payload.get("traceparent"), payload.get("tracestate")),
+            attributes={"messaging.message.id": event["id"], "outbox.attempts": event.get("attempts", 1)}
+        ):
+            return await self._process_event(event)
+
+    async def _process_event(self, event: Dict[str, Any]) -> bool:
+        completed = list(event.get("completed_handlers") or [])
+        errors = []
+        for handler in self.handlers:
+            if handler.name in completed or not handler.handles(event["event_type"]):
+                continue
+            try:
+                await handler.handle(event)
+                completed.append(handler.name)
+            except Exception as e:
+                logger.warning(
+                    f"Outbox handler {handler.name} failed for event {event['id']}: {e}",
+                    extra={"event_id": event["id"], "event_type": event["event_type"], "handler": handler.name}
+                )
+                errors.append(f"{handler.name}: {e}")
+
+        if errors:
+            await asyncio.to_thread(
+                outbox.mark_event_failed, event["id"], event.get("attempts", 1), self.max_attempts,
+                completed, "; ".join(errors), self.base_backoff_seconds
+            )
+            return False
+
+        await asyncio.to_thread(outbox.mark_event_done, event["id"], completed)
+        return True
+
+    async def run_once(self) -> int:
+        """Claim and process one batch; returns the number of events claimed"""
+        events = await asyncio.to_thread(outbox.claim_events, self.batch_size, self.lease_seconds)
+        for event in events:
+            await self.process_event(event)
+        return len(events)
+
+    async def run_forever(self) -> None:
+        logger.info("Outbox worker started")
+        while not self._stopping.is_set():
+            try:
+                claimed = await self.run_once()
+            except Exception as e:
+                logger.error(f"Outbox worker batch failed: {e}")
+                claimed = 0
+
+            # Keep draining while there is a backlog, otherwise wait for the next poll
+            if claimed < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+        logger.info("Outbox worker stopped")
+
+    def start(self) -> asyncio.Task:
+        """Run the worker as a background task on the current event loop"""
+        self._stopping.clear()
+        self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        """Finish the current batch and stop"""
+        self._stopping.set()
+        if self._task:
+            await self._task
+            self._task = None
+
+if __name__ == "__main__":
+    # Standalone worker process: python -m events.worker
+    from config import settings
+    from utils.logging_config import setup_logging
+
+    setup_logging(
+        log_level=settings.log_level,
+        enable_json=settings.log_format == "json",
+        queue_size=settings.log_queue_size
+    )
+    worker = OutboxWorker(
+        batch_size=settings.outbox_batch_size,
+        poll_interval=settings.outbox_poll_interval_seconds,
+        max_attempts=settings.outbox_max_attempts
+    )
+    try:
+        asyncio.run(worker.run_forever())
+    except KeyboardInterrupt:
+        pass
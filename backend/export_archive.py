@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Streaming export for Afropedia Backend
+Writes articles (with current revisions, references and sources), books and
+media metadata as NDJSON, or as a gzip-compressed dump, reading the tables
+with keyset scans so memory stays flat however large they are
+
+Incremental backups: pass --state FILE; each run exports what changed since
+the previous successful run and records where the next one should start.
+Reference and source edits count as changes to the articles citing them.
+Deletions are not exported; restore from a full export to drop removed rows.
+
+Articles and books load back with import_archive.py. Media records point at
+the API's stream URLs rather than carrying files, so the importer skips them.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+from exporter.streams import EXPORT_TYPES, PAGE_SIZE, export_records, gzip_chunks, ndjson_chunks
+
+async def write_export(args, since):
+    """Stream the export to args.output; returns the trailing export record"""
+    summary = {}
+
+    async def records():
+        async for record in export_records(args.types, since, args.page_size):
+            if record["type"] == "export":
+                summary.update(record)
+            yield record
+
+    chunks = ndjson_chunks(records())
+    if args.format == "dump":
+        chunks = gzip_chunks(chunks)
+
+    if args.output == "-":
+        async for chunk in chunks:
+            sys.stdout.buffer.write(chunk)
+        sys.stdout.buffer.flush()
+        return summary
+
+    # Written beside the target and renamed at the end, so a failed run never leaves a truncated backup
+    partial = f"{args.output}.partial"
+    with open(partial, "wb") as output:
+        async for chunk in chunks:
+            output.write(chunk)
+    os.replace(partial, args.output)
+    return summary
+
+def load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state(path, summary):
+    temporary = f"{path}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump({"since": summary["next_since"], "last_export": summary}, f, indent=2)
+    os.replace(temporary, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the encyclopedia as NDJSON or a compressed dump")
+    parser.add_argument("output", help="Output file, or - for stdout")
+    parser.add_argument("--format", choices=["ndjson", "dump"], help="Default: dump for .gz outputs, ndjson otherwise")
+    parser.add_argument("--types", default=",".join(EXPORT_TYPES), help="Comma-separated record types")
+    parser.add_argument("--since", help="Only records changed at or after this ISO 8601 time")
+    parser.add_argument("--state", help="State file for incremental exports (read for --since, updated on success)")
+    parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Rows per keyset query")
+    args = parser.parse_args()
+
+    args.format = args.format or ("dump" if args.output.endswith(".gz") else "ndjson")
+    args.types = [kind.strip() for kind in args.types.split(",") if kind.strip()]
+    unknown = [kind for kind in args.types if kind not in EXPORT_TYPES]
+    if unknown:
+        parser.error(f"unknown types: {', '.join(unknown)}")
+
+    since = args.since
+    if since is None and args.state:
+        since = load_state(args.state).get("since")
+
+    # Progress goes to stderr so `-` can be piped
+    log = sys.stderr
+    print(f"📦 Exporting {', '.join(args.types)}" + (f" changed since {since}" if since else ""), file=log)
+    try:
+        summary = asyncio.run(write_export(args, since))
+    except Exception as e:
+        print(f"❌ Export failed: {e}", file=log)
+        sys.exit(1)
+
+    if args.state:
+        save_state(args.state, summary)
+    counts = ", ".join(f"{count} {kind}" for kind, count in summary["counts"].items())
+    print(f"✅ Exported {counts}", file=log)
+    print(f"   Next incremental export: --since {summary['next_since']}", file=log)
+
+if __name__ == "__main__":
+    main()
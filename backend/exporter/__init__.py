@@ -0,0 +1 @@
+# exporter/__init__.py
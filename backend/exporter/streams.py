@@ -0,0 +1,188 @@
+# exporter/streams.py
+import asyncio
+import json
+import zlib
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional
+
+from supabase_client import supabase
+from utils.pagination import keyset_page
+
+EXPORT_TYPES = ("article", "book", "image", "music", "video")
+PAGE_SIZE = 500
+# PostgREST caps responses at 1000 rows; larger child lookups are fetched in ranges
+CHILD_PAGE_SIZE = 1000
+# Output is flushed to the client in chunks of about this size
+CHUNK_BYTES = 64 * 1024
+
+# type -> (table, columns, change timestamp column or None, content stream path)
+TABLES = {
+    "article": ("article", "id, title, created_at, updated_at, current_revision_id", "updated_at", None),
+    "book": ("book", "*", "updated_at", None),
+    "image": ("image_metadata", "id, original_filename, content_type, size_bytes, uploaded_at, content_id", "uploaded_at", "/images/stream/{id}"),
+    "music": ("music_metadata", "id, title, artist, album, content_id", None, "/music/stream/{id}"),
+    "video": ("videos", "id, filename, timestamp, user, content_id", "timestamp", "/videos/stream/{id}"),
+}
+SOURCE_FIELDS = ("title", "url", "author", "publication", "publication_date", "access_date",
+                 "source_type", "isbn", "doi", "description")
+
+def _fetch_page(kind: str, since: Optional[str], cursor: Optional[str], page_size: int):
+    table, columns, changed_column, _ = TABLES[kind]
+    query = supabase.table(table).select(columns)
+    if since and changed_column:
+        query = query.gte(changed_column, since)
+    return keyset_page(query, page_size, cursor)
+
+async def scan_table(kind: str, since: Optional[str] = None, page_size: int = PAGE_SIZE) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield a table's rows page by page in id order, one keyset query per page"""
+    cursor = None
+    while True:
+        rows, cursor = await asyncio.to_thread(_fetch_page, kind, since, cursor, page_size)
+        if rows:
+            yield rows
+        if not cursor:
+            return
+
+def _fetch_all(build_query: Callable[[], Any]) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    while True:
+        page = build_query().range(len(rows), len(rows) + CHILD_PAGE_SIZE - 1).execute().data or []
+        rows.extend(page)
+        if len(page) < CHILD_PAGE_SIZE:
+            return rows
+
+def _compact(record: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in record.items() if value is not None}
+
+def _reference_record(reference: Dict[str, Any]) -> Dict[str, Any]:
+    # Flat, the shape the bulk importer reads references in
+    source = reference.get("source") or {}
+    return _compact({
+        **{field: source.get(field) for field in SOURCE_FIELDS},
+        "source_id": reference.get("source_id"),
+        "reference_number": reference.get("reference_number"),
+        "context": reference.get("context"),
+        "page_number": reference.get("page_number"),
+        "section": reference.get("section"),
+    })
+
+def _article_records(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Attach current revisions, authors and references to a page of articles in three queries"""
+    article_ids = [row["id"] for row in rows]
+    revision_ids = [row["current_revision_id"] for row in rows if row.get("current_revision_id")]
+
+    revisions = {}
+    if revision_ids:
+        result = supabase.table("revision").select("id, content, comment, timestamp, user_id").in_("id", revision_ids).execute()
+        revisions = {revision["id"]: revision for revision in result.data or []}
+
+    usernames = {}
+    user_ids = sorted({revision["user_id"] for revision in revisions.values() if revision.get("user_id")})
+    if user_ids:
+        result = supabase.table("user").select("id, username").in_("id", user_ids).execute()
+        usernames = {user["id"]: user["username"] for user in result.data or []}
+
+    references = defaultdict(list)
+    for reference in _fetch_all(lambda: supabase.table("reference")
+                                .select("article_id, source_id, reference_number, context, page_number, section, source(*)")
+                                .in_("article_id", article_ids)
+                                .order("article_id").order("reference_number")):
+        references[reference["article_id"]].append(_reference_record(reference))
+
+    records = []
+    for row in rows:
+        revision = revisions.get(row.get("current_revision_id")) or {}
+        records.append(_compact({
+            "type": "article",
+            "id": row["id"],
+            "title": row["title"],
+            "created_at": row.get("created_at"),
+            "updated_at": row.get("updated_at"),
+            "revision_id": revision.get("id"),
+            "revision_timestamp": revision.get("timestamp"),
+            "author": usernames.get(revision.get("user_id")),
+            "comment": revision.get("comment"),
+            "content": revision.get("content"),
+            "references": references.get(row["id"], []),
+        }))
+    return records
+
+def _records(kind: str, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if kind == "article":
+        return _article_records(rows)
+    stream_path = TABLES[kind][3]
+    records = []
+    for row in rows:
+        record = {"type": kind, **row}
+        if stream_path:
+            # Media content is not exported; mirrors fetch it from the API
+            record["content_url"] = stream_path.format(id=row["id"])
+        records.append(_compact(record))
+    return records
+
+async def export_records(
+    types: Iterable[str] = EXPORT_TYPES,
+    since: Optional[str] = None,
+    page_size: int = PAGE_SIZE
+) -> AsyncIterator[Dict[str, Any]]:
+    """Every record of the requested types, then one trailing "export" record.
+
+    Memory stays at one page however large the tables are. With `since`,
+    only rows changed at or after it are included; music metadata has no
+    change timestamp and is always exported in full. The trailer's
+    `next_since` is the time this export started: passing it to the next
+    export picks up everything changed while this one ran (at the cost of
+    repeating a few records, which consumers should upsert by id).
+    Reference and source changes bump the citing articles' updated_at, so
+    they are picked up too. Deletions are not reported: there are no
+    tombstones, so a consumer only drops removed rows on a full export.
+    """
+    started_at = datetime.utcnow().isoformat()
+    counts = {}
+    for kind in types:
+        counts[kind] = 0
+        async for rows in scan_table(kind, since, page_size):
+            records = await asyncio.to_thread(_records, kind, rows)
+            counts[kind] += len(records)
+            for record in records:
+                yield record
+
+    yield {
+        "type": "export",
+        "exported_at": started_at,
+        "since": since,
+        "next_since": started_at,
+        "counts": counts,
+        "full_types": [kind for kind in counts if since is None or TABLES[kind][2] is None],
+    }
+
+async def ndjson_chunks(records: AsyncIterator[Dict[str, Any]]) -> AsyncIterator[bytes]:
+    """Encode records as newline-delimited JSON, grouped into ~CHUNK_BYTES writes"""
+    buffer: List[bytes] = []
+    size = 0
+    async for record in records:
+        line = json.dumps(record, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield b"".join(buffer)
+            buffer = []
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a single gzip member as it is produced"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 writes the gzip header and trailer
+    async for chunk in chunks:
+        data = await asyncio.to_thread(compressor.compress, chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_stream(fmt: str = "ndjson", types: Iterable[str] = EXPORT_TYPES, since: Optional[str] = None,
+                  page_size: int = PAGE_SIZE) -> AsyncIterator[bytes]:
+    """Bytes of an export: "ndjson", or "dump" for gzip-compressed NDJSON"""
+    chunks = ndjson_chunks(export_records(types, since, page_size))
+    return gzip_chunks(chunks) if fmt == "dump" else chunks
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Bulk import for Afropedia Backend
+Loads articles, books and media from a JSONL, CSV or tar archive in batches,
+checkpointing progress so an interrupted import resumes where it stopped
+
+Record fields by type (one JSON object per line, or one CSV row):
+  article: title, content, comment, author, created_at, comments[], references[]
+  book:    title, author, published_date, isbn, genre, summary, cover_file
+  image:   file, filename, content_type
+  music:   file, title, artist, album, cover_file
+  video:   file, filename, timestamp, user
+`file` and `cover_file` are paths inside the tar, or relative to a JSONL/CSV file.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+
+from importer.checkpoint import Checkpoint, file_fingerprint
+from importer.pipeline import BulkImporter, ImportStats
+from importer.readers import RECORD_TYPES, open_source
+
+def print_progress(stats: ImportStats):
+    created = ", ".join(f"{count} {kind}" for kind, count in sorted(stats.created.items())) or "nothing"
+    print(f"  batch {stats.batches}: {stats.records} records read, {'would create' if stats.dry_run else 'created'} {created}")
+
+def print_report(stats: ImportStats):
+    report = stats.to_dict()
+    print(f"\n📊 {'Dry run' if stats.dry_run else 'Import'} finished: {report['records']} records in {report['batches']} batches")
+    for label in ("created", "skipped", "failed"):
+        counts = report[label]
+        print(f"  {label:8} {', '.join(f'{count} {kind}' for kind, count in sorted(counts.items())) or '-'}")
+    print(f"  sources  {report['sources_created']} new")
+    if report["unknown_authors"]:
+        print(f"  ⚠️  {report['unknown_authors']} authors not found; their content is attributed to --user-id")
+    for error in report["errors"]:
+        print(f"  ❌ {error}")
+
+async def run_import(args) -> ImportStats:
+    checkpoint = None
+    if not args.dry_run:
+        checkpoint = Checkpoint(args.checkpoint or f"{args.path}.checkpoint.json", file_fingerprint(args.path))
+        if args.restart:
+            checkpoint.clear()
+
+    importer = BulkImporter(
+        batch_size=args.batch_size,
+        media_concurrency=args.media_concurrency,
+        dry_run=args.dry_run,
+        default_user_id=args.user_id,
+        checkpoint=checkpoint,
+        on_batch=None if args.json else print_progress
+    )
+    with open_source(args.path, args.format, args.type) as source:
+        return await importer.run(source)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import articles, books and media")
+    parser.add_argument("path", help="JSONL, CSV or tar (.tar, .tar.gz, .tgz, ...) file")
+    parser.add_argument("--format", choices=["jsonl", "csv", "tar"], help="Defaults to the file extension")
+    parser.add_argument("--type", choices=RECORD_TYPES, help="Type for records without a type field")
+    parser.add_argument("--batch-size", type=int, help="Records per batch (default: IMPORT_BATCH_SIZE)")
+    parser.add_argument("--media-concurrency", type=int, help="Media files uploaded at once")
+    parser.add_argument("--user-id", type=int, help="Author for records whose author is missing or unknown")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and resolve everything without writing")
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <path>.checkpoint.json)")
+    parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint")
+    parser.add_argument("--json", action="store_true", help="Print the final counters as JSON")
+    args = parser.parse_args()
+
+    try:
+        stats = asyncio.run(run_import(args))
+    except Exception as e:
+        print(f"❌ Import stopped: {e}")
+        if not args.dry_run:
+            print("   Run the same command again to resume from the last completed batch.")
+        sys.exit(1)
+
+    if args.json:
+        print(json.dumps(stats.to_dict(), indent=2))
+    else:
+        print_report(stats)
+    sys.exit(1 if sum(stats.failed.values()) else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# importer/__init__.py
@@ -0,0 +1,43 @@
+# importer/checkpoint.py
+import json
+import os
+from typing import Any, Dict, Optional
+
+class Checkpoint:
+    """Progress of one import input, saved after every committed batch.
+
+    `fingerprint` identifies the input (a content hash for uploads, size and
+    modification time for local files); a checkpoint written for a different
+    fingerprint is ignored so an edited file starts over.
+    """
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return state if state.get("fingerprint") == self.fingerprint else None
+
+    def save(self, position: int, stats: Dict[str, Any], completed: bool = False) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": self.fingerprint, "position": position, "completed": completed, "stats": stats}, f)
+        os.replace(temporary, self.path)
+
+    def clear(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+def file_fingerprint(path: str) -> str:
+    stat = os.stat(path)
+    return f"{stat.st_size}:{int(stat.st_mtime)}"
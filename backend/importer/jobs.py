@@ -0,0 +1,119 @@
+# importer/jobs.py
+import asyncio
+import logging
+import os
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from config import settings
+from importer.checkpoint import Checkpoint
+from importer.pipeline import BulkImporter
+from importer.readers import open_source
+
+logger = logging.getLogger("afropedia.import")
+
+class ImportJob:
+    def __init__(self, filename: str, fingerprint: str, dry_run: bool):
+        self.id = uuid.uuid4().hex[:12]
+        self.filename = filename
+        self.fingerprint = fingerprint
+        self.dry_run = dry_run
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.importer: Optional[BulkImporter] = None
+        self.task: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "filename": self.filename,
+            "dry_run": self.dry_run,
+            "status": self.status,
+            "error": self.error,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            "stats": self.importer.stats.to_dict() if self.importer else None,
+        }
+
+class ImportJobs:
+    """Uploaded imports running in the background of this worker.
+
+    Jobs live in memory, so their status is only visible on the worker that
+    accepted the upload. Progress is checkpointed under
+    `import_checkpoint_dir` by the upload's content hash: uploading the same
+    archive again after a failure or restart resumes where it stopped.
+    """
+
+    def __init__(self, max_finished: int = 50):
+        self.max_finished = max_finished
+        self.jobs: Dict[str, ImportJob] = {}
+
+    def running(self, fingerprint: str) -> Optional[ImportJob]:
+        for job in self.jobs.values():
+            if job.fingerprint == fingerprint and job.status == "running":
+                return job
+        return None
+
+    def start(self, path: str, filename: str, fingerprint: str, fmt: Optional[str] = None,
+              default_type: Optional[str] = None, dry_run: bool = False,
+              batch_size: Optional[int] = None, default_user_id: Optional[int] = None,
+              restart: bool = False) -> ImportJob:
+        """Import the file at `path` in the background; the file is deleted when the job ends"""
+        job = ImportJob(filename, fingerprint, dry_run)
+        checkpoint = Checkpoint(os.path.join(settings.import_checkpoint_dir, f"{fingerprint}.json"), fingerprint)
+        if restart and not dry_run:
+            checkpoint.clear()
+        job.importer = BulkImporter(
+            batch_size=batch_size,
+            dry_run=dry_run,
+            default_user_id=default_user_id,
+            checkpoint=checkpoint
+        )
+        job.task = asyncio.create_task(self._run(job, path, fmt, default_type))
+        self.jobs[job.id] = job
+        self._prune()
+        return job
+
+    async def _run(self, job: ImportJob, path: str, fmt: Optional[str], default_type: Optional[str]) -> None:
+        try:
+            source = await asyncio.to_thread(open_source, path, fmt, default_type, job.filename)
+            with source:
+                await job.importer.run(source)
+            job.status = "completed"
+        except asyncio.CancelledError:
+            job.status = "cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error(f"Import {job.id} of {job.filename} failed: {e}")
+        finally:
+            job.finished_at = datetime.utcnow()
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get(self, job_id: str) -> Optional[ImportJob]:
+        return self.jobs.get(job_id)
+
+    def list_jobs(self) -> List[Dict[str, Any]]:
+        return [job.to_dict() for job in sorted(self.jobs.values(), key=lambda job: job.started_at, reverse=True)]
+
+    def _prune(self) -> None:
+        finished = sorted((job for job in self.jobs.values() if job.status != "running"), key=lambda job: job.started_at)
+        for job in finished[:max(0, len(finished) - self.max_finished)]:
+            del self.jobs[job.id]
+
+    async def shutdown(self) -> None:
+        """Cancel running imports; their checkpoints let a re-upload resume them"""
+        tasks = [job.task for job in self.jobs.values() if job.task and not job.task.done()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# Global job registry
+import_jobs = ImportJobs()
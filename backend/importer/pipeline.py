@@ -0,0 +1,506 @@
+# importer/pipeline.py
+import asyncio
+import base64
+import itertools
+import logging
+import mimetypes
+import os
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import settings
+from importer.checkpoint import Checkpoint
+from importer.readers import RECORD_TYPES, ImportSource
+from search_service import search_service
+from supabase_client import supabase
+from title_catalog import title_catalog
+from tracing.tracer import tracer
+
+logger = logging.getLogger("afropedia.import")
+
+# kind -> (content table, metadata table)
+MEDIA_TABLES = {
+    "image": ("image_content", "image_metadata"),
+    "music": ("music_content", "music_metadata"),
+    "video": ("video_content", "videos"),
+}
+SOURCE_FIELDS = ("title", "url", "author", "publication", "publication_date", "access_date",
+                 "source_type", "isbn", "doi", "description")
+BOOK_FIELDS = ("title", "author", "published_date", "isbn", "genre", "summary", "cover_image")
+TIMESTAMP_FIELDS = ("created_at", "published_date", "publication_date", "access_date", "timestamp", "uploaded_at")
+MAX_REPORTED_ERRORS = 100
+
+def normalize_title(title: str) -> str:
+    """Article titles are stored with underscores, as the frontend builds them from URLs"""
+    return re.sub(r"\s+", "_", title.strip())
+
+def _label(record: Dict[str, Any]) -> str:
+    return str(record.get("title") or record.get("file") or record.get("filename") or "?")[:120]
+
+def _valid_timestamp(value: Any) -> bool:
+    if value is None:
+        return True
+    try:
+        datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        return True
+    except ValueError:
+        return False
+
+def validate_record(record: Dict[str, Any]) -> Optional[str]:
+    """Why a record cannot be imported, or None"""
+    if "_error" in record:
+        return record["_error"]
+    kind = record.get("type")
+    if kind not in RECORD_TYPES:
+        return f"{_label(record)}: unknown record type {kind!r}"
+
+    required = {"article": ("title", "content"), "book": ("title", "author"), "music": ("file", "title")}.get(kind, ("file",))
+    missing = [field for field in required if not isinstance(record.get(field), str) or not record[field].strip()]
+    if missing:
+        return f"{_label(record)}: missing {', '.join(missing)}"
+
+    for field in TIMESTAMP_FIELDS:
+        if not _valid_timestamp(record.get(field)):
+            return f"{_label(record)}: {field} is not an ISO 8601 date"
+
+    for field in ("comments", "references"):
+        items = record.get(field)
+        if items is not None and (not isinstance(items, list) or not all(isinstance(item, dict) for item in items)):
+            return f"{_label(record)}: {field} must be a list of objects"
+    for reference in record.get("references") or []:
+        if not (reference.get("title") or reference.get("url")):
+            return f"{_label(record)}: every reference needs a title or url"
+        if not all(_valid_timestamp(reference.get(field)) for field in ("publication_date", "access_date")):
+            return f"{_label(record)}: reference dates must be ISO 8601"
+    return None
+
+def _source_key(source: Dict[str, Any]) -> str:
+    # Sources are shared between articles: the same URL (or, without one, the same title) is one source
+    return f"url:{source['url']}" if source.get("url") else f"title:{source['title']}"
+
+def _music_artist(record: Dict[str, Any]) -> str:
+    # Stored value for a track's artist; duplicate detection keys on the same value
+    return (record.get("artist") or "").strip() or "Unknown"
+
+def _media_key(record: Dict[str, Any]) -> Tuple[str, ...]:
+    kind = record["type"]
+    if kind == "music":
+        return (kind, record["title"].strip().lower(), _music_artist(record).lower())
+    return (kind, _media_filename(record))
+
+def _media_filename(record: Dict[str, Any]) -> str:
+    return record.get("filename") or record.get("original_filename") or os.path.basename(record["file"])
+
+class ImportStats:
+    """Counters for one import; `created` means "would create" in a dry run"""
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None, dry_run: bool = False):
+        state = state or {}
+        self.dry_run = dry_run
+        self.records = state.get("records", 0)
+        self.batches = state.get("batches", 0)
+        self.created = Counter(state.get("created", {}))
+        self.skipped = Counter(state.get("skipped", {}))
+        self.failed = Counter(state.get("failed", {}))
+        self.sources_created = state.get("sources_created", 0)
+        self.unknown_authors = state.get("unknown_authors", 0)
+        self.errors: List[str] = list(state.get("errors", []))
+
+    def error(self, kind: str, message: str) -> None:
+        self.failed[kind] += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(message)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "dry_run": self.dry_run,
+            "records": self.records,
+            "batches": self.batches,
+            "created": dict(self.created),
+            "skipped": dict(self.skipped),
+            "failed": dict(self.failed),
+            "sources_created": self.sources_created,
+            "unknown_authors": self.unknown_authors,
+            "errors": self.errors,
+        }
+
+class BulkImporter:
+    """Streams records from an ImportSource into the database in batches.
+
+    Each batch costs a fixed number of round trips however many records it
+    holds: one query resolves authors, one finds titles that already exist,
+    two resolve sources and one creates the missing ones, one RPC inserts
+    every article with its revision, comments and references in a single
+    transaction, and one insert covers the books. Media files go through
+    the content tables concurrently, `media_concurrency` at a time.
+
+    Anything already stored (article titles, books by ISBN or title and
+    author, media by name) is skipped, so re-running an import is safe.
+    With a checkpoint, the position is saved after every batch and a rerun
+    resumes from it; a batch that fails with a database error stops the
+    run before its checkpoint, so the resumed run retries it.
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        media_concurrency: Optional[int] = None,
+        dry_run: bool = False,
+        default_user_id: Optional[int] = None,
+        checkpoint: Optional[Checkpoint] = None,
+        on_batch: Optional[Callable[[ImportStats], None]] = None
+    ):
+        self.batch_size = batch_size or settings.import_batch_size
+        self.media_concurrency = media_concurrency or settings.import_media_concurrency
+        self.dry_run = dry_run
+        self.default_user_id = default_user_id
+        # A dry run writes nothing, its progress included
+        self.checkpoint = None if dry_run else checkpoint
+        self.on_batch = on_batch
+        self.stats = ImportStats(dry_run=dry_run)
+        self._user_ids: Dict[str, Optional[int]] = {}
+        self._source_ids: Dict[str, int] = {}
+
+    async def run(self, source: ImportSource) -> ImportStats:
+        position = 0
+        state = self.checkpoint.load() if self.checkpoint else None
+        if state:
+            self.stats = ImportStats(state["stats"])
+            position = state["position"]
+            if state.get("completed"):
+                return self.stats
+            logger.info(f"Resuming import at record {position}")
+
+        records = itertools.islice(source.records(), position, None)
+        while True:
+            # Reading and parsing (possibly decompressing) stays off the event loop
+            batch = await asyncio.to_thread(lambda: list(itertools.islice(records, self.batch_size)))
+            if not batch:
+                break
+            with tracer.start_span("import batch", attributes={"import.records": len(batch), "import.dry_run": self.dry_run}):
+                await self._import_batch(source, batch)
+            position += len(batch)
+            self.stats.batches += 1
+            if self.checkpoint:
+                await asyncio.to_thread(self.checkpoint.save, position, self.stats.to_dict())
+            if self.on_batch:
+                self.on_batch(self.stats)
+
+        if self.checkpoint:
+            await asyncio.to_thread(self.checkpoint.save, position, self.stats.to_dict(), True)
+        if not self.dry_run:
+            if self.stats.created["book"]:
+                await search_service.index_books()
+            title_catalog.invalidate()
+        logger.info(f"Import finished: {self.stats.records} records, created {dict(self.stats.created)}")
+        return self.stats
+
+    async def _import_batch(self, source: ImportSource, batch: List[Dict[str, Any]]) -> None:
+        groups: Dict[str, List[Dict[str, Any]]] = {kind: [] for kind in RECORD_TYPES}
+        for record in batch:
+            if record.get("type") == "export":
+                # Trailer of a dump produced by the exporter
+                continue
+            self.stats.records += 1
+            if record.get("content_url") and not record.get("file"):
+                # Exported media metadata; the content is only reachable through the API
+                self.stats.skipped[record.get("type") or "unknown"] += 1
+                continue
+            problem = validate_record(record)
+            if problem:
+                self.stats.error(record.get("type") or "unknown", problem)
+            else:
+                groups[record["type"]].append(record)
+
+        media = groups["image"] + groups["music"] + groups["video"]
+        await asyncio.gather(
+            self._import_articles(groups["article"]),
+            self._import_books(source, groups["book"]),
+            self._import_media(source, media)
+        )
+
+    # Articles
+
+    async def _import_articles(self, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        created = await asyncio.to_thread(self._insert_articles, records)
+        if created:
+            await search_service.index_article_batch(created)
+
+    def _insert_articles(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        by_title: Dict[str, Dict[str, Any]] = {}
+        for record in records:
+            title = normalize_title(record["title"])
+            if title in by_title:
+                self.stats.skipped["article"] += 1
+            else:
+                by_title[title] = record
+
+        existing = supabase.table("article").select("title").in_("title", list(by_title)).execute().data or []
+        for row in existing:
+            by_title.pop(row["title"], None)
+            self.stats.skipped["article"] += 1
+        if not by_title:
+            return []
+
+        self._resolve_users(by_title.values())
+        self._resolve_sources([reference for record in by_title.values() for reference in record.get("references") or []])
+        if self.dry_run:
+            self.stats.created["article"] += len(by_title)
+            return []
+
+        payload = []
+        for title, record in by_title.items():
+            created_at = record.get("created_at") or datetime.utcnow().isoformat()
+            payload.append({
+                "title": title,
+                "content": record["content"],
+                "comment": record.get("comment") or "Imported",
+                "user_id": record["_user_id"],
+                "created_at": created_at,
+                "comments": [
+                    {"content": comment["content"], "user_id": comment["_user_id"], "created_at": comment.get("created_at")}
+                    for comment in record.get("comments") or [] if comment.get("content")
+                ],
+                "references": [
+                    {
+                        "source_id": self._source_ids[_source_key(reference)],
+                        "context": reference.get("context"),
+                        "page_number": reference.get("page_number"),
+                        "section": reference.get("section"),
+                    }
+                    for reference in record.get("references") or []
+                ],
+            })
+
+        rows = supabase.rpc("import_article_batch", {"p_articles": payload}).execute().data or []
+        self.stats.created["article"] += len(rows)
+        # Titles created by someone else since the lookup above
+        self.stats.skipped["article"] += len(payload) - len(rows)
+        return [
+            {
+                "id": row["out_article_id"],
+                "title": row["out_title"],
+                "created_at": by_title[row["out_title"]].get("created_at"),
+                "updated_at": by_title[row["out_title"]].get("created_at"),
+                "current_revision_id": row["out_revision_id"],
+                "content": by_title[row["out_title"]]["content"],
+            }
+            for row in rows
+        ]
+
+    def _resolve_users(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Set `_user_id` on records and their comments, looking up all new usernames in one query"""
+        people = []
+        for record in records:
+            people.append(record)
+            people.extend(record.get("comments") or [])
+
+        unknown = {str(person["author"]).lower() for person in people
+                   if person.get("author") and str(person["author"]).lower() not in self._user_ids}
+        if unknown:
+            names = {str(person["author"]) for person in people
+                     if person.get("author") and str(person["author"]).lower() in unknown}
+            rows = supabase.table("user").select("id, username").in_("username", sorted(names)).execute().data or []
+            for row in rows:
+                self._user_ids[row["username"].lower()] = row["id"]
+            for name in unknown:
+                self._user_ids.setdefault(name, None)
+
+        for person in people:
+            if person.get("user_id") is not None:
+                person["_user_id"] = person["user_id"]
+                continue
+            user_id = self._user_ids.get(str(person["author"]).lower()) if person.get("author") else None
+            if person.get("author") and user_id is None:
+                self.stats.unknown_authors += 1
+            person["_user_id"] = user_id if user_id is not None else self.default_user_id
+
+    def _resolve_sources(self, references: List[Dict[str, Any]]) -> None:
+        """Map references to source ids, creating the sources that do not exist yet in one insert"""
+        wanted: Dict[str, Dict[str, Any]] = {}
+        for reference in references:
+            if not reference.get("title"):
+                reference["title"] = reference["url"]
+            key = _source_key(reference)
+            if key not in self._source_ids:
+                wanted.setdefault(key, reference)
+        if not wanted:
+            return
+
+        urls = [reference["url"] for key, reference in wanted.items() if key.startswith("url:")]
+        titles = [reference["title"] for key, reference in wanted.items() if key.startswith("title:")]
+        if urls:
+            for row in supabase.table("source").select("id, url").in_("url", urls).execute().data or []:
+                self._source_ids[f"url:{row['url']}"] = row["id"]
+        if titles:
+            rows = supabase.table("source").select("id, title").in_("title", titles).is_("url", "null").execute().data or []
+            for row in rows:
+                self._source_ids[f"title:{row['title']}"] = row["id"]
+
+        missing = [reference for key, reference in wanted.items() if key not in self._source_ids]
+        if not missing:
+            return
+        self.stats.sources_created += len(missing)
+        if self.dry_run:
+            # Count each would-be source once across batches
+            self._source_ids.update((_source_key(reference), 0) for reference in missing)
+            return
+        rows = supabase.table("source").insert([
+            {field: reference[field] for field in SOURCE_FIELDS if reference.get(field) is not None}
+            for reference in missing
+        ]).execute().data or []
+        for row in rows:
+            self._source_ids[_source_key(row)] = row["id"]
+
+    # Books
+
+    async def _import_books(self, source: ImportSource, records: List[Dict[str, Any]]) -> None:
+        if records:
+            await asyncio.to_thread(self._insert_books, source, records)
+
+    def _insert_books(self, source: ImportSource, records: List[Dict[str, Any]]) -> None:
+        def keys(book: Dict[str, Any]) -> Set[Tuple[str, ...]]:
+            found = {("title", book["title"].strip().lower(), (book.get("author") or "").strip().lower())}
+            if book.get("isbn"):
+                found.add(("isbn", str(book["isbn"]).strip()))
+            return found
+
+        seen: Set[Tuple[str, ...]] = set()
+        titles = sorted({record["title"].strip() for record in records})
+        isbns = sorted({str(record["isbn"]).strip() for record in records if record.get("isbn")})
+        existing = supabase.table("book").select("title, author, isbn").in_("title", titles).execute().data or []
+        if isbns:
+            existing += supabase.table("book").select("title, author, isbn").in_("isbn", isbns).execute().data or []
+        for row in existing:
+            seen |= keys(row)
+
+        rows = []
+        now = datetime.utcnow().isoformat()
+        for record in records:
+            record_keys = keys(record)
+            if record_keys & seen:
+                self.stats.skipped["book"] += 1
+                continue
+            seen |= record_keys
+
+            if record.get("cover_file"):
+                try:
+                    if self.dry_run:
+                        if not source.has_media(record["cover_file"]):
+                            raise FileNotFoundError(record["cover_file"])
+                    else:
+                        record["cover_image"] = base64.b64encode(source.read_media(record["cover_file"])).decode("utf-8")
+                except (OSError, ValueError) as e:
+                    self.stats.error("book", f"{_label(record)}: cover {e}")
+                    continue
+
+            row = {field: record.get(field) for field in BOOK_FIELDS}
+            row["title"] = record["title"].strip()
+            row["published_date"] = record.get("published_date") or now
+            row["created_at"] = row["updated_at"] = now
+            rows.append(row)
+
+        if rows and not self.dry_run:
+            created = supabase.table("book").insert(rows).execute().data or []
+            self.stats.created["book"] += len(created)
+        else:
+            self.stats.created["book"] += len(rows)
+
+    # Media
+
+    async def _import_media(self, source: ImportSource, records: List[Dict[str, Any]]) -> None:
+        if not records:
+            return
+        existing = await asyncio.to_thread(self._existing_media, records)
+        pending = []
+        for record in records:
+            key = _media_key(record)
+            if key in existing:
+                self.stats.skipped[record["type"]] += 1
+            else:
+                existing.add(key)
+                pending.append(record)
+
+        slots = asyncio.Semaphore(self.media_concurrency)
+
+        async def store(record: Dict[str, Any]) -> None:
+            async with slots:
+                try:
+                    await asyncio.to_thread(self._store_media, source, record)
+                    self.stats.created[record["type"]] += 1
+                except (OSError, ValueError) as e:
+                    # Missing or unreadable files fail the record, database errors stop the run
+                    self.stats.error(record["type"], f"{_label(record)}: {e}")
+
+        await asyncio.gather(*(store(record) for record in pending))
+
+    def _existing_media(self, records: List[Dict[str, Any]]) -> Set[Tuple[str, ...]]:
+        existing: Set[Tuple[str, ...]] = set()
+        by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        for record in records:
+            by_kind.setdefault(record["type"], []).append(record)
+
+        if "image" in by_kind:
+            names = sorted({_media_filename(record) for record in by_kind["image"]})
+            for row in supabase.table("image_metadata").select("original_filename").in_("original_filename", names).execute().data or []:
+                existing.add(("image", row["original_filename"]))
+        if "video" in by_kind:
+            names = sorted({_media_filename(record) for record in by_kind["video"]})
+            for row in supabase.table("videos").select("filename").in_("filename", names).execute().data or []:
+                existing.add(("video", row["filename"]))
+        if "music" in by_kind:
+            titles = sorted({record["title"].strip() for record in by_kind["music"]})
+            for row in supabase.table("music_metadata").select("title, artist").in_("title", titles).execute().data or []:
+                existing.add(("music", (row["title"] or "").strip().lower(), _music_artist(row).lower()))
+        return existing
+
+    def _store_media(self, source: ImportSource, record: Dict[str, Any]) -> None:
+        kind = record["type"]
+        files = [record["file"]] + ([record["cover_file"]] if record.get("cover_file") else [])
+        if self.dry_run:
+            for name in files:
+                if not source.has_media(name):
+                    raise FileNotFoundError(f"{name} not found")
+            return
+
+        data = source.read_media(record["file"])
+        cover = source.read_media(record["cover_file"]) if record.get("cover_file") else None
+        content_table, metadata_table = MEDIA_TABLES[kind]
+        content = supabase.table(content_table).insert({
+            "binary_data": base64.b64encode(data).decode("utf-8")
+        }).execute()
+        content_id = content.data[0]["id"]
+
+        now = datetime.utcnow().isoformat()
+        if kind == "image":
+            filename = _media_filename(record)
+            metadata = {
+                "original_filename": filename,
+                "content_type": record.get("content_type") or mimetypes.guess_type(filename)[0] or "application/octet-stream",
+                "size_bytes": len(data),
+                "uploaded_at": record.get("uploaded_at") or now,
+            }
+        elif kind == "music":
+            metadata = {
+                "title": record["title"].strip(),
+                "artist": _music_artist(record),
+                "album": record.get("album") or "Unknown",
+            }
+            if cover:
+                metadata["cover_image"] = base64.b64encode(cover).decode("utf-8")
+        else:
+            metadata = {"filename": _media_filename(record), "timestamp": record.get("timestamp") or now}
+            if record.get("user"):
+                metadata["user"] = record["user"]
+        metadata["content_id"] = content_id
+
+        try:
+            supabase.table(metadata_table).insert(metadata).execute()
+        except Exception:
+            # Do not leave an unreachable blob behind
+            supabase.table(content_table).delete().eq("id", content_id).execute()
+            raise
@@ -0,0 +1,214 @@
+# importer/readers.py
+import csv
+import gzip
+import io
+import json
+import os
+import tarfile
+import threading
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+RECORD_TYPES = ("article", "book", "image", "music", "video")
+RECORD_SUFFIXES = (".jsonl", ".ndjson", ".csv")
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+def detect_format(filename: str) -> str:
+    name = filename.lower()
+    if name.endswith(TAR_SUFFIXES):
+        return "tar"
+    if name.removesuffix(".gz").endswith(".csv"):
+        return "csv"
+    return "jsonl"
+
+def _decode_cell(value: str) -> Any:
+    # Nested fields (comments, references) travel as JSON inside a CSV cell
+    stripped = value.strip()
+    if stripped[:1] in ("[", "{"):
+        try:
+            return json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
+    return value if stripped else None
+
+def iter_jsonl(stream: Iterable[str], origin: str) -> Iterator[Dict[str, Any]]:
+    """One record per line; unparseable lines become error records rather than stopping the import"""
+    for line_number, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"_error": f"{origin}:{line_number}: invalid JSON ({e.msg})"}
+            continue
+        yield record if isinstance(record, dict) else {"_error": f"{origin}:{line_number}: not a JSON object"}
+
+def iter_csv(stream: Iterable[str], origin: str) -> Iterator[Dict[str, Any]]:
+    for row in csv.DictReader(stream):
+        yield {key: _decode_cell(value) for key, value in row.items() if key and value is not None}
+
+def _iter_records(stream: Iterable[str], origin: str) -> Iterator[Dict[str, Any]]:
+    reader = iter_csv if origin.lower().removesuffix(".gz").endswith(".csv") else iter_jsonl
+    return reader(stream, origin)
+
+class ImportSource:
+    """Records to import plus the media files they refer to by name"""
+
+    def __init__(self, default_type: Optional[str] = None):
+        self.default_type = default_type
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def records(self) -> Iterator[Dict[str, Any]]:
+        """Records in a stable order, so a checkpointed position means the same thing on resume"""
+        for record in self._records():
+            if self.default_type and "type" not in record:
+                record["type"] = self.default_type
+            yield record
+
+    def read_media(self, name: str) -> bytes:
+        raise NotImplementedError
+
+    def has_media(self, name: str) -> bool:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class FileSource(ImportSource):
+    """A JSONL or CSV file, optionally gzipped (as exports are); media paths are relative to the file's directory"""
+
+    def __init__(self, path: str, default_type: Optional[str] = None, name: Optional[str] = None):
+        super().__init__(default_type)
+        self.path = path
+        self.name = name or path
+        self.base_dir = os.path.dirname(os.path.abspath(path))
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        with open(self.path, "rb") as raw:
+            compressed = raw.read(2) == b"\x1f\x8b"
+        opener = gzip.open if compressed else open
+        with opener(self.path, "rt", newline="", encoding="utf-8") as stream:
+            yield from _iter_records(stream, self.name)
+
+    def _media_path(self, name: str) -> str:
+        path = os.path.abspath(os.path.join(self.base_dir, name))
+        if os.path.commonpath([path, self.base_dir]) != self.base_dir:
+            raise ValueError(f"Media path escapes the import directory: {name}")
+        return path
+
+    def read_media(self, name: str) -> bytes:
+        with open(self._media_path(name), "rb") as media:
+            return media.read()
+
+    def has_media(self, name: str) -> bool:
+        return os.path.isfile(self._media_path(name))
+
+class _LockedStream(io.RawIOBase):
+    """Reads an archive member while holding the archive lock for each read only"""
+
+    def __init__(self, raw, lock: threading.Lock):
+        self._raw = raw
+        self._lock = lock
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        with self._lock:
+            data = self._raw.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+class TarSource(ImportSource):
+    """A tar archive (optionally compressed) holding .jsonl/.ndjson/.csv record files and media.
+
+    Record files are read in name order. Media members are looked up by
+    path inside the archive; reads are serialized because the members share
+    the archive's file object.
+    """
+
+    def __init__(self, path: str, default_type: Optional[str] = None):
+        super().__init__(default_type)
+        self.archive = tarfile.open(path, "r:*")
+        self._lock = threading.Lock()
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            members = sorted(
+                (member for member in self.archive.getmembers()
+                 if member.isfile() and member.name.lower().endswith(RECORD_SUFFIXES)),
+                key=lambda member: member.name
+            )
+        for member in members:
+            with self._lock:
+                raw = self.archive.extractfile(member)
+            # Members each keep their own offset, so record files stream while media is read in between
+            stream = io.TextIOWrapper(io.BufferedReader(_LockedStream(raw, self._lock)), encoding="utf-8", newline="")
+            yield from _iter_records(stream, member.name)
+
+    def _member(self, name: str) -> tarfile.TarInfo:
+        try:
+            member = self.archive.getmember(name[2:] if name.startswith("./") else name)
+        except KeyError:
+            raise FileNotFoundError(f"{name} is not in the archive")
+        if not member.isfile():
+            raise FileNotFoundError(f"{name} is not a file")
+        return member
+
+    def read_media(self, name: str) -> bytes:
+        with self._lock:
+            return self.archive.extractfile(self._member(name)).read()
+
+    def has_media(self, name: str) -> bool:
+        with self._lock:
+            try:
+                self._member(name)
+                return True
+            except FileNotFoundError:
+                return False
+
+    def close(self) -> None:
+        self.archive.close()
+
+class RecordSource(ImportSource):
+    """Records built in code, with media supplied as a name -> bytes mapping"""
+
+    def __init__(self, records: Iterable[Dict[str, Any]], media: Optional[Dict[str, bytes]] = None,
+                 default_type: Optional[str] = None):
+        super().__init__(default_type)
+        self._items = records
+        self.media = media or {}
+
+    def _records(self) -> Iterator[Dict[str, Any]]:
+        for record in self._items:
+            yield dict(record)
+
+    def read_media(self, name: str) -> bytes:
+        if name not in self.media:
+            raise FileNotFoundError(f"No media named {name}")
+        return self.media[name]
+
+    def has_media(self, name: str) -> bool:
+        return name in self.media
+
+def open_source(path: str, fmt: Optional[str] = None, default_type: Optional[str] = None,
+                name: Optional[str] = None) -> ImportSource:
+    fmt = fmt or detect_format(name or path)
+    if fmt == "tar":
+        return TarSource(path, default_type)
+    # The reader is chosen from the name, so give uploaded temp files one with the right suffix
+    origin = name or path
+    named_csv = origin.lower().removesuffix(".gz").endswith(".csv")
+    if fmt == "csv" and not named_csv:
+        origin += ".csv"
+    elif fmt == "jsonl" and named_csv:
+        origin += ".jsonl"
+    return FileSource(path, default_type, origin)
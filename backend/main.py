@@ -3,15 +3,12 @@ from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.util import get_remote_address
-from slowapi.errors import RateLimitExceeded
+from contextlib import asynccontextmanager
+import asyncio
+import importlib
 import os
 import logging
 
-# Import routers
-from routers import articles, auth, search, music, video, images, books, supabase_router, moderation, peer_review, enhanced_search, advanced_search, monitoring, sources
-
 # Import error handling and logging
 from utils.logging_config import setup_logging
 from utils.error_handlers import (
@@ -24,25 +21,131 @@ from utils.error_handlers import (
 from middleware.request_logging import RequestLoggingMiddleware, SecurityLoggingMiddleware
 from ssl_config.ssl_middleware import HTTPSRedirectMiddleware, SecurityHeadersMiddleware
 from config import settings
+from events.worker import OutboxWorker
+from events.invalidation import CacheInvalidationFeed
+from events.notifications import OverdueAssignmentScanner
+from events.pubsub import create_broker, get_broker, set_broker
+from auth.security import password_pool
+from ratelimit.limiter import limiter
+from supabase_client import supabase
+from search_service import search_service
+from title_catalog import title_catalog
+from utils.lazy_routes import LazyRouterApp
+from monitoring.metrics import metrics
+from monitoring.profiler import slow_requests
+from monitoring.health_checks import health_checker
+from tracing.tracer import instrument_routes, tracer
+from importer.jobs import import_jobs
 
 # Setup logging
 setup_logging(
     log_level=os.getenv("LOG_LEVEL", "INFO"),
     log_file=os.getenv("LOG_FILE", "logs/afropedia.log"),
-    enable_json=os.getenv("LOG_FORMAT", "json").lower() == "json"
+    enable_json=os.getenv("LOG_FORMAT", "json").lower() == "json",
+    queue_size=settings.log_queue_size,
+    max_bytes=settings.log_max_bytes,
+    backup_count=settings.log_backup_count,
+    # Set to "external" by start_railway.py when several workers share the file
+    rotate=os.getenv("LOG_ROTATION", "size").lower() != "external"
 )
 
 logger = logging.getLogger("afropedia.main")
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
+tracer.configure(
+    enabled=settings.tracing_enabled,
+    exporter=settings.tracing_exporter,
+    sample_rate=settings.tracing_sample_rate,
+    path=settings.tracing_file
+)
+
+# Background outbox worker for moderation side effects (search indexing, notifications)
+outbox_worker = OutboxWorker(
+    batch_size=settings.outbox_batch_size,
+    poll_interval=settings.outbox_poll_interval_seconds,
+    max_attempts=settings.outbox_max_attempts
+)
+
+# SSE subscribers and the outbox worker that publishes to them may sit in different workers
+set_broker(create_broker(settings.event_broker_url))
+
+# Runs in every worker: each holds its own principal and title caches
+invalidation_feed = CacheInvalidationFeed(poll_interval=settings.cache_invalidation_poll_seconds)
+
+overdue_scanner = OverdueAssignmentScanner(interval_seconds=settings.overdue_scan_interval_seconds)
+
+if settings.metrics_multiprocess_dir:
+    metrics.multiprocess_dir = settings.metrics_multiprocess_dir
+
+async def warm_up():
+    """Open connections and build caches before the worker takes traffic.
+
+    Every step is best-effort: a dependency that is down at boot should
+    degrade the endpoints that need it, not keep the worker from starting.
+    """
+    steps = {
+        "password_pool": password_pool.warm(),
+        "database": asyncio.to_thread(lambda: supabase.table("article").select("id").limit(1).execute()),
+        "title_catalog": title_catalog.refresh(),
+    }
+    if settings.search_index_warmup_enabled:
+        steps["search_indexes"] = search_service.initialize_indexes()
+
+    results = await asyncio.gather(*steps.values(), return_exceptions=True)
+    for name, result in zip(steps, results):
+        if isinstance(result, Exception) or result is False:
+            logger.warning(f"Warm-up step {name} failed: {result}")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Per-worker startup and shutdown.
+
+    Uvicorn stops accepting connections on SIGTERM and waits for in-flight
+    requests (up to --timeout-graceful-shutdown) before the code after
+    `yield` runs, so background tasks and pools outlive the last request.
+    """
+    warm_up_task = None
+    if settings.warmup_mode == "blocking":
+        await warm_up()
+    elif settings.warmup_mode == "background":
+        # Serve immediately; the first requests may pay for cold connections and caches
+        warm_up_task = asyncio.create_task(warm_up())
+    if settings.outbox_worker_enabled:
+        outbox_worker.start()
+        overdue_scanner.start()
+    invalidation_feed.start()
+    slow_requests.start(threshold_ms=settings.slow_request_capture_ms)
+    health_checker.start()
+    metrics_flush_task = None
+    if metrics.multiprocess_dir:
+        metrics_flush_task = asyncio.create_task(metrics.flush_periodically(settings.metrics_flush_interval_seconds))
+    logger.info("Afropedia worker ready", extra={"pid": os.getpid()})
+
+    yield
+
+    logger.info("Afropedia worker draining", extra={"pid": os.getpid()})
+    if warm_up_task and not warm_up_task.done():
+        warm_up_task.cancel()
+    await health_checker.stop()
+    await import_jobs.shutdown()
+    await outbox_worker.stop()
+    await overdue_scanner.stop()
+    await invalidation_feed.stop()
+    await get_broker().close()
+    await limiter.backend.close()
+    password_pool.shutdown()
+    slow_requests.stop()
+    if metrics_flush_task:
+        metrics_flush_task.cancel()
+        metrics.remove_snapshot()
+    tracer.shutdown()
 
 app = FastAPI(
     title="Afropedia API",
     description="A comprehensive knowledge platform for African content",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # Add custom middleware (order matters - last added is executed first)
@@ -85,31 +188,38 @@ app.add_middleware(
     expose_headers=["Content-Range", "X-Request-ID"]
 )
 
-# Add rate limiter to app
-app.state.limiter = limiter
-app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
-
 # Add exception handlers
 app.add_exception_handler(AfropediaException, afropedia_exception_handler)
 app.add_exception_handler(StarletteHTTPException, http_exception_handler)
 app.add_exception_handler(RequestValidationError, validation_exception_handler)
 app.add_exception_handler(Exception, general_exception_handler)
 
-# Optional: Include Routers
-app.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-app.include_router(articles.router, prefix="/articles", tags=["Articles"])
-app.include_router(search.router, prefix="/search", tags=["Search"])
-app.include_router(enhanced_search.router, prefix="/search", tags=["Enhanced Search"])
-app.include_router(advanced_search.router, prefix="/advanced-search", tags=["Advanced Search"])
-app.include_router(images.router, prefix="/images", tags=["Images"])
-app.include_router(music.router, prefix="/music", tags=["Music"])
-app.include_router(video.router, prefix="/videos", tags=["Videos"])
-app.include_router(books.router, prefix="/books", tags=["Books"])
-app.include_router(sources.router, prefix="/sources", tags=["Sources & References"])
-app.include_router(moderation.router, prefix="/moderation", tags=["Moderation"])
-app.include_router(peer_review.router, prefix="/peer-review", tags=["Peer Review"])
-app.include_router(monitoring.router, prefix="", tags=["Monitoring"])  # No prefix for monitoring endpoints
-app.include_router(supabase_router.router, prefix="/supabase", tags=["Supabase"])
+# Routers in mount order: (module, prefix, tags)
+ROUTERS = [
+    ("routers.auth", "/auth", ["Authentication"]),
+    ("routers.articles", "/articles", ["Articles"]),
+    ("routers.search", "/search", ["Search"]),
+    ("routers.enhanced_search", "/search", ["Enhanced Search"]),
+    ("routers.advanced_search", "/advanced-search", ["Advanced Search"]),
+    ("routers.images", "/images", ["Images"]),
+    ("routers.music", "/music", ["Music"]),
+    ("routers.video", "/videos", ["Videos"]),
+    ("routers.books", "/books", ["Books"]),
+    ("routers.sources", "/sources", ["Sources & References"]),
+    ("routers.moderation", "/moderation", ["Moderation"]),
+    ("routers.peer_review", "/peer-review", ["Peer Review"]),
+    ("routers.monitoring", "", ["Monitoring"]),  # No prefix for monitoring endpoints
+    ("routers.imports", "/admin/import", ["Admin Import"]),
+    ("routers.exports", "/admin/export", ["Admin Export"]),
+    ("routers.supabase_router", "/supabase", ["Supabase"]),
+]
+
+for module_path, prefix, tags in ROUTERS:
+    # Rarely used routers can be imported on their first request instead of at startup
+    if settings.lazy_router_loading and prefix and module_path.rsplit(".", 1)[-1] in settings.on_demand_routers:
+        app.mount(prefix, LazyRouterApp(module_path))
+    else:
+        app.include_router(importlib.import_module(module_path).router, prefix=prefix, tags=tags)
 
 
 
@@ -135,6 +245,10 @@ async def health_check():
         "version": "1.0.0"
     }
 
+# Handler spans for every route registered above
+if tracer.enabled:
+    instrument_routes(app.routes)
+
 # Log application startup
 logger.info("Afropedia API starting up", extra={
     "version": "1.0.0",
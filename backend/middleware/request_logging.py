@@ -1,198 +1,269 @@
 # middleware/request_logging.py
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+import random
+import re
 import time
 import uuid
 import logging
-from typing import Callable, Dict, Any
+from urllib.parse import unquote_plus
 
-from monitoring.metrics import metrics
+from starlette.requests import Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import settings
+from monitoring.metrics import metrics, route_template
+from monitoring.profiler import slow_requests
+from ratelimit.limiter import client_ip
+from utils.query_tracing import end_request_trace, finish_request_trace, start_request_trace
+from tracing.tracer import NOOP_SPAN, parse_traceparent, tracer
 
 logger = logging.getLogger("afropedia.requests")
+security_logger = logging.getLogger("afropedia.security")
+
+def ensure_request_id(scope: Scope) -> str:
+    """Request ID shared by every middleware and handler for one request"""
+    state = scope.setdefault("state", {})
+    if "request_id" not in state:
+        state["request_id"] = str(uuid.uuid4())
+    return state["request_id"]
+
+class RequestLoggingMiddleware:
+    """Pure ASGI middleware to log HTTP requests and responses.
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all HTTP requests and responses."""
-    
-    def __init__(self, app, log_body: bool = False, max_body_size: int = 1024):
-        super().__init__(app)
+    Headers are added as the response starts and timing is taken when the
+    last body chunk is sent, so streamed media passes through unbuffered.
+    Each request produces one record on completion. Errors and slow
+    requests are always logged; other requests are sampled at
+    `success_sample_rate`. Only allow-listed request headers are logged.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        log_body: bool = False,
+        max_body_size: int = 1024,
+        success_sample_rate: float = None,
+        slow_request_ms: float = None,
+        logged_headers: list = None
+    ):
+        self.app = app
         self.log_body = log_body
         self.max_body_size = max_body_size
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Generate unique request ID
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        # Start timing
-        start_time = time.time()
-        
-        # Extract request info
-        request_info = {
+        self.success_sample_rate = settings.log_success_sample_rate if success_sample_rate is None else success_sample_rate
+        self.slow_request_ms = settings.log_slow_request_ms if slow_request_ms is None else slow_request_ms
+        self.logged_headers = {
+            name.lower().encode("latin-1") for name in (settings.log_headers if logged_headers is None else logged_headers)
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = ensure_request_id(scope)
+        method = scope["method"]
+        path = scope["path"]
+        start_time = time.perf_counter()
+
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Incoming request: {method} {path}", extra=self._request_info(scope, request_id))
+
+        # Body logging observes chunks as the app reads them instead of buffering up front
+        body_chunks = []
+        body_size = 0
+        if self.log_body and method not in ("GET", "HEAD", "OPTIONS"):
+            inner_receive = receive
+
+            async def receive() -> Message:
+                nonlocal body_size
+                message = await inner_receive()
+                if message["type"] == "http.request":
+                    chunk = message.get("body", b"")
+                    body_size += len(chunk)
+                    if body_size <= self.max_body_size:
+                        body_chunks.append(chunk)
+                return message
+
+        status_code = 500
+        response_complete = False
+        # The request's own span; by the time the response is sent a handler span is usually current
+        server_span = NOOP_SPAN
+        request_id_header = (b"x-request-id", request_id.encode("latin-1"))
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_complete
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # Add request ID to response headers for tracing
+                message["headers"] = list(message.get("headers", [])) + [request_id_header]
+                if server_span.traceparent:
+                    # W3C traceresponse: lets the caller find this request's trace
+                    message["headers"].append((b"traceresponse", server_span.traceparent.encode("latin-1")))
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                response_complete = True
+                self._log_response(scope, request_id, status_code, start_time, body_chunks, body_size, server_span)
+
+        # Database queries made while serving this request are attributed to it
+        trace_token = start_request_trace(request_id)
+        slow_requests.begin(request_id, method, path)
+        # Server span, continuing the caller's trace when a W3C traceparent header is present
+        parent = None
+        if tracer.enabled:
+            headers = {
+                name: value.decode("latin-1")
+                for name, value in scope.get("headers", [])
+                if name in (b"traceparent", b"tracestate")
+            }
+            parent = parse_traceparent(headers.get(b"traceparent"), headers.get(b"tracestate"))
+        try:
+            with tracer.start_span(
+                f"{method} {path}",
+                kind="server",
+                parent=parent,
+                attributes={"http.request.method": method, "url.path": path, "afropedia.request_id": request_id}
+            ) as server_span:
+                try:
+                    await self.app(scope, receive, send_wrapper)
+                except Exception as e:
+                    duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+                    logger.error(
+                        f"Request exception: {method} {path}",
+                        extra={
+                            "request_id": request_id,
+                            "exception": str(e),
+                            "exception_type": type(e).__name__,
+                            "duration_ms": duration_ms,
+                        },
+                        exc_info=True
+                    )
+                    # The server answers 500 if nothing was sent; a broken stream keeps its status
+                    if not response_complete:
+                        server_span.record_exception(e)
+                        self._log_response(scope, request_id, status_code, start_time, body_chunks, body_size, server_span)
+                    raise
+        finally:
+            slow_requests.discard(request_id)
+            end_request_trace(trace_token)
+
+    def _request_info(self, scope: Scope, request_id: str) -> dict:
+        request = Request(scope)
+        return {
             "request_id": request_id,
-            "method": request.method,
-            "url": str(request.url),
-            "path": request.url.path,
+            "method": scope["method"],
+            "path": scope["path"],
             "query_params": dict(request.query_params),
-            "headers": dict(request.headers),
-            "client_ip": self._get_client_ip(request),
+            "headers": {
+                name.decode("latin-1"): value.decode("latin-1")
+                for name, value in scope.get("headers", [])
+                if name in self.logged_headers
+            },
+            "client_ip": client_ip(request),
             "user_agent": request.headers.get("user-agent", ""),
         }
-        
-        # Log request body if enabled (for non-GET requests)
-        if self.log_body and request.method not in ["GET", "HEAD", "OPTIONS"]:
-            try:
-                body = await request.body()
-                if len(body) <= self.max_body_size:
-                    request_info["body"] = body.decode("utf-8", errors="ignore")
-                else:
-                    request_info["body"] = f"<body too large: {len(body)} bytes>"
-            except Exception as e:
-                request_info["body"] = f"<could not read body: {str(e)}>"
-        
-        # Log incoming request
-        logger.info(
-            f"Incoming request: {request.method} {request.url.path}",
-            extra=request_info
+
+    def _log_response(self, scope, request_id, status_code, start_time, body_chunks, body_size, span):
+        method = scope["method"]
+        path = scope["path"]
+        duration_ms = round((time.perf_counter() - start_time) * 1000, 2)
+        route = route_template(scope)
+        span.update_name(f"{method} {route}")
+        span.set_attribute("http.route", route)
+        span.set_attribute("http.response.status_code", status_code)
+        if status_code >= 500:
+            span.set_status("ERROR")
+
+        # Metrics see every request, labelled by route template; only the log line is sampled
+        metrics.record_request(
+            method=method,
+            endpoint=route,
+            status_code=status_code,
+            duration_ms=duration_ms
         )
-        
-        try:
-            # Process request
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration_ms = round((time.time() - start_time) * 1000, 2)
-            
-            # Log response
-            response_info = {
-                "request_id": request_id,
-                "status_code": response.status_code,
-                "duration_ms": duration_ms,
-                "response_headers": dict(response.headers),
-            }
-            
-            # Determine log level based on status code
-            if response.status_code >= 500:
-                log_level = logging.ERROR
-                log_message = f"Request failed: {request.method} {request.url.path} - {response.status_code}"
-            elif response.status_code >= 400:
-                log_level = logging.WARNING
-                log_message = f"Request error: {request.method} {request.url.path} - {response.status_code}"
-            else:
-                log_level = logging.INFO
-                log_message = f"Request completed: {request.method} {request.url.path} - {response.status_code}"
-            
-            logger.log(
-                log_level,
-                log_message,
-                extra=response_info
-            )
-            
-            # Add request ID to response headers for tracing
-            response.headers["X-Request-ID"] = request_id
-            
-            # Record metrics
-            metrics.record_request(
-                method=request.method,
-                endpoint=request.url.path,
-                status_code=response.status_code,
-                duration_ms=duration_ms
+        trace = finish_request_trace(route)
+        slow_requests.finish(request_id, route, status_code, duration_ms, trace)
+
+        if status_code < 400 and duration_ms < self.slow_request_ms and random.random() >= self.success_sample_rate:
+            return
+
+        response_info = self._request_info(scope, request_id)
+        response_info.update({
+            "status_code": status_code,
+            "duration_ms": duration_ms,
+        })
+        if span.trace_id:
+            response_info["trace_id"] = span.trace_id
+        if trace is not None:
+            response_info["db_queries"] = len(trace.queries)
+            response_info["db_time_ms"] = round(trace.db_time, 2)
+        if body_size:
+            response_info["body"] = (
+                b"".join(body_chunks).decode("utf-8", errors="ignore")
+                if body_size <= self.max_body_size
+                else f"<body too large: {body_size} bytes>"
             )
-            
-            return response
-            
-        except Exception as e:
-            # Calculate duration for failed requests
-            duration_ms = round((time.time() - start_time) * 1000, 2)
-            
-            # Log exception
-            logger.error(
-                f"Request exception: {request.method} {request.url.path}",
+
+        # Determine log level based on status code
+        if status_code >= 500:
+            log_level = logging.ERROR
+            log_message = f"Request failed: {method} {path} - {status_code}"
+        elif status_code >= 400:
+            log_level = logging.WARNING
+            log_message = f"Request error: {method} {path} - {status_code}"
+        else:
+            log_level = logging.INFO
+            log_message = f"Request completed: {method} {path} - {status_code}"
+        logger.log(log_level, log_message, extra=response_info)
+
+# Substrings that flag a request for the security log, matched in one pass
+SUSPICIOUS_PATTERNS = [
+    "admin", "root", "test", "debug", "config",
+    ".env", "password", "secret", "token",
+    "../", "..\\", "<script", "javascript:",
+    "union", "select", "drop", "insert", "update"
+]
+SUSPICIOUS_MATCHER = re.compile("|".join(re.escape(pattern) for pattern in SUSPICIOUS_PATTERNS))
+
+class SecurityLoggingMiddleware:
+    """Pure ASGI middleware to log security-related events."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        request_path = path.lower()
+        query_string = unquote_plus(scope.get("query_string", b"").decode("latin-1")).lower()
+
+        # Log suspicious requests
+        match = SUSPICIOUS_MATCHER.search(request_path) or SUSPICIOUS_MATCHER.search(query_string)
+        if match:
+            request = Request(scope)
+            security_logger.warning(
+                f"Suspicious request detected: {match.group(0)}",
                 extra={
-                    "request_id": request_id,
-                    "exception": str(e),
-                    "exception_type": type(e).__name__,
-                    "duration_ms": duration_ms,
-                },
-                exc_info=True
+                    "request_id": ensure_request_id(scope),
+                    "pattern": match.group(0),
+                    "path": path,
+                    "query_params": dict(request.query_params),
+                    "client_ip": client_ip(request),
+                    "user_agent": request.headers.get("user-agent", ""),
+                }
             )
-            
-            # Re-raise the exception
-            raise
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP address from request."""
-        # Check for forwarded headers (common in production behind proxies)
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        # Fallback to direct client IP
-        if hasattr(request, "client") and request.client:
-            return request.client.host
-        
-        return "unknown"
-
-class SecurityLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log security-related events."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        security_logger = logging.getLogger("afropedia.security")
-        
-        # Check for suspicious patterns
-        suspicious_patterns = [
-            "admin", "root", "test", "debug", "config",
-            ".env", "password", "secret", "token",
-            "../", "..\\", "<script", "javascript:",
-            "union", "select", "drop", "insert", "update"
-        ]
-        
-        request_path = request.url.path.lower()
-        query_string = str(request.query_params).lower()
-        
-        # Log suspicious requests
-        for pattern in suspicious_patterns:
-            if pattern in request_path or pattern in query_string:
-                security_logger.warning(
-                    f"Suspicious request detected: {pattern}",
-                    extra={
-                        "request_id": getattr(request.state, "request_id", "unknown"),
-                        "pattern": pattern,
-                        "path": request.url.path,
-                        "query_params": dict(request.query_params),
-                        "client_ip": self._get_client_ip(request),
-                        "user_agent": request.headers.get("user-agent", ""),
-                    }
-                )
-                break
-        
+
         # Log authentication attempts
         if "/auth/" in request_path:
+            request = Request(scope)
             security_logger.info(
-                f"Authentication attempt: {request.method} {request.url.path}",
+                f"Authentication attempt: {scope['method']} {path}",
                 extra={
-                    "request_id": getattr(request.state, "request_id", "unknown"),
-                    "client_ip": self._get_client_ip(request),
+                    "request_id": ensure_request_id(scope),
+                    "client_ip": client_ip(request),
                     "user_agent": request.headers.get("user-agent", ""),
                 }
             )
-        
-        return await call_next(request)
-    
-    def _get_client_ip(self, request: Request) -> str:
-        """Extract client IP address from request."""
-        forwarded_for = request.headers.get("X-Forwarded-For")
-        if forwarded_for:
-            return forwarded_for.split(",")[0].strip()
-        
-        real_ip = request.headers.get("X-Real-IP")
-        if real_ip:
-            return real_ip
-        
-        if hasattr(request, "client") and request.client:
-            return request.client.host
-        
-        return "unknown"
+
+        await self.app(scope, receive, send)
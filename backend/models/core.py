@@ -23,6 +23,7 @@ class User(UserBase, table=True):
     role: str = Field(default="user", index=True) # User role for moderation
     is_active: bool = Field(default=True) # Account status
     reputation_score: int = Field(default=0) # User reputation for moderation
+    token_version: int = Field(default=0) # Bumped to revoke issued access tokens
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow}, nullable=False)
     revisions: List["Revision"] = Relationship(back_populates="user") # Relationship defined later
@@ -457,4 +458,12 @@ class ReferenceUpdate(SQLModel):
     reference_number: Optional[int] = None
     context: Optional[str] = None
     page_number: Optional[str] = None
-    section: Optional[str] = None
\ No newline at end of file
+    section: Optional[str] = None
+
+class ReferenceListItem(SQLModel):
+    """One entry of an article's full reference list; numbered by its position"""
+    id: Optional[int] = None  # Existing reference to keep; omitted for new ones
+    source_id: int
+    context: Optional[str] = None
+    page_number: Optional[str] = None
+    section: Optional[str] = None
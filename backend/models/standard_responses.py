@@ -1,6 +1,6 @@
 # models/standard_responses.py
 from pydantic import BaseModel
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List
 from datetime import datetime
 
 class StandardResponse(BaseModel):
@@ -29,6 +29,27 @@ class PaginatedResponse(BaseModel):
     timestamp: datetime = datetime.utcnow()
     version: str = "1.0.0"
 
+    @classmethod
+    def keyset(
+        cls,
+        data: List[Any],
+        limit: int,
+        next_cursor: Optional[str],
+        sort: str = "id",
+        descending: bool = False
+    ) -> "PaginatedResponse":
+        """Page of a cursor listing; pass `next_cursor` back as `cursor` for the next page"""
+        return cls(
+            data=data,
+            pagination={
+                "limit": limit,
+                "sort": sort,
+                "order": "desc" if descending else "asc",
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
+        )
+
 class HealthResponse(BaseModel):
     """Standard health check response"""
     status: str
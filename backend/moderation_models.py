@@ -63,6 +63,7 @@ class ModerationQueue(ModerationQueueBase, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     submitted_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     assigned_to: Optional[int] = Field(default=None, foreign_key="user.id")
+    lease_expires_at: Optional[datetime] = Field(default=None)
     created_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
     updated_at: datetime = Field(default_factory=datetime.utcnow, nullable=False)
 
@@ -119,6 +120,7 @@ class ModerationQueueRead(ModerationQueueBase):
     id: int
     submitted_at: datetime
     assigned_to: Optional[int]
+    lease_expires_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
 
@@ -187,3 +189,15 @@ class RejectContentRequest(SQLModel):
     content_type: str
     content_id: int
     reason: Optional[str] = None
+
+class ModerationItemRef(SQLModel):
+    content_type: str
+    content_id: int
+
+class BulkApproveContentRequest(SQLModel):
+    items: List[ModerationItemRef]
+    reason: Optional[str] = None
+
+class BulkRejectContentRequest(SQLModel):
+    items: List[ModerationItemRef]
+    reason: Optional[str] = None
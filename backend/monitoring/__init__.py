@@ -0,0 +1 @@
+# monitoring/__init__.py
@@ -0,0 +1,398 @@
+# monitoring/metrics.py
+import asyncio
+import glob
+import json
+import math
+import os
+import re
+import time
+import logging
+from bisect import bisect_left
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, List, Tuple
+import threading
+
+logger = logging.getLogger("afropedia.metrics")
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Upper bounds (inclusive) of the fixed histogram buckets, by unit
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MILLISECONDS_BUCKETS = tuple(bound * 1000 for bound in SECONDS_BUCKETS)
+COUNT_BUCKETS = (1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144)
+
+def default_buckets(name: str) -> Tuple[float, ...]:
+    if name.endswith("_seconds"):
+        return SECONDS_BUCKETS
+    if name.endswith("_ms"):
+        return MILLISECONDS_BUCKETS
+    return COUNT_BUCKETS
+
+def route_template(scope: Dict[str, Any]) -> str:
+    """Matched route path ("/articles/{title}") for a finished request.
+
+    Raw paths would create one series per article title; requests that
+    matched no route share a single label.
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if not path:
+        return "<unmatched>"
+    # Routers mounted lazily see paths relative to their mount point
+    mount_prefix = scope.get("root_path", "")[len(scope.get("app_root_path", "")):]
+    return mount_prefix + path
+
+class Histogram:
+    """Fixed-bucket histogram: constant memory, cheap to merge across workers"""
+
+    __slots__ = ("bounds", "counts", "sum", "count", "lock")
+
+    def __init__(self, bounds: Tuple[float, ...]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+
+    def state(self) -> Tuple[List[int], float, int]:
+        """Bucket counts, sum and count copied under the lock, so they agree with each other"""
+        with self.lock:
+            return list(self.counts), self.sum, self.count
+
+    def merge(self, counts: List[int], total: float, count: int) -> None:
+        with self.lock:
+            for index, bucket_count in enumerate(counts):
+                self.counts[index] += bucket_count
+            self.sum += total
+            self.count += count
+
+    def quantile(self, q: float) -> float:
+        """Estimate a quantile by linear interpolation inside its bucket (as histogram_quantile does)"""
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if cumulative + bucket_count >= rank and bucket_count:
+                if index == len(self.bounds):
+                    return self.bounds[-1]  # Beyond the last bound: report the bound
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index]
+                return lower + (upper - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.bounds[-1]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "average": round(self.sum / self.count, 6) if self.count else 0,
+            "p50": round(self.quantile(0.50), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "p99": round(self.quantile(0.99), 6),
+        }
+
+class MetricsCollector:
+    """Counters, gauges and fixed-bucket histograms keyed by name and labels.
+
+    Each update holds a lock only for the increment itself. With several
+    workers, each one periodically writes a snapshot to `multiprocess_dir`
+    and exports merge every live worker's snapshot.
+    """
+
+    def __init__(self, multiprocess_dir: Optional[str] = None, stale_after_seconds: float = 600.0):
+        self.counters: Dict[Tuple[str, LabelKey], float] = {}
+        self.gauges: Dict[Tuple[str, LabelKey], float] = {}
+        self.histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self.buckets: Dict[str, Tuple[float, ...]] = {}
+        self.lock = threading.Lock()
+        self.multiprocess_dir = multiprocess_dir
+        self.stale_after_seconds = stale_after_seconds
+
+        # Application metrics
+        self.start_time = time.time()
+
+    @staticmethod
+    def _label_key(labels: Optional[Dict[str, str]]) -> LabelKey:
+        return tuple(sorted((str(k), str(v)) for k, v in (labels or {}).items()))
+
+    def describe_histogram(self, name: str, buckets: Tuple[float, ...]) -> None:
+        """Use custom bucket bounds for a histogram (before its first observation)"""
+        self.buckets[name] = tuple(sorted(buckets))
+
+    def increment_counter(self, name: str, value: int = 1, labels: Optional[Dict[str, str]] = None):
+        """Increment a counter metric."""
+        key = (name, self._label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Set a gauge metric value."""
+        self.gauges[(name, self._label_key(labels))] = value
+
+    def record_histogram(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        """Record a value in a histogram."""
+        key = (name, self._label_key(labels))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            with self.lock:
+                histogram = self.histograms.setdefault(key, Histogram(self.buckets.get(name) or default_buckets(name)))
+        histogram.observe(value)
+
+    def start_timer(self, name: str, labels: Optional[Dict[str, str]] = None) -> 'Timer':
+        """Start a timer for measuring duration."""
+        return Timer(self, name, labels)
+
+    def record_request(self, method: str, endpoint: str, status_code: int, duration_ms: float):
+        """Record HTTP request metrics; `endpoint` should be a route template, not a raw path."""
+        self.increment_counter("http_requests_total", labels={
+            "method": method,
+            "endpoint": endpoint,
+            "status": str(status_code)
+        })
+        self.record_histogram("http_request_duration_seconds", duration_ms / 1000, labels={
+            "method": method,
+            "endpoint": endpoint
+        })
+
+    # --- Snapshots and cross-worker aggregation ---
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            histograms = list(self.histograms.items())
+            counters = list(self.counters.items())
+        return {
+            "pid": os.getpid(),
+            "start_time": self.start_time,
+            "counters": [[name, list(labels), value] for (name, labels), value in counters],
+            "gauges": [[name, list(labels), value] for (name, labels), value in list(self.gauges.items())],
+            "histograms": [
+                [name, list(labels), list(h.bounds), *h.state()]
+                for (name, labels), h in histograms
+            ],
+        }
+
+    def write_snapshot(self) -> None:
+        """Publish this worker's metrics for the worker that serves the next scrape"""
+        if not self.multiprocess_dir:
+            return
+        path = os.path.join(self.multiprocess_dir, f"metrics-{os.getpid()}.json")
+        temporary = f"{path}.tmp"
+        try:
+            with open(temporary, "w") as handle:
+                json.dump(self.snapshot(), handle)
+            os.replace(temporary, path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics snapshot: {e}")
+
+    def remove_snapshot(self) -> None:
+        """Withdraw this worker's snapshot on shutdown"""
+        if self.multiprocess_dir:
+            try:
+                os.remove(os.path.join(self.multiprocess_dir, f"metrics-{os.getpid()}.json"))
+            except OSError:
+                pass
+
+    async def flush_periodically(self, interval_seconds: float) -> None:
+        """Keep this worker's snapshot fresh for scrapes served by other workers"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            await asyncio.to_thread(self.write_snapshot)
+
+    def _snapshots(self) -> List[Dict[str, Any]]:
+        if not self.multiprocess_dir:
+            return [self.snapshot()]
+        self.write_snapshot()
+        snapshots = []
+        cutoff = time.time() - self.stale_after_seconds
+        for path in glob.glob(os.path.join(self.multiprocess_dir, "metrics-*.json")):
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    continue  # Worker gone; Prometheus treats the drop as a counter reset
+                with open(path) as handle:
+                    snapshots.append(json.load(handle))
+            except (OSError, ValueError):
+                continue
+        return snapshots
+
+    def collect(self) -> "MetricsCollector":
+        """Metrics merged across every live worker (or just this one)"""
+        snapshots = self._snapshots()
+        merged = MetricsCollector()
+        merged.start_time = min((s["start_time"] for s in snapshots), default=self.start_time)
+        for snapshot in snapshots:
+            pid = str(snapshot["pid"])
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(map(tuple, labels)))
+                merged.counters[key] = merged.counters.get(key, 0) + value
+            for name, labels, value in snapshot["gauges"]:
+                # Gauges are point-in-time values; keep one series per worker
+                worker_labels = tuple(sorted(list(map(tuple, labels)) + ([("worker", pid)] if len(snapshots) > 1 else [])))
+                merged.gauges[(name, worker_labels)] = value
+            for name, labels, bounds, counts, total, count in snapshot["histograms"]:
+                key = (name, tuple(map(tuple, labels)))
+                histogram = merged.histograms.setdefault(key, Histogram(tuple(bounds)))
+                histogram.merge(counts, total, count)
+        return merged
+
+    # --- Exports ---
+
+    def get_metrics_summary(self) -> Dict[str, Any]:
+        """Get a summary of all metrics."""
+        merged = self.collect()
+        uptime = time.time() - merged.start_time
+
+        status_code_counts: Dict[str, float] = {}
+        request_count = 0
+        error_count = 0
+        for (name, labels), value in merged.counters.items():
+            if name != "http_requests_total":
+                continue
+            status = dict(labels).get("status", "0")
+            status_code_counts[status] = status_code_counts.get(status, 0) + value
+            request_count += value
+            if int(status) >= 400:
+                error_count += value
+
+        durations = Histogram(SECONDS_BUCKETS)
+        for (name, labels), histogram in merged.histograms.items():
+            if name == "http_request_duration_seconds":
+                durations.merge(histogram.counts, histogram.sum, histogram.count)
+        overall = durations.summary()
+
+        return {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "uptime_seconds": uptime,
+            "application": {
+                "requests_total": request_count,
+                "requests_per_second": round(request_count / uptime, 2) if uptime > 0 else 0,
+                "average_response_time_ms": round(overall["average"] * 1000, 2),
+                "p50_response_time_ms": round(overall["p50"] * 1000, 2),
+                "p95_response_time_ms": round(overall["p95"] * 1000, 2),
+                "p99_response_time_ms": round(overall["p99"] * 1000, 2),
+                "error_count": error_count,
+                "error_rate_percent": round(error_count / request_count * 100, 2) if request_count else 0
+            },
+            "http_status_codes": status_code_counts,
+            "counters": {self._make_key(name, dict(labels)): value for (name, labels), value in merged.counters.items()},
+            "gauges": {self._make_key(name, dict(labels)): value for (name, labels), value in merged.gauges.items()},
+            "histograms": {
+                self._make_key(name, dict(labels)): histogram.summary()
+                for (name, labels), histogram in merged.histograms.items()
+            }
+        }
+
+    def get_prometheus_metrics(self) -> str:
+        """Export metrics in the Prometheus text exposition format (0.0.4)."""
+        merged = self.collect()
+        lines: List[str] = []
+
+        def families(series: Dict[Tuple[str, LabelKey], Any]) -> Dict[str, List[Tuple[LabelKey, Any]]]:
+            grouped: Dict[str, List[Tuple[LabelKey, Any]]] = {}
+            for (name, labels), value in sorted(series.items(), key=lambda item: item[0]):
+                grouped.setdefault(_metric_name(name), []).append((labels, value))
+            return grouped
+
+        for name, series in families(merged.counters).items():
+            lines.append(f"# TYPE {name} counter")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in series)
+
+        for name, series in families(merged.gauges).items():
+            lines.append(f"# TYPE {name} gauge")
+            lines.extend(f"{name}{_format_labels(labels)} {_format_value(value)}" for labels, value in series)
+
+        for name, series in families(merged.histograms).items():
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in series:
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.bounds + (math.inf,), histogram.counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == math.inf else _format_value(bound)
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        # Application metrics
+        lines.append("# TYPE afropedia_uptime_seconds gauge")
+        lines.append(f"afropedia_uptime_seconds {_format_value(time.time() - merged.start_time)}")
+
+        return "\n".join(lines) + "\n"
+
+    def _make_key(self, name: str, labels: Optional[Dict[str, str]]) -> str:
+        """Create a unique key for metrics with labels."""
+        if not labels:
+            return name
+
+        label_str = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+        return f"{name}{{{label_str}}}"
+
+def _metric_name(name: str) -> str:
+    name = re.sub(r"[^a-zA-Z0-9_:]", "_", name)
+    return name if re.match(r"[a-zA-Z_:]", name) else f"_{name}"
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(
+        f'{re.sub(r"[^a-zA-Z0-9_]", "_", key)}="{_escape_label_value(value)}"' for key, value in labels
+    ) + "}"
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class Timer:
+    """Context manager for timing operations."""
+
+    def __init__(self, collector: MetricsCollector, name: str, labels: Optional[Dict[str, str]] = None):
+        self.collector = collector
+        self.name = name
+        self.labels = labels
+        self.start_time = None
+
+    def __enter__(self):
+        self.start_time = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.start_time:
+            duration = time.perf_counter() - self.start_time
+            self.collector.record_histogram(f"{self.name}_duration_seconds", duration, self.labels)
+
+# Global metrics collector; workers share exports through this directory when it is set
+metrics = MetricsCollector(multiprocess_dir=os.getenv("METRICS_MULTIPROCESS_DIR") or None)
+
+# Convenience functions
+def increment_counter(name: str, value: int = 1, **labels):
+    """Increment a counter metric."""
+    metrics.increment_counter(name, value, labels)
+
+def set_gauge(name: str, value: float, **labels):
+    """Set a gauge metric."""
+    metrics.set_gauge(name, value, labels)
+
+def record_histogram(name: str, value: float, **labels):
+    """Record a histogram value."""
+    metrics.record_histogram(name, value, labels)
+
+def time_function(name: str, **labels):
+    """Decorator to time function execution."""
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            with metrics.start_timer(name, labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,176 @@
+# monitoring/profiler.py
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("afropedia.profiler")
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = os.path.join(*code.co_filename.split(os.sep)[-2:]) if code.co_filename else "?"
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+def collapse_stack(frame) -> str:
+    """Render a frame chain root-first, `;`-separated, as flamegraph.pl and speedscope expect"""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+def _task_stack(task: asyncio.Task) -> str:
+    # Coroutine frames of a suspended task, read from another thread for diagnostics only
+    try:
+        frames = task.get_stack(limit=64)
+    except Exception:
+        return ""
+    return ";".join(_frame_label(frame) for frame in frames)
+
+class ProfilerBusy(Exception):
+    """Raised when a profiling window is already running"""
+
+class StackSampler:
+    """Statistical profiler: samples every thread's stack at a fixed interval.
+
+    Runs on its own thread and only reads `sys._current_frames()`, so the
+    profiled code is not instrumented and pays only for the GIL hand-offs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def profile(self, seconds: float, interval_ms: float = 5.0) -> Dict[str, Any]:
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusy()
+        try:
+            own_thread = threading.get_ident()
+            thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+            stacks: Counter = Counter()
+            samples = 0
+            interval = interval_ms / 1000
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_thread:
+                        continue
+                    thread_name = thread_names.get(thread_id, str(thread_id))
+                    stacks[f"{thread_name};{collapse_stack(frame)}"] += 1
+                samples += 1
+                time.sleep(interval)
+            return {"seconds": seconds, "interval_ms": interval_ms, "samples": samples, "stacks": stacks}
+        finally:
+            self._lock.release()
+
+def to_collapsed(stacks: Counter) -> str:
+    """Collapsed ("folded") stack format: one `frame;frame;frame count` line per stack"""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+class SlowRequestCapture:
+    """Captures a stack sample and the query trace of requests over a latency threshold.
+
+    A watchdog thread checks in-flight requests; once one passes the
+    threshold it records the event loop thread's stack (where blocking
+    calls show up) and the request task's await chain. When the request
+    finishes, its timing and database queries are added to the capture.
+    """
+
+    def __init__(self, threshold_ms: float, max_captures: int = 50, check_interval: float = 0.1):
+        self.threshold_ms = threshold_ms
+        self.check_interval = check_interval
+        self.captures: deque = deque(maxlen=max_captures)
+        self._in_flight: Dict[str, dict] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._loop_thread: Optional[int] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.threshold_ms > 0 and self._thread is not None
+
+    def start(self, threshold_ms: Optional[float] = None) -> None:
+        """Start the watchdog; must be called from the event loop thread"""
+        if threshold_ms is not None:
+            self.threshold_ms = threshold_ms
+        if self.threshold_ms <= 0 or self._thread is not None:
+            return
+        self._loop_thread = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="slow-request-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    def begin(self, request_id: str, method: str, path: str) -> None:
+        if not self.enabled:
+            return
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        self._in_flight[request_id] = {
+            "started": time.perf_counter(),
+            "method": method,
+            "path": path,
+            "task": task,
+            "stacks": [],
+        }
+
+    def finish(self, request_id: str, route: str, status_code: int, duration_ms: float, trace=None) -> None:
+        entry = self._in_flight.pop(request_id, None)
+        if entry is None or duration_ms < self.threshold_ms:
+            return
+        capture = {
+            "request_id": request_id,
+            "captured_at": datetime.now(timezone.utc).isoformat(),
+            "method": entry["method"],
+            "path": entry["path"],
+            "endpoint": route,
+            "status_code": status_code,
+            "duration_ms": duration_ms,
+            "stacks": entry["stacks"],
+        }
+        if trace is not None:
+            capture["db_queries"] = len(trace.queries)
+            capture["db_time_ms"] = round(trace.db_time, 2)
+            capture["queries"] = list(trace.queries)
+        self.captures.append(capture)
+        logger.warning(
+            f"Slow request captured: {entry['method']} {route} took {duration_ms}ms",
+            extra={"request_id": request_id, "endpoint": route, "duration_ms": duration_ms}
+        )
+
+    def discard(self, request_id: str) -> None:
+        self._in_flight.pop(request_id, None)
+
+    def recent(self, limit: int = 20) -> List[dict]:
+        return list(self.captures)[-limit:][::-1]
+
+    def _watch(self) -> None:
+        threshold = self.threshold_ms / 1000
+        while not self._stop.wait(self.check_interval):
+            now = time.perf_counter()
+            for request_id, entry in list(self._in_flight.items()):
+                # One sample when the threshold is crossed, then one per further threshold elapsed
+                elapsed = now - entry["started"]
+                if elapsed < threshold * (len(entry["stacks"]) + 1) or len(entry["stacks"]) >= 5:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread)
+                entry["stacks"].append({
+                    "elapsed_ms": round(elapsed * 1000, 1),
+                    "loop_thread": collapse_stack(frame) if frame is not None else "",
+                    "task": _task_stack(entry["task"]) if entry["task"] is not None else "",
+                })
+
+# Shared instances; the slow-request watchdog is started by the app lifespan
+sampler = StackSampler()
+slow_requests = SlowRequestCapture(threshold_ms=2000)
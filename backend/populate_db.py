@@ -19,9 +19,11 @@ from models import (
     Book, BookCreate, MusicMetadata, MusicContent, MusicMetadataCreate,
     VideoMetadata, VideoContent, ImageMetadata, ImageContent
 )
+from sqlalchemy import func
+from sqlmodel import select
 from database import get_session
 from auth.security import get_password_hash
-from crud import user_crud, article_crud, book_crud, music_crud
+from crud import user_crud
 
 # Sample data
 SAMPLE_USERS = [
@@ -330,43 +332,46 @@ class DatabasePopulator:
             print(f"Created user: {user.username}")
 
     async def create_articles(self, session):
-        """Create sample articles with revisions and comments"""
+        """Create sample articles with revisions and comments, a few statements for the whole set"""
         print("Creating articles...")
-        for article_data in SAMPLE_ARTICLES:
-            # Check if article already exists
-            existing_article = await article_crud.get_article_by_title(session, article_data["title"])
-            if existing_article:
-                print(f"Article {article_data['title']} already exists, skipping...")
-                self.articles.append(existing_article)
-                continue
+        titles = [article_data["title"] for article_data in SAMPLE_ARTICLES]
+        result = await session.execute(select(Article).where(Article.title.in_(titles)))
+        existing_articles = result.scalars().all()
+        existing_titles = {article.title for article in existing_articles}
+        for title in sorted(existing_titles):
+            print(f"Article {title} already exists, skipping...")
+        self.articles.extend(existing_articles)
+
+        new_articles = [article_data for article_data in SAMPLE_ARTICLES if article_data["title"] not in existing_titles]
+        if not new_articles:
+            return
 
-            # Create article
-            article_create = ArticleCreate(
-                title=article_data["title"],
+        articles = [Article(title=article_data["title"]) for article_data in new_articles]
+        session.add_all(articles)
+        await session.flush()  # One round trip assigns every article ID
+
+        revisions = [
+            Revision(
                 content=article_data["content"],
-                comment=article_data["comment"]
-            )
-            
-            # Use a random user as the author
-            author = random.choice(self.users)
-            article = await article_crud.create_article_with_revision(
-                session, article_in=article_create, user_id=author.id
+                comment=article_data["comment"],
+                article_id=article.id,
+                user_id=random.choice(self.users).id,  # Use a random user as the author
+                # Computed by the database as part of the insert
+                tsvector_content=func.to_tsvector("english", article_data["content"])
             )
-            
-            if article:
-                self.articles.append(article)
-                print(f"Created article: {article.title}")
-                
-                # Add some comments to the revision
-                await self.add_comments_to_article(session, article)
+            for article, article_data in zip(articles, new_articles)
+        ]
+        session.add_all(revisions)
+        await session.flush()
 
-    async def add_comments_to_article(self, session, article):
-        """Add sample comments to an article's current revision"""
-        if not article.currentRevision:
-            return
+        for article, revision in zip(articles, revisions):
+            article.current_revision_id = revision.id
+            print(f"Created article: {article.title}")
+        self.add_comments(session, revisions)
+        self.articles.extend(articles)
 
-        # Add 2-4 random comments
-        num_comments = random.randint(2, 4)
+    def add_comments(self, session, revisions):
+        """Add 2-4 sample comments to each revision"""
         comment_texts = [
             "Great article! Very informative.",
             "This is exactly what I was looking for.",
@@ -378,80 +383,59 @@ class DatabasePopulator:
             "Amazing work on this article."
         ]
 
-        for _ in range(num_comments):
-            comment_text = random.choice(comment_texts)
-            comment_author = random.choice(self.users)
-            
-            comment = Comment(
-                content=comment_text,
-                revision_id=article.currentRevision.id,
-                user_id=comment_author.id
+        session.add_all([
+            Comment(
+                content=random.choice(comment_texts),
+                revision_id=revision.id,
+                user_id=random.choice(self.users).id
             )
-            session.add(comment)
-        
-        await session.commit()
+            for revision in revisions
+            for _ in range(random.randint(2, 4))
+        ])
 
     async def create_books(self, session):
         """Create sample books"""
         print("Creating books...")
-        for book_data in SAMPLE_BOOKS:
-            # Check if book already exists
-            existing_book = await book_crud.get_book_by_title(session, book_data["title"])
-            if existing_book:
-                print(f"Book {book_data['title']} already exists, skipping...")
-                self.books.append(existing_book)
-                continue
-
-            book_create = BookCreate(**book_data)
-            book = await book_crud.create_book(session, book_in=book_create)
-            self.books.append(book)
+        titles = [book_data["title"] for book_data in SAMPLE_BOOKS]
+        result = await session.execute(select(Book).where(Book.title.in_(titles)))
+        existing_books = result.scalars().all()
+        existing_titles = {book.title for book in existing_books}
+        for title in sorted(existing_titles):
+            print(f"Book {title} already exists, skipping...")
+        self.books.extend(existing_books)
+
+        books = [Book(**BookCreate(**book_data).model_dump()) for book_data in SAMPLE_BOOKS if book_data["title"] not in existing_titles]
+        session.add_all(books)
+        for book in books:
             print(f"Created book: {book.title} by {book.author}")
+        self.books.extend(books)
 
     async def create_music_metadata(self, session):
         """Create sample music metadata"""
         print("Creating music metadata...")
-        for music_data in SAMPLE_MUSIC:
-            # Create dummy binary data (in real scenario, this would be actual audio file)
-            dummy_audio_data = b"dummy_audio_data_" + music_data["title"].encode()[:50]
-            
-            # Create music content first
-            music_content = MusicContent(binary_data=dummy_audio_data)
-            session.add(music_content)
-            await session.flush()
-            
-            # Create music metadata
-            music_metadata_create = MusicMetadataCreate(
-                title=music_data["title"],
-                artist=music_data["artist"],
-                album=music_data["album"]
-            )
-            
-            # Create dummy cover image
-            dummy_cover = b"dummy_cover_image_" + music_data["title"].encode()[:30]
-            
-            music_metadata = await music_crud.create_music_metadata(
-                session, 
-                metadata_in=music_metadata_create,
+        # Dummy binary data (in real scenario, this would be actual audio files)
+        contents = [MusicContent(binary_data=b"dummy_audio_data_" + music_data["title"].encode()[:50]) for music_data in SAMPLE_MUSIC]
+        session.add_all(contents)
+        await session.flush()
+
+        for music_data, music_content in zip(SAMPLE_MUSIC, contents):
+            music_metadata = MusicMetadata(
+                **MusicMetadataCreate(title=music_data["title"], artist=music_data["artist"], album=music_data["album"]).model_dump(),
                 content_id=music_content.id,
-                cover_image=dummy_cover
+                cover_image=b"dummy_cover_image_" + music_data["title"].encode()[:30]
             )
-            
+            session.add(music_metadata)
             self.music_metadata.append(music_metadata)
             print(f"Created music: {music_metadata.title} by {music_metadata.artist}")
 
     async def create_video_metadata(self, session):
         """Create sample video metadata"""
         print("Creating video metadata...")
-        for video_data in SAMPLE_VIDEOS:
-            # Create dummy binary data
-            dummy_video_data = b"dummy_video_data_" + video_data["filename"].encode()
-            
-            # Create video content first
-            video_content = VideoContent(binary_data=dummy_video_data)
-            session.add(video_content)
-            await session.flush()
-            
-            # Create video metadata
+        contents = [VideoContent(binary_data=b"dummy_video_data_" + video_data["filename"].encode()) for video_data in SAMPLE_VIDEOS]
+        session.add_all(contents)
+        await session.flush()
+
+        for video_data, video_content in zip(SAMPLE_VIDEOS, contents):
             video_metadata = VideoMetadata(
                 filename=video_data["filename"],
                 timestamp=datetime.utcnow() - timedelta(days=random.randint(1, 365)),
@@ -465,16 +449,11 @@ class DatabasePopulator:
     async def create_image_metadata(self, session):
         """Create sample image metadata"""
         print("Creating image metadata...")
-        for image_data in SAMPLE_IMAGES:
-            # Create dummy binary data
-            dummy_image_data = b"dummy_image_data_" + image_data["original_filename"].encode()
-            
-            # Create image content first
-            image_content = ImageContent(binary_data=dummy_image_data)
-            session.add(image_content)
-            await session.flush()
-            
-            # Create image metadata
+        contents = [ImageContent(binary_data=b"dummy_image_data_" + image_data["original_filename"].encode()) for image_data in SAMPLE_IMAGES]
+        session.add_all(contents)
+        await session.flush()
+
+        for image_data, image_content in zip(SAMPLE_IMAGES, contents):
             image_metadata = ImageMetadata(
                 original_filename=image_data["original_filename"],
                 content_type=image_data["content_type"],
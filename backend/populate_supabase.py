@@ -17,6 +17,8 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from supabase_client import supabase
 from config import settings
+from importer.pipeline import BulkImporter
+from importer.readers import RecordSource
 
 # Sample data
 SAMPLE_USERS = [
@@ -295,245 +297,102 @@ SAMPLE_IMAGES = [
     {"original_filename": "african_masks.jpg", "content_type": "image/jpeg", "size_bytes": 2200000}
 ]
 
+COMMENT_TEXTS = [
+    "Great article! Very informative.",
+    "This is exactly what I was looking for.",
+    "Could you add more details about the cultural aspects?",
+    "Excellent historical overview.",
+    "Thank you for sharing this knowledge.",
+    "I learned something new today!",
+    "This needs more references.",
+    "Amazing work on this article."
+]
+
 class SupabasePopulator:
     def __init__(self):
         self.users = []
-        self.articles = []
-        self.books = []
-        self.music_metadata = []
-        self.video_metadata = []
-        self.image_metadata = []
+        self.stats = None
 
     def create_users(self):
-        """Create sample users in Supabase"""
+        """Create sample users in Supabase, keeping the ones that already exist"""
         print("Creating users...")
-        for user_data in SAMPLE_USERS:
-            try:
-                # Check if user already exists
-                existing_users = supabase.table("user").select("username").eq("username", user_data["username"]).execute()
-                if existing_users.data:
-                    print(f"User {user_data['username']} already exists, skipping...")
-                    # Get the existing user
-                    user = supabase.table("user").select("*").eq("username", user_data["username"]).execute()
-                    self.users.append(user.data[0])
-                    continue
-
-                # Create user
-                user_response = supabase.table("user").insert({
+        try:
+            usernames = [user_data["username"] for user_data in SAMPLE_USERS]
+            existing_users = supabase.table("user").select("*").in_("username", usernames).execute().data or []
+            existing_names = {user["username"] for user in existing_users}
+            for username in sorted(existing_names):
+                print(f"User {username} already exists, skipping...")
+
+            new_users = [
+                {
                     "username": user_data["username"],
                     "email": user_data["email"],
                     "hashed_password": user_data["password"]  # In real app, this should be hashed
-                }).execute()
-                
-                if user_response.data:
-                    self.users.append(user_response.data[0])
-                    print(f"Created user: {user_data['username']}")
-                else:
-                    print(f"Failed to create user: {user_data['username']}")
-                    
-            except Exception as e:
-                print(f"Error creating user {user_data['username']}: {e}")
-
-    def create_articles(self):
-        """Create sample articles with revisions and comments"""
-        print("Creating articles...")
+                }
+                for user_data in SAMPLE_USERS if user_data["username"] not in existing_names
+            ]
+            created_users = []
+            if new_users:
+                created_users = supabase.table("user").insert(new_users).execute().data or []
+            for user in created_users:
+                print(f"Created user: {user['username']}")
+            self.users = existing_users + created_users
+
+        except Exception as e:
+            print(f"Error creating users: {e}")
+
+    def build_records(self):
+        """Sample content as bulk import records, with dummy bytes standing in for media files"""
+        records = []
+        media = {}
+        usernames = [user["username"] for user in self.users]
+
         for article_data in SAMPLE_ARTICLES:
-            try:
-                # Check if article already exists
-                existing_articles = supabase.table("article").select("title").eq("title", article_data["title"]).execute()
-                if existing_articles.data:
-                    print(f"Article {article_data['title']} already exists, skipping...")
-                    # Get the existing article
-                    article = supabase.table("article").select("*").eq("title", article_data["title"]).execute()
-                    self.articles.append(article.data[0])
-                    continue
-
-                # Create article
-                article_response = supabase.table("article").insert({
-                    "title": article_data["title"],
-                    "created_at": datetime.utcnow().isoformat(),
-                    "updated_at": datetime.utcnow().isoformat()
-                }).execute()
-                
-                if article_response.data:
-                    article = article_response.data[0]
-                    self.articles.append(article)
-                    print(f"Created article: {article['title']}")
-                    
-                    # Create revision
-                    author = random.choice(self.users)
-                    revision_response = supabase.table("revision").insert({
-                        "content": article_data["content"],
-                        "comment": article_data["comment"],
-                        "article_id": article["id"],
-                        "user_id": author["id"],
-                        "timestamp": datetime.utcnow().isoformat()
-                    }).execute()
-                    
-                    if revision_response.data:
-                        revision = revision_response.data[0]
-                        
-                        # Update article with current revision
-                        supabase.table("article").update({
-                            "current_revision_id": revision["id"]
-                        }).eq("id", article["id"]).execute()
-                        
-                        # Add comments to the revision
-                        self.add_comments_to_revision(revision["id"])
-                        
-            except Exception as e:
-                print(f"Error creating article {article_data['title']}: {e}")
-
-    def add_comments_to_revision(self, revision_id):
-        """Add sample comments to a revision"""
-        comment_texts = [
-            "Great article! Very informative.",
-            "This is exactly what I was looking for.",
-            "Could you add more details about the cultural aspects?",
-            "Excellent historical overview.",
-            "Thank you for sharing this knowledge.",
-            "I learned something new today!",
-            "This needs more references.",
-            "Amazing work on this article."
-        ]
-
-        # Add 2-4 random comments
-        num_comments = random.randint(2, 4)
-        for _ in range(num_comments):
-            comment_text = random.choice(comment_texts)
-            comment_author = random.choice(self.users)
-            
-            try:
-                supabase.table("comment").insert({
-                    "content": comment_text,
-                    "revision_id": revision_id,
-                    "user_id": comment_author["id"],
-                    "created_at": datetime.utcnow().isoformat()
-                }).execute()
-            except Exception as e:
-                print(f"Error adding comment: {e}")
-
-    def create_books(self):
-        """Create sample books"""
-        print("Creating books...")
+            records.append({
+                "type": "article",
+                "title": article_data["title"],
+                "content": article_data["content"],
+                "comment": article_data["comment"],
+                "author": random.choice(usernames),
+                "comments": [
+                    {"content": random.choice(COMMENT_TEXTS), "author": random.choice(usernames)}
+                    for _ in range(random.randint(2, 4))
+                ]
+            })
+
         for book_data in SAMPLE_BOOKS:
-            try:
-                # Check if book already exists
-                existing_books = supabase.table("book").select("title").eq("title", book_data["title"]).execute()
-                if existing_books.data:
-                    print(f"Book {book_data['title']} already exists, skipping...")
-                    # Get the existing book
-                    book = supabase.table("book").select("*").eq("title", book_data["title"]).execute()
-                    self.books.append(book.data[0])
-                    continue
-
-                book_response = supabase.table("book").insert({
-                    "title": book_data["title"],
-                    "author": book_data["author"],
-                    "published_date": book_data["published_date"],
-                    "isbn": book_data["isbn"],
-                    "genre": book_data["genre"],
-                    "summary": book_data["summary"],
-                    "created_at": datetime.utcnow().isoformat(),
-                    "updated_at": datetime.utcnow().isoformat()
-                }).execute()
-                
-                if book_response.data:
-                    self.books.append(book_response.data[0])
-                    print(f"Created book: {book_data['title']} by {book_data['author']}")
-                    
-            except Exception as e:
-                print(f"Error creating book {book_data['title']}: {e}")
-
-    def create_music_metadata(self):
-        """Create sample music metadata"""
-        print("Creating music metadata...")
+            records.append({"type": "book", **book_data})
+
         for music_data in SAMPLE_MUSIC:
-            try:
-                # Create music content first
-                dummy_audio_data = "dummy_audio_data_" + music_data["title"][:50]
-                content_response = supabase.table("music_content").insert({
-                    "binary_data": dummy_audio_data
-                }).execute()
-                
-                if content_response.data:
-                    content_id = content_response.data[0]["id"]
-                    
-                    # Create music metadata
-                    dummy_cover = "dummy_cover_image_" + music_data["title"][:30]
-                    metadata_response = supabase.table("music_metadata").insert({
-                        "title": music_data["title"],
-                        "artist": music_data["artist"],
-                        "album": music_data["album"],
-                        "content_id": content_id,
-                        "cover_image": dummy_cover
-                    }).execute()
-                    
-                    if metadata_response.data:
-                        self.music_metadata.append(metadata_response.data[0])
-                        print(f"Created music: {music_data['title']} by {music_data['artist']}")
-                        
-            except Exception as e:
-                print(f"Error creating music {music_data['title']}: {e}")
-
-    def create_video_metadata(self):
-        """Create sample video metadata"""
-        print("Creating video metadata...")
+            audio_file = f"music/{music_data['title']}.mp3"
+            cover_file = f"music/{music_data['title']}.jpg"
+            media[audio_file] = ("dummy_audio_data_" + music_data["title"][:50]).encode()
+            media[cover_file] = ("dummy_cover_image_" + music_data["title"][:30]).encode()
+            records.append({"type": "music", "file": audio_file, "cover_file": cover_file, **music_data})
+
         for video_data in SAMPLE_VIDEOS:
-            try:
-                # Create video content first
-                dummy_video_data = "dummy_video_data_" + video_data["filename"]
-                content_response = supabase.table("video_content").insert({
-                    "binary_data": dummy_video_data
-                }).execute()
-                
-                if content_response.data:
-                    content_id = content_response.data[0]["id"]
-                    
-                    # Create video metadata
-                    metadata_response = supabase.table("videos").insert({
-                        "filename": video_data["filename"],
-                        "timestamp": (datetime.utcnow() - timedelta(days=random.randint(1, 365))).isoformat(),
-                        "content_id": content_id,
-                        "user": video_data["user"]
-                    }).execute()
-                    
-                    if metadata_response.data:
-                        self.video_metadata.append(metadata_response.data[0])
-                        print(f"Created video: {video_data['filename']}")
-                        
-            except Exception as e:
-                print(f"Error creating video {video_data['filename']}: {e}")
-
-    def create_image_metadata(self):
-        """Create sample image metadata"""
-        print("Creating image metadata...")
+            video_file = f"videos/{video_data['filename']}"
+            media[video_file] = ("dummy_video_data_" + video_data["filename"]).encode()
+            records.append({
+                "type": "video",
+                "file": video_file,
+                "filename": video_data["filename"],
+                "timestamp": (datetime.utcnow() - timedelta(days=random.randint(1, 365))).isoformat(),
+                "user": video_data["user"]
+            })
+
         for image_data in SAMPLE_IMAGES:
-            try:
-                # Create image content first
-                dummy_image_data = "dummy_image_data_" + image_data["original_filename"]
-                content_response = supabase.table("image_content").insert({
-                    "binary_data": dummy_image_data
-                }).execute()
-                
-                if content_response.data:
-                    content_id = content_response.data[0]["id"]
-                    
-                    # Create image metadata
-                    metadata_response = supabase.table("image_metadata").insert({
-                        "original_filename": image_data["original_filename"],
-                        "content_type": image_data["content_type"],
-                        "content_id": content_id,
-                        "size_bytes": image_data["size_bytes"],
-                        "uploaded_at": (datetime.utcnow() - timedelta(days=random.randint(1, 365))).isoformat()
-                    }).execute()
-                    
-                    if metadata_response.data:
-                        self.image_metadata.append(metadata_response.data[0])
-                        print(f"Created image: {image_data['original_filename']}")
-                        
-            except Exception as e:
-                print(f"Error creating image {image_data['original_filename']}: {e}")
+            image_file = f"images/{image_data['original_filename']}"
+            media[image_file] = ("dummy_image_data_" + image_data["original_filename"]).encode()
+            records.append({
+                "type": "image",
+                "file": image_file,
+                "filename": image_data["original_filename"],
+                "content_type": image_data["content_type"],
+                "uploaded_at": (datetime.utcnow() - timedelta(days=random.randint(1, 365))).isoformat()
+            })
+
+        return records, media
 
     def populate_database(self):
         """Main method to populate the database"""
@@ -541,23 +400,29 @@ class SupabasePopulator:
         print(f"Supabase URL: {settings.supabase_url}")
         
         try:
-            # Create all entities
             self.create_users()
-            self.create_articles()
-            self.create_books()
-            self.create_music_metadata()
-            self.create_video_metadata()
-            self.create_image_metadata()
+
+            # Articles (with revisions and comments), books and media go through the bulk importer
+            print("Importing articles, books and media...")
+            records, media = self.build_records()
+            importer = BulkImporter(default_user_id=self.users[0]["id"] if self.users else None)
+            self.stats = asyncio.run(importer.run(RecordSource(records, media)))
+            created = self.stats.created
             
             print("\n" + "="*50)
             print("SUPABASE DATABASE POPULATION COMPLETED SUCCESSFULLY!")
             print("="*50)
-            print(f"Created {len(self.users)} users")
-            print(f"Created {len(self.articles)} articles")
-            print(f"Created {len(self.books)} books")
-            print(f"Created {len(self.music_metadata)} music entries")
-            print(f"Created {len(self.video_metadata)} video entries")
-            print(f"Created {len(self.image_metadata)} image entries")
+            print(f"Users: {len(self.users)}")
+            print(f"Created {created['article']} articles")
+            print(f"Created {created['book']} books")
+            print(f"Created {created['music']} music entries")
+            print(f"Created {created['video']} video entries")
+            print(f"Created {created['image']} image entries")
+            skipped = sum(self.stats.skipped.values())
+            if skipped:
+                print(f"Skipped {skipped} entries that already exist")
+            for error in self.stats.errors:
+                print(f"Error: {error}")
             print("="*50)
             
         except Exception as e:
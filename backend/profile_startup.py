@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Startup profile report for Afropedia Backend
+Imports the application under `python -X importtime` in a fresh interpreter
+and prints where cold-start import time goes, by module and by top-level package
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+def profile_imports(target: str):
+    """Import `target` in a fresh interpreter and parse its -X importtime output"""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        capture_output=True, text=True, env=env
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules.append({
+            "module": name.strip(),
+            "depth": (len(name) - len(name.lstrip())) // 2,
+            "self_ms": int(self_us) / 1000,
+            "cumulative_ms": int(cumulative_us) / 1000,
+        })
+
+    errors = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+    return modules, wall_ms, result.returncode, errors
+
+def build_report(modules, wall_ms: float, top: int) -> dict:
+    packages = defaultdict(float)
+    for module in modules:
+        packages[module["module"].split(".")[0]] += module["self_ms"]
+
+    return {
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(sum(module["self_ms"] for module in modules), 1),
+        "modules_imported": len(modules),
+        "slowest_modules": [
+            {key: module[key] for key in ("module", "self_ms", "cumulative_ms")}
+            for module in sorted(modules, key=lambda m: m["cumulative_ms"], reverse=True)[:top]
+        ],
+        "packages": [
+            {"package": name, "self_ms": round(total, 1)}
+            for name, total in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+    }
+
+def print_report(target: str, report: dict):
+    print(f"📊 Startup profile for `import {target}`")
+    print(f"  Interpreter wall time: {report['wall_ms']:.1f}ms")
+    print(f"  Import time:           {report['import_ms']:.1f}ms across {report['modules_imported']} modules")
+
+    print("\n📦 Self time by top-level package:")
+    for entry in report["packages"]:
+        print(f"  {entry['self_ms']:9.1f}ms  {entry['package']}")
+
+    print("\n🐢 Slowest modules (cumulative, includes their own imports):")
+    for entry in report["slowest_modules"]:
+        print(f"  {entry['cumulative_ms']:9.1f}ms  {entry['module']}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Report import time for the API cold start")
+    parser.add_argument("--target", default="main", help="Module to import (default: main)")
+    parser.add_argument("--top", type=int, default=25, help="Rows per section")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    modules, wall_ms, returncode, errors = profile_imports(args.target)
+    if returncode != 0:
+        print(f"❌ Importing {args.target} failed:")
+        print("\n".join(errors[-20:]))
+        sys.exit(returncode)
+
+    report = build_report(modules, wall_ms, args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(args.target, report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# ratelimit/__init__.py
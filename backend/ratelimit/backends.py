@@ -0,0 +1,100 @@
+# ratelimit/backends.py
+import time
+from typing import Dict, Tuple
+
+# (allowed, tokens remaining, seconds until the request would be allowed)
+BucketResult = Tuple[bool, float, float]
+
+class RateLimitBackend:
+    """Token-bucket storage contract.
+
+    `take` refills the bucket at `rate` tokens per second up to `burst`,
+    then removes `cost` tokens if enough are available. Implementations
+    must do this atomically so concurrent workers share one budget.
+    """
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> BucketResult:
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        pass
+
+class MemoryBackend(RateLimitBackend):
+    """Process-local buckets, for development, tests and single-worker deployments"""
+
+    def __init__(self, max_keys: int = 100000):
+        self.max_keys = max_keys
+        # key -> (tokens, updated, time the bucket is full again under its own rate and burst)
+        self._buckets: Dict[str, Tuple[float, float, float]] = {}
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> BucketResult:
+        # No awaits between read and write, so this is atomic on the event loop
+        now = time.monotonic()
+        tokens, updated, _ = self._buckets.get(key, (burst, now, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        if key not in self._buckets and len(self._buckets) >= self.max_keys:
+            self._evict_full(now)
+        self._buckets[key] = (tokens, now, now + (burst - tokens) / rate)
+        return allowed, tokens, 0.0 if allowed else (cost - tokens) / rate
+
+    def _evict_full(self, now: float) -> None:
+        """Drop buckets that have refilled completely; they carry no state"""
+        # Judged by each bucket's own limits, which differ between budgets
+        for key, (_, _, full_at) in list(self._buckets.items()):
+            if full_at <= now:
+                del self._buckets[key]
+        while len(self._buckets) >= self.max_keys:
+            self._buckets.pop(next(iter(self._buckets)))
+
+# Refill, take and persist in one round-trip; Redis TIME keeps every worker on the same clock
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or burst
+local updated = tonumber(bucket[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000) + 1000)
+return {allowed, tostring(tokens), tostring(retry_after)}
+"""
+
+class RedisBackend(RateLimitBackend):
+    """Buckets shared by every worker through Redis"""
+
+    def __init__(self, url: str, prefix: str = "afropedia:ratelimit:"):
+        try:
+            import redis.asyncio as redis
+        except ImportError as e:
+            raise RuntimeError("rate_limit_storage_url points at Redis but the redis package is not installed") from e
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+        self._script = self._client.register_script(TOKEN_BUCKET_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: float, cost: float = 1.0) -> BucketResult:
+        allowed, tokens, retry_after = await self._script(keys=[self.prefix + key], args=[rate, burst, cost])
+        return bool(allowed), float(tokens), float(retry_after)
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+def create_backend(url: str) -> RateLimitBackend:
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    if url.startswith("memory://"):
+        return MemoryBackend()
+    raise ValueError(f"Unsupported rate limit storage: {url}")
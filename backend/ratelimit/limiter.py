@@ -0,0 +1,193 @@
+# ratelimit/limiter.py
+import ipaddress
+import logging
+import math
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+from fastapi import HTTPException, Request, Response, status
+
+from auth.security import decode_access_token
+from config import settings
+from monitoring.metrics import metrics
+from ratelimit.backends import RateLimitBackend, create_backend
+
+logger = logging.getLogger("afropedia.ratelimit")
+
+PERIOD_SECONDS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A named token-bucket budget.
+
+    `scope` is "ip" to count per client address or "user" to count per
+    authenticated user, falling back to the client address for anonymous
+    callers. `burst` defaults to the full budget, so short spikes up to
+    `limit` are allowed before the steady refill rate applies.
+    """
+    name: str
+    limit: int
+    period_seconds: int
+    scope: str = "ip"
+    burst: Optional[int] = None
+
+    @property
+    def rate(self) -> float:
+        return self.limit / self.period_seconds
+
+    @property
+    def capacity(self) -> int:
+        return self.burst or self.limit
+
+def parse_rate(value: str) -> tuple:
+    """Parse "5/minute" into (5, 60)"""
+    count, _, period = value.partition("/")
+    return int(count), PERIOD_SECONDS[period.strip().rstrip("s")]
+
+# Budgets for expensive or abuse-prone endpoints; settings.rate_limits overrides the rates
+DEFAULT_LIMITS: Dict[str, RateLimit] = {
+    "login": RateLimit("login", 5, 60, scope="ip"),
+    "register": RateLimit("register", 10, 3600, scope="ip"),
+    "search": RateLimit("search", 60, 60, scope="user", burst=20),
+    "upload": RateLimit("upload", 30, 3600, scope="user", burst=10),
+    "diff": RateLimit("diff", 60, 60, scope="user", burst=20),
+}
+
+def _configured_limits() -> Dict[str, RateLimit]:
+    limits = dict(DEFAULT_LIMITS)
+    for name, value in settings.rate_limits.items():
+        base = limits.get(name, RateLimit(name, 1, 1, scope="user"))
+        count, period = parse_rate(value)
+        limits[name] = RateLimit(name, count, period, scope=base.scope, burst=min(base.burst or count, count))
+    return limits
+
+def _parse_networks(cidrs: List[str]) -> List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]]:
+    networks = []
+    for cidr in cidrs:
+        try:
+            networks.append(ipaddress.ip_network(cidr.strip(), strict=False))
+        except ValueError:
+            logger.warning(f"Ignoring invalid trusted proxy: {cidr}")
+    return networks
+
+TRUSTED_PROXIES = _parse_networks(settings.trusted_proxies)
+
+def _is_trusted(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+def client_ip(request: Request) -> str:
+    """Client address, honoring X-Forwarded-For only when it was set by a trusted proxy.
+
+    The forwarded chain is walked from the right (the hop nearest us) and
+    the first address that is not a trusted proxy is the client. Entries
+    further left are client-supplied and cannot be trusted.
+    """
+    peer = request.client.host if request.client else "unknown"
+    if not TRUSTED_PROXIES or not _is_trusted(peer):
+        return peer
+    forwarded = request.headers.get("x-forwarded-for", "")
+    hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+    for hop in reversed(hops):
+        if not _is_trusted(hop):
+            return hop
+    return hops[0] if hops else peer
+
+def _user_subject(request: Request) -> Optional[str]:
+    """Subject of a valid bearer token, without touching the database"""
+    authorization = request.headers.get("authorization", "")
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    payload = decode_access_token(token)
+    return payload.get("sub") if payload else None
+
+class RateLimiter:
+    """Applies named budgets against a shared backend and keeps per-budget counters"""
+
+    def __init__(self, backend: RateLimitBackend, limits: Dict[str, RateLimit], enabled: bool = True):
+        self.backend = backend
+        self.limits = limits
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, name: str, outcome: str) -> None:
+        with self._lock:
+            counters = self._stats.setdefault(name, {"allowed": 0, "limited": 0, "errors": 0})
+            counters[outcome] += 1
+        metrics.increment_counter("rate_limit_decisions_total", labels={"limit": name, "outcome": outcome})
+
+    def key_for(self, request: Request, limit: RateLimit) -> str:
+        if limit.scope == "user":
+            subject = _user_subject(request)
+            if subject:
+                return f"{limit.name}:user:{subject}"
+        return f"{limit.name}:ip:{client_ip(request)}"
+
+    async def check(self, request: Request, response: Response, name: str, cost: float = 1.0) -> None:
+        """Spend from the named budget or raise 429 with Retry-After"""
+        limit = self.limits[name]
+        if not self.enabled:
+            return
+        try:
+            allowed, remaining, retry_after = await self.backend.take(
+                self.key_for(request, limit), limit.rate, limit.capacity, cost
+            )
+        except Exception as e:
+            # Fail open: a storage outage should not take the API down with it
+            self._count(name, "errors")
+            logger.error(f"Rate limit backend error for {name}: {e}")
+            return
+
+        headers = {
+            "X-RateLimit-Limit": str(limit.capacity),
+            "X-RateLimit-Remaining": str(max(0, math.floor(remaining))),
+        }
+        if not allowed:
+            self._count(name, "limited")
+            headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded, please retry later",
+                headers=headers,
+            )
+        self._count(name, "allowed")
+        response.headers.update(headers)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "backend": type(self.backend).__name__,
+                "limits": {
+                    name: {
+                        "limit": limit.limit,
+                        "period_seconds": limit.period_seconds,
+                        "burst": limit.capacity,
+                        "scope": limit.scope,
+                        **self._stats.get(name, {"allowed": 0, "limited": 0, "errors": 0}),
+                    }
+                    for name, limit in self.limits.items()
+                },
+            }
+
+limiter = RateLimiter(
+    create_backend(settings.rate_limit_storage_url),
+    _configured_limits(),
+    enabled=settings.rate_limit_enabled
+)
+
+def rate_limit(name: str, cost: float = 1.0):
+    """FastAPI dependency spending `cost` from the named budget"""
+    if name not in limiter.limits:
+        raise ValueError(f"Unknown rate limit: {name}")
+
+    async def dependency(request: Request, response: Response) -> None:
+        await limiter.check(request, response, name, cost)
+
+    return dependency
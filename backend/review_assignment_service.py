@@ -0,0 +1,174 @@
+"""
+Reviewer Assignment Engine - picks reviewers for pending revisions automatically
+"""
+from typing import List, Optional, Dict, Any, Set
+from datetime import datetime, timedelta
+from supabase_client import supabase
+from peer_review_models import ReviewPriority, ReviewerLevel
+from events.notifications import notify_assignments_created
+
+# Seniority order used when matching reviewers against an assignment's required level
+LEVEL_RANK = {
+    ReviewerLevel.JUNIOR: 0,
+    ReviewerLevel.SENIOR: 1,
+    ReviewerLevel.EXPERT: 2,
+    ReviewerLevel.MENTOR: 3,
+}
+
+# Reviewer level implied by a user's role
+ROLE_REVIEWER_LEVELS = {
+    "admin": ReviewerLevel.EXPERT,
+    "moderator": ReviewerLevel.SENIOR,
+    "editor": ReviewerLevel.JUNIOR,
+}
+
+# Assignment statuses that still count towards a reviewer's open load
+OPEN_ASSIGNMENT_STATUSES = ["pending", "accepted"]
+
+class ReviewAssignmentService:
+    """Scores eligible reviewers and assigns them to the pending review backlog"""
+
+    # Scoring weights: affinity and seniority attract work, open load repels it
+    AFFINITY_WEIGHT = 2.0
+    AFFINITY_CAP = 5
+    LEVEL_WEIGHT = 1.0
+    LOAD_WEIGHT = 1.5
+
+    @staticmethod
+    async def assign_pending_backlog(
+        assigned_by: int,
+        reviewers_per_revision: int = 3,
+        batch_size: int = 100,
+        max_open_assignments: int = 10,
+        priority: ReviewPriority = ReviewPriority.NORMAL,
+        required_level: ReviewerLevel = ReviewerLevel.JUNIOR,
+        due_in_days: Optional[int] = 7,
+        affinity_window_days: int = 180,
+        dry_run: bool = False
+    ) -> List[Dict[str, Any]]:
+        """Assign reviewers to up to `batch_size` pending revisions with one batched insert"""
+        revisions_result = supabase.table("revision").select(
+            "id, article_id, user_id"
+        ).eq("needs_review", True).eq("status", "pending").order("timestamp").limit(batch_size).execute()
+        revisions = revisions_result.data or []
+        if not revisions:
+            return []
+
+        revision_ids = [revision["id"] for revision in revisions]
+
+        candidates_result = supabase.table("user").select("id, role").in_(
+            "role", list(ROLE_REVIEWER_LEVELS)
+        ).eq("is_active", True).execute()
+        candidates = {
+            row["id"]: ROLE_REVIEWER_LEVELS[row["role"]]
+            for row in candidates_result.data or []
+            if LEVEL_RANK[ROLE_REVIEWER_LEVELS[row["role"]]] >= LEVEL_RANK[required_level]
+        }
+        if not candidates:
+            return []
+        candidate_ids = list(candidates)
+
+        # Current open load per reviewer, for all candidates at once: accepted assignments count
+        # as well as pending ones (get_pending_assignments lists only the pending ones)
+        load_result = supabase.table("review_assignment").select("assigned_to").in_(
+            "assigned_to", candidate_ids
+        ).in_("status", OPEN_ASSIGNMENT_STATUSES).execute()
+        open_load: Dict[int, int] = {}
+        for row in load_result.data or []:
+            open_load[row["assigned_to"]] = open_load.get(row["assigned_to"], 0) + 1
+
+        # Reviewers already attached to these revisions, by assignment or by review
+        taken: Dict[int, Set[int]] = {revision_id: set() for revision_id in revision_ids}
+        existing_result = supabase.table("review_assignment").select("revision_id, assigned_to").in_(
+            "revision_id", revision_ids
+        ).neq("status", "declined").execute()
+        for row in existing_result.data or []:
+            taken[row["revision_id"]].add(row["assigned_to"])
+        reviewed_result = supabase.table("peer_review").select("revision_id, reviewer_id").in_(
+            "revision_id", revision_ids
+        ).execute()
+        for row in reviewed_result.data or []:
+            taken[row["revision_id"]].add(row["reviewer_id"])
+
+        # Topic affinity: recent reviews each candidate has done on the same articles
+        since = (datetime.utcnow() - timedelta(days=affinity_window_days)).isoformat()
+        history_result = supabase.table("peer_review").select(
+            "reviewer_id, revision:revision!peer_review_revision_id_fkey(article_id)"
+        ).in_("reviewer_id", candidate_ids).gte("created_at", since).execute()
+        affinity: Dict[tuple, int] = {}
+        for row in history_result.data or []:
+            article_id = (row.get("revision") or {}).get("article_id")
+            if article_id is not None:
+                key = (row["reviewer_id"], article_id)
+                affinity[key] = affinity.get(key, 0) + 1
+
+        plan = ReviewAssignmentService.plan_assignments(
+            revisions, candidates, open_load, affinity, taken,
+            reviewers_per_revision, max_open_assignments
+        )
+        if not plan or dry_run:
+            return plan
+
+        due_date = (datetime.utcnow() + timedelta(days=due_in_days)).isoformat() if due_in_days else None
+        rows = [
+            {
+                "revision_id": item["revision_id"],
+                "assigned_to": item["assigned_to"],
+                "assigned_by": assigned_by,
+                "priority": priority.value,
+                "due_date": due_date,
+                "required_level": required_level.value,
+                "status": "pending",
+            }
+            for item in plan
+        ]
+        result = supabase.table("review_assignment").insert(rows).execute()
+        await notify_assignments_created(result.data or [])
+        return result.data or []
+
+    @staticmethod
+    def plan_assignments(
+        revisions: List[Dict[str, Any]],
+        candidates: Dict[int, ReviewerLevel],
+        open_load: Dict[int, int],
+        affinity: Dict[tuple, int],
+        taken: Dict[int, Set[int]],
+        reviewers_per_revision: int,
+        max_open_assignments: int
+    ) -> List[Dict[str, Any]]:
+        """Greedily pick the best-scoring reviewers for each revision, oldest first.
+
+        Load is updated as assignments are planned so one batch spreads work
+        across reviewers instead of piling it on the current top scorer.
+        """
+        load = dict(open_load)
+        plan = []
+        for revision in revisions:
+            already = taken.get(revision["id"], set())
+            needed = reviewers_per_revision - len(already)
+            if needed <= 0:
+                continue
+
+            scored = []
+            for reviewer_id, level in candidates.items():
+                # Conflict of interest: authors never review their own revision
+                if reviewer_id == revision.get("user_id") or reviewer_id in already:
+                    continue
+                if load.get(reviewer_id, 0) >= max_open_assignments:
+                    continue
+                score = (
+                    ReviewAssignmentService.AFFINITY_WEIGHT
+                    * min(affinity.get((reviewer_id, revision.get("article_id")), 0), ReviewAssignmentService.AFFINITY_CAP)
+                    + ReviewAssignmentService.LEVEL_WEIGHT * LEVEL_RANK[level]
+                    - ReviewAssignmentService.LOAD_WEIGHT * load.get(reviewer_id, 0)
+                )
+                scored.append((score, -load.get(reviewer_id, 0), -reviewer_id, reviewer_id))
+
+            for score, _, _, reviewer_id in sorted(scored, reverse=True)[:needed]:
+                load[reviewer_id] = load.get(reviewer_id, 0) + 1
+                plan.append({
+                    "revision_id": revision["id"],
+                    "assigned_to": reviewer_id,
+                    "score": round(score, 2),
+                })
+        return plan
@@ -1,11 +1,12 @@
 # routers/advanced_search.py
-from fastapi import APIRouter, Query, HTTPException
+from fastapi import APIRouter, Query, HTTPException, Depends
 from typing import List, Dict, Any, Optional
 from search_service import search_service
+from ratelimit.limiter import rate_limit
 
 router = APIRouter()
 
-@router.get("/search", response_model=Dict[str, Any])
+@router.get("/search", response_model=Dict[str, Any], dependencies=[Depends(rate_limit("search"))])
 async def advanced_search(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(20, ge=1, le=50, description="Number of results to return"),
@@ -1,18 +1,21 @@
 # routers/articles.py
+import asyncio
 from sqlmodel import select
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Query
 from sqlmodel.ext.asyncio.session import AsyncSession # Use AsyncSession
-from typing import List
+from typing import List, Optional, Union
 from datetime import datetime
 
 from models import Article, ArticleCreate, ArticleUpdate, ArticleRead, ArticleReadWithCurrentRevision, Comment, CommentRead, Revision, User, UserRead, RevisionReadWithUser, StandardResponse, ErrorResponse, PaginatedResponse
 from database import get_session
 from auth.dependencies import get_current_user # For protecting routes
 import crud
-from supabase_crud import get_articles_supabase, get_article_by_title_supabase, create_article_supabase, update_article_revision_supabase, update_article_revision_supabase_with_revision_id, get_article_revisions_supabase, add_comment_to_revision_supabase, get_revision_diff_supabase, get_references_by_article_supabase
+from supabase_crud import get_articles_supabase, get_articles_page_supabase, get_user_articles_page_supabase, count_user_articles_supabase, get_article_by_title_supabase, create_article_supabase, update_article_revision_supabase, update_article_revision_supabase_with_revision_id, get_article_revisions_supabase, add_comment_to_revision_supabase, get_revision_diff_supabase, get_references_by_article_supabase
 from supabase_client import supabase
 from crud.moderation_crud import submit_for_moderation
 from moderation_models import Priority
+from ratelimit.limiter import rate_limit
+from utils.reference_parser import validate_references
 
 router = APIRouter()
 
@@ -76,50 +79,50 @@ async def create_article(
         currentRevision=article.currentRevision  # We'll implement this later
     )
 
-@router.get("/", response_model=List[ArticleRead])
+@router.get("/", response_model=Union[PaginatedResponse, List[ArticleRead]])
 async def read_articles(
     skip: int = 0,
-    limit: int = 100
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing"),
+    sort: str = Query("id", pattern="^(id|title|created_at|updated_at)$")
 ):
-    """Retrieves a list of articles (summary)."""
+    """Retrieves a list of articles (summary).
+
+    With `cursor`, returns a PaginatedResponse ordered by (sort, id); deep
+    pages cost the same as the first. Without it, returns the plain list
+    paged by `skip`.
+    """
+    if cursor is not None:
+        articles, next_cursor = await get_articles_page_supabase(limit=limit, cursor=cursor, sort=sort)
+        return PaginatedResponse.keyset(articles, limit, next_cursor, sort)
     articles = await get_articles_supabase(skip=skip, limit=limit)
     return articles
 
 
-@router.get("/user/{user_id}", response_model=List[ArticleRead])
+@router.get("/user/{user_id}", response_model=Union[PaginatedResponse, List[ArticleRead]])
 async def read_user_articles(
     user_id: int,
     skip: int = 0,
-    limit: int = 100
+    limit: int = Query(100, ge=1, le=500),
+    scope: str = Query("authored", pattern="^(authored|contributed)$", description="authored: current revision is the user's; contributed: any revision is"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing")
 ):
-    """Retrieves articles created by a specific user."""
-    from supabase_client import supabase
-    try:
-        # Get articles where the current revision was created by this user
-        # First get all articles
-        articles_result = supabase.table("article").select("*").execute()
-        user_articles = []
-        
-        for article_data in articles_result.data:
-            # Check if this article has a current revision by this user
-            if article_data.get("current_revision_id"):
-                revision_result = supabase.table("revision").select("*").eq("id", article_data["current_revision_id"]).eq("user_id", user_id).execute()
-                if revision_result.data:
-                    user_articles.append(ArticleRead(
-                        id=article_data["id"],
-                        title=article_data["title"],
-                        created_at=article_data["created_at"],
-                        updated_at=article_data["updated_at"]
-                    ))
-        
-        # Apply pagination
-        start = skip
-        end = skip + limit
-        return user_articles[start:end]
-        
-    except Exception as e:
-        print(f"Error getting user articles: {e}")
-        return []
+    """Retrieves articles created by a specific user, most recently updated first.
+
+    With `cursor`, returns a PaginatedResponse whose pagination block also
+    carries the user's authored/contributed/revision counts.
+    """
+    if cursor is None:
+        rows, _ = await get_user_articles_page_supabase(user_id, scope, limit, offset=skip)
+        return [ArticleRead(**{field: row[field] for field in ("id", "title", "created_at", "updated_at")}) for row in rows]
+
+    (rows, next_cursor), counts = await asyncio.gather(
+        get_user_articles_page_supabase(user_id, scope, limit, cursor),
+        count_user_articles_supabase(user_id)
+    )
+    response = PaginatedResponse.keyset(rows, limit, next_cursor, "updated_at", descending=True)
+    response.pagination["counts"] = counts
+    return response
 
 
 @router.get("/{title}", response_model=ArticleReadWithCurrentRevision)
@@ -266,7 +269,7 @@ async def add_comment(
     
     return {"message": "Comment added successfully", "comment": comment}
 
-@router.get("/{title}/revisions/{revision_id}/diff")
+@router.get("/{title}/revisions/{revision_id}/diff", dependencies=[Depends(rate_limit("diff"))])
 async def get_revision_diff(
     *,
     title: str,
@@ -402,3 +405,24 @@ async def get_article_references(
     references = await get_references_by_article_supabase(article.id)
     
     return references
+
+@router.get("/{title}/references/validation")
+async def validate_article_references(
+    *,
+    title: str
+):
+    """Check the current revision's citations against the article's references."""
+    normalized_title = normalize_title(title)
+    article = await get_article_by_title_supabase(title=normalized_title)
+    if not article:
+        raise HTTPException(status_code=404, detail=f"Article '{normalized_title}' not found.")
+
+    references = await get_references_by_article_supabase(article.id)
+    revision = article.currentRevision
+    if not revision:
+        return validate_references("", references)
+
+    # Keyed by revision, so validating the same revision again reuses the earlier parse
+    result = validate_references(revision.content or "", references, revision_id=revision.id)
+    result["revision_id"] = revision.id
+    return result
@@ -11,49 +11,57 @@ from models import UserRead, UserCreate, UserLogin
 from database import get_session
 from auth import security
 from auth.dependencies import get_current_user # Import the dependency
-from auth_supabase import get_user_by_username_supabase, get_user_by_email_supabase, create_user_supabase
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from auth.password_pool import PasswordPoolBusy
+from auth_supabase import (
+    get_user_by_login_identifier_supabase, create_user_supabase, rehash_user_password_supabase,
+    UserConflictError
+)
+from ratelimit.limiter import rate_limit
 
 logger = logging.getLogger("afropedia.auth")
 router = APIRouter()
 
-# Rate limiter for auth endpoints
-limiter = Limiter(key_func=get_remote_address)
+def password_pool_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
 
-@router.post("/register", response_model=UserRead)
+@router.post("/register", response_model=UserRead, dependencies=[Depends(rate_limit("register"))])
 async def register_user(
     user_in: UserCreate
 ):
     """Registers a new user."""
-    existing_user = await get_user_by_username_supabase(user_in.username)
-    if existing_user:
-        raise HTTPException(status_code=400, detail="Username already registered")
-    existing_email = await get_user_by_email_supabase(user_in.email)
-    if existing_email:
-        raise HTTPException(status_code=400, detail="Email already registered")
-
-    user = await create_user_supabase(user_in)
+    try:
+        user = await create_user_supabase(user_in)
+    except UserConflictError as e:
+        detail = "Email already registered" if e.field == "email" else "Username already registered"
+        raise HTTPException(status_code=400, detail=detail)
+    except PasswordPoolBusy:
+        raise password_pool_busy()
     return UserRead.model_validate(user)
 
 
-@router.post("/login")
-@limiter.limit("5/minute")  # 5 login attempts per minute
+@router.post("/login", dependencies=[Depends(rate_limit("login"))])  # 5 login attempts per minute per client
 async def login_for_access_token(
     request: Request,
     user_login_data: UserLogin
 ):
     """Logs in a user via JSON payload and returns an access token."""
-    user_by_username = await get_user_by_username_supabase(user_login_data.loginIdentifier)
-    user_by_email = None
-    if not user_by_username:
-         user_by_email = await get_user_by_email_supabase(user_login_data.loginIdentifier)
-
-    user = user_by_username or user_by_email 
+    user = await get_user_by_login_identifier_supabase(user_login_data.loginIdentifier)
     # Log authentication attempt (remove debug prints for production)
     logger.info(f"Login attempt for: {user_login_data.loginIdentifier}")
     
-    if not user or not security.verify_password(user_login_data.password, user.hashed_password):
+    valid, new_hash = False, None
+    if user:
+        try:
+            valid, new_hash = await security.verify_and_update_password(user_login_data.password, user.hashed_password)
+        except PasswordPoolBusy:
+            logger.warning(f"Password pool saturated, shedding login for: {user_login_data.loginIdentifier}")
+            raise password_pool_busy()
+
+    if not valid:
         logger.warning(f"Authentication failed for: {user_login_data.loginIdentifier}")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -61,9 +69,13 @@ async def login_for_access_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    # Upgrade hashes made with older cost parameters while we have the plaintext
+    if new_hash and await rehash_user_password_supabase(user.id, user.hashed_password, new_hash):
+        security.password_pool.record_rehash()
+
     access_token_expires = timedelta(minutes=settings.access_token_expire_minutes)
     access_token = security.create_access_token(
-        data={"sub": user.username}, expires_delta=access_token_expires
+        data={"sub": user.username, "ver": user.token_version}, expires_delta=access_token_expires
     )
     user_read = UserRead.model_validate(user)
     return {"access_token": access_token, "token_type": "bearer", "user": user_read}
@@ -1,11 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List, Optional
+from typing import List, Optional, Union
 
 from database import get_session
 from crud import book_crud # Import book CRUD functions
-from models import BookRead, BookCreate, BookUpdate, UserRead # Import book schemas
-from supabase_crud import get_books_supabase, create_book_supabase, get_book_by_id_supabase, update_book_supabase, delete_book_supabase
+from models import BookRead, BookCreate, BookUpdate, UserRead, PaginatedResponse # Import book schemas
+from supabase_crud import get_books_supabase, get_books_page_supabase, create_book_supabase, get_book_by_id_supabase, update_book_supabase, delete_book_supabase
 from auth.dependencies import get_current_user # Import if protecting routes
 from crud.moderation_crud import submit_for_moderation
 from moderation_models import Priority
@@ -29,12 +29,17 @@ async def create_book(
     book = await book_crud.create_book(session=session, book_in=book_in)
     return book
 
-@router.get("/", response_model=List[BookRead])
+@router.get("/", response_model=Union[PaginatedResponse, List[BookRead]])
 async def read_books(
     skip: int = 0,
-    limit: int = 100,
-    title: Optional[str] = Query(None, description="Filter by book title")) -> List[BookRead]:
-    """Retrieves a list of books with optional filtering by title."""
+    limit: int = Query(100, ge=1, le=500),
+    title: Optional[str] = Query(None, description="Filter by book title"),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing"),
+    sort: str = Query("id", pattern="^(id|title|created_at|updated_at)$")):
+    """Retrieves a list of books with optional filtering by title; pass `cursor` for keyset pages."""
+    if cursor is not None:
+        books, next_cursor = await get_books_page_supabase(limit=limit, cursor=cursor, sort=sort)
+        return PaginatedResponse.keyset(books, limit, next_cursor, sort)
     books = await get_books_supabase(skip=skip, limit=limit)
     return books
 
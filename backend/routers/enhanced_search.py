@@ -1,10 +1,11 @@
 # routers/enhanced_search.py
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Query, Depends
 from typing import List, Dict, Any, Optional
-from supabase import Client
 from supabase_client import supabase
 import re
 from difflib import SequenceMatcher
+from ratelimit.limiter import rate_limit
+from title_catalog import title_catalog
 
 router = APIRouter()
 
@@ -22,10 +23,9 @@ def extract_keywords(query: str) -> List[str]:
 async def fuzzy_search_articles(query: str, limit: int = 20) -> List[Dict[str, Any]]:
     """Perform fuzzy search on articles with similarity scoring"""
     try:
-        # Get all articles for fuzzy matching - simplified query first
-        result = supabase.table("article").select("id, title, created_at, updated_at").execute()
-        
-        articles = result.data or []
+        # Titles come from the in-memory catalog instead of a table scan per query
+        catalog = await title_catalog.ensure_fresh()
+        articles = catalog.articles
         if not articles:
             return []
         
@@ -33,7 +33,7 @@ async def fuzzy_search_articles(query: str, limit: int = 20) -> List[Dict[str, A
         scored_articles = []
         
         for article in articles:
-            title = article.get('title', '').replace('_', ' ')
+            title = article['title']
             content = ''  # We'll get content separately if needed
             
             # For now, let's just use title matching to see if we get results
@@ -43,7 +43,7 @@ async def fuzzy_search_articles(query: str, limit: int = 20) -> List[Dict[str, A
             title_similarity = calculate_similarity(query, title)
             
             # Keyword matching in title only for now
-            title_lower = title.lower()
+            title_lower = article['title_lower']
             
             keyword_score = 0
             matched_keywords = []
@@ -86,35 +86,28 @@ async def fuzzy_search_articles(query: str, limit: int = 20) -> List[Dict[str, A
 async def get_search_suggestions(query: str) -> List[str]:
     """Get intelligent search suggestions based on existing content"""
     try:
-        # Get article titles for suggestions
-        result = supabase.table("article").select("title").execute()
-        titles = [article['title'].replace('_', ' ') for article in result.data or []]
-        
-        # Get book titles too
-        book_result = supabase.table("book").select("title").execute()
-        book_titles = [book['title'] for book in book_result.data or []]
-        
-        all_titles = titles + book_titles
+        # Article and book titles from the in-memory catalog
+        catalog = await title_catalog.ensure_fresh()
+        all_titles = list(zip(catalog.titles, catalog.lowered_titles))
         query_lower = query.lower()
         
         suggestions = []
         
         # Exact prefix matches (highest priority)
-        for title in all_titles:
-            if title.lower().startswith(query_lower):
+        for title, title_lower in all_titles:
+            if title_lower.startswith(query_lower):
                 suggestions.append(title)
         
         # Partial word matches
         if len(suggestions) < 5:
-            for title in all_titles:
-                if query_lower in title.lower() and title not in suggestions:
+            for title, title_lower in all_titles:
+                if query_lower in title_lower and title not in suggestions:
                     suggestions.append(title)
         
         # Fuzzy matches for individual words
         if len(suggestions) < 8:
             query_words = query_lower.split()
-            for title in all_titles:
-                title_lower = title.lower()
+            for title, title_lower in all_titles:
                 if any(word in title_lower for word in query_words) and title not in suggestions:
                     suggestions.append(title)
         
@@ -124,7 +117,7 @@ async def get_search_suggestions(query: str) -> List[str]:
         print(f"Error getting suggestions: {e}")
         return []
 
-@router.get("/enhanced", response_model=Dict[str, Any])
+@router.get("/enhanced", response_model=Dict[str, Any], dependencies=[Depends(rate_limit("search"))])
 async def enhanced_search(
     q: str = Query(..., min_length=1, description="Search query"),
     limit: int = Query(20, ge=1, le=50, description="Number of results to return")
@@ -0,0 +1,48 @@
+# routers/exports.py
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from datetime import datetime
+from typing import Optional
+
+from auth.dependencies import get_current_user
+from exporter.streams import EXPORT_TYPES, export_stream
+from models import User
+
+router = APIRouter()
+
+def require_admin_permission(current_user: User = Depends(get_current_user)):
+    """Require admin permission"""
+    if current_user.role not in ["admin"]:
+        raise HTTPException(status_code=403, detail="Admin permission required")
+    return current_user
+
+@router.get("")
+async def export_content(
+    format: str = Query("ndjson", pattern="^(ndjson|dump)$", description="ndjson, or dump for gzip-compressed NDJSON"),
+    types: Optional[str] = Query(None, description="Comma-separated subset of article,book,image,music,video"),
+    since: Optional[datetime] = Query(None, description="Only records changed at or after this time; use next_since from the previous export"),
+    current_user: User = Depends(require_admin_permission)
+):
+    """
+    Stream articles (with current revision, references and sources), books
+    and media metadata as one record per line, ending with an "export"
+    record holding counts and next_since. Sent with chunked transfer
+    encoding. Incremental exports (since) omit deleted rows. Articles and
+    books load back with the bulk importer; media records only point at
+    their stream URLs and are skipped by it.
+    Requires admin permission.
+    """
+    selected = EXPORT_TYPES
+    if types:
+        selected = tuple(kind.strip() for kind in types.split(",") if kind.strip())
+        unknown = [kind for kind in selected if kind not in EXPORT_TYPES]
+        if unknown or not selected:
+            raise HTTPException(status_code=400, detail=f"Unknown export types: {', '.join(unknown) or types}")
+
+    stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+    filename = f"afropedia-{stamp}.ndjson" + (".gz" if format == "dump" else "")
+    return StreamingResponse(
+        export_stream(format, selected, since.isoformat() if since else None),
+        media_type="application/gzip" if format == "dump" else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
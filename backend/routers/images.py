@@ -1,17 +1,19 @@
 # routers/images.py
 from fastapi import (
-    APIRouter, Depends, HTTPException, status, UploadFile, File
+    APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 )
 from fastapi.responses import StreamingResponse
-from typing import Annotated, List
+from typing import Annotated, List, Optional, Union
 
-from models import ImageUploadResponse, ImageMetadataRead, ImageMetadataCreate
-from supabase_crud import create_image_content_supabase, create_image_metadata_supabase, get_image_content_by_metadata_id_supabase, get_image_metadata_by_id_supabase, get_all_image_metadata_supabase, delete_image_supabase
+from models import ImageUploadResponse, ImageMetadataRead, ImageMetadataCreate, PaginatedResponse
+from supabase_crud import create_image_content_supabase, create_image_metadata_supabase, get_image_content_by_metadata_id_supabase, get_image_metadata_by_id_supabase, get_all_image_metadata_supabase, get_image_metadata_page_supabase, delete_image_supabase
+from utils.pagination import InvalidCursor
+from ratelimit.limiter import rate_limit
 import io
 
 router = APIRouter()
 
-@router.post("/upload", response_model=ImageUploadResponse, status_code=status.HTTP_201_CREATED)
+@router.post("/upload", response_model=ImageUploadResponse, status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("upload"))])
 async def upload_image_to_db(
     file: Annotated[UploadFile, File()],
 ):
@@ -81,15 +83,21 @@ async def stream_image(image_meta_id: int):
         raise HTTPException(status_code=500, detail=f"Error streaming image: {str(e)}")
 
 
-@router.get("/", response_model=List[ImageMetadataRead])
+@router.get("/", response_model=Union[PaginatedResponse, List[ImageMetadataRead]])
 async def list_images(
     skip: int = 0,
-    limit: int = 50
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing")
 ):
-    """Retrieves a list of image metadata entries."""
+    """Retrieves a list of image metadata entries; pass `cursor` for keyset pages."""
     try:
+        if cursor is not None:
+            metadata_list, next_cursor = await get_image_metadata_page_supabase(limit=limit, cursor=cursor)
+            return PaginatedResponse.keyset([ImageMetadataRead.model_validate(metadata) for metadata in metadata_list], limit, next_cursor)
         metadata_list = await get_all_image_metadata_supabase(skip=skip, limit=limit)
         return [ImageMetadataRead.model_validate(metadata) for metadata in metadata_list]
+    except InvalidCursor:
+        raise
     except Exception as e:
         print(f"Error listing images: {e}")
         raise HTTPException(status_code=500, detail=f"Error listing images: {str(e)}")
@@ -0,0 +1,90 @@
+# routers/imports.py
+import asyncio
+import hashlib
+import os
+import tempfile
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
+from typing import Annotated, Optional
+
+from auth.dependencies import get_current_user
+from config import settings
+from importer.jobs import import_jobs
+from importer.readers import detect_format
+from models import User
+
+router = APIRouter()
+
+# Bytes read from the upload per chunk while spooling it to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+def require_admin_permission(current_user: User = Depends(get_current_user)):
+    """Require admin permission"""
+    if current_user.role not in ["admin"]:
+        raise HTTPException(status_code=403, detail="Admin permission required")
+    return current_user
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def start_import(
+    file: Annotated[UploadFile, File()],
+    format: Optional[str] = Query(None, pattern="^(jsonl|csv|tar)$", description="Defaults to the file extension"),
+    record_type: Optional[str] = Query(None, pattern="^(article|book|image|music|video)$", description="Type for records without a type field"),
+    dry_run: bool = Query(False, description="Validate and resolve everything without writing"),
+    batch_size: Optional[int] = Query(None, ge=1, le=1000),
+    restart: bool = Query(False, description="Ignore the checkpoint of an earlier upload of the same file"),
+    current_user: User = Depends(require_admin_permission)
+):
+    """
+    Bulk import articles, books and media from a JSONL, CSV or tar upload.
+    The import runs in the background; poll /admin/import/{job_id} for progress.
+    Re-uploading a file whose import was interrupted resumes it.
+    Requires admin permission.
+    """
+    os.makedirs(settings.import_checkpoint_dir, exist_ok=True)
+    digest = hashlib.sha256()
+    spool = tempfile.NamedTemporaryFile(dir=settings.import_checkpoint_dir, suffix=".upload", delete=False)
+    try:
+        with spool:
+            while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+                digest.update(chunk)
+                await asyncio.to_thread(spool.write, chunk)
+    except Exception:
+        os.remove(spool.name)
+        raise
+
+    fingerprint = digest.hexdigest()
+    running = import_jobs.running(fingerprint)
+    if running and not dry_run:
+        os.remove(spool.name)
+        raise HTTPException(status_code=409, detail=f"This file is already being imported by job {running.id}")
+
+    job = import_jobs.start(
+        spool.name,
+        file.filename or "upload",
+        fingerprint,
+        fmt=format or detect_format(file.filename or ""),
+        default_type=record_type,
+        dry_run=dry_run,
+        batch_size=batch_size,
+        default_user_id=current_user.id,
+        restart=restart
+    )
+    return job.to_dict()
+
+@router.get("")
+async def list_imports(current_user: User = Depends(require_admin_permission)):
+    """
+    Recent and running imports on this worker.
+    Requires admin permission.
+    """
+    return {"jobs": import_jobs.list_jobs()}
+
+@router.get("/{job_id}")
+async def get_import(job_id: str, current_user: User = Depends(require_admin_permission)):
+    """
+    Status and counters of one import.
+    Requires admin permission.
+    """
+    job = import_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Import job not found on this worker")
+    return job.to_dict()
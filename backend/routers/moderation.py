@@ -1,8 +1,8 @@
 # routers/moderation.py
 from fastapi import APIRouter, Depends, HTTPException, Query
-from typing import List, Optional
+from typing import List, Optional, Union
 from auth.dependencies import get_current_user
-from models import User
+from models import User, PaginatedResponse
 from moderation_models import (
     ModerationQueue, ModerationQueueCreate, ModerationQueueUpdate,
     PeerReview, PeerReviewCreate, PeerReviewUpdate,
@@ -10,21 +10,28 @@ from moderation_models import (
     ContentFlag, ContentFlagCreate, ContentFlagUpdate,
     UserPermission, UserPermissionCreate,
     ApproveContentRequest, RejectContentRequest,
+    BulkApproveContentRequest, BulkRejectContentRequest,
     ModerationStatus, ReviewStatus, Priority, ActionType, FlagType
 )
 from crud.moderation_crud import (
-    create_moderation_queue_item, get_moderation_queue_items, update_moderation_queue_item,
+    create_moderation_queue_item, get_moderation_queue_items, get_moderation_queue_page, count_moderation_queue_items, update_moderation_queue_item,
     create_peer_review, get_peer_reviews_for_revision, get_peer_reviews_by_reviewer, update_peer_review,
-    create_moderation_action, get_moderation_actions,
-    create_content_flag, get_content_flags as crud_get_content_flags, update_content_flag,
+    create_moderation_action, get_moderation_actions_page as crud_get_moderation_actions_page,
+    create_content_flag, get_content_flags as crud_get_content_flags, get_content_flags_page as crud_get_content_flags_page, count_content_flags, update_content_flag,
     create_user_permission, get_user_permissions, check_user_permission,
-    submit_for_moderation, assign_moderation_item, approve_content, reject_content, flag_content,
+    submit_for_moderation, assign_moderation_item as crud_assign_moderation_item, approve_content, reject_content, flag_content,
+    bulk_approve_content, bulk_reject_content,
+    claim_moderation_items, renew_moderation_lease, release_moderation_lease,
+    requeue_expired_moderation_leases, DEFAULT_LEASE_SECONDS,
     get_pending_revisions_for_review, create_peer_review_for_revision, complete_peer_review_evaluation, 
     get_revision_review_summary, auto_approve_revision_if_consensus
 )
 
 router = APIRouter()
 
+# Upper bound on queue items handled by one bulk approve/reject request
+MAX_BULK_ITEMS = 200
+
 # Simplified permission dependency - allow all authenticated users for now
 def require_moderation_access(current_user: User = Depends(get_current_user)):
     """Require user to be authenticated (simplified for now)"""
@@ -47,14 +54,18 @@ async def create_moderation_queue(
         raise HTTPException(status_code=400, detail="Failed to create moderation queue item")
     return result
 
-@router.get("/queue", response_model=List[ModerationQueue])
+@router.get("/queue", response_model=Union[PaginatedResponse, List[ModerationQueue]])
 async def get_moderation_queue(
     status: Optional[ModerationStatus] = Query(None),
     assigned_to: Optional[int] = Query(None),
-    limit: int = Query(50, le=100),
-    offset: int = Query(0, ge=0)
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing")
 ):
-    """Get moderation queue items"""
+    """Get moderation queue items, newest first; pass `cursor` for keyset pages"""
+    if cursor is not None:
+        items, next_cursor = await get_moderation_queue_page(status, assigned_to, limit, cursor)
+        return PaginatedResponse.keyset(items, limit, next_cursor, "created_at", descending=True)
     return await get_moderation_queue_items(status, assigned_to, limit, offset)
 
 @router.patch("/queue/{item_id}", response_model=ModerationQueue)
@@ -76,11 +87,50 @@ async def assign_moderation_item(
     current_user: User = Depends(require_moderation_access)
 ):
     """Assign a moderation item to a moderator"""
-    result = await assign_moderation_item(item_id, assigned_to)
+    result = await crud_assign_moderation_item(item_id, assigned_to)
     if not result:
-        raise HTTPException(status_code=404, detail="Moderation queue item not found")
+        raise HTTPException(status_code=409, detail="Moderation queue item not found or already leased")
     return {"message": "Item assigned successfully"}
 
+# Moderation Work Queue Endpoints
+@router.post("/queue/claim", response_model=List[ModerationQueue])
+async def claim_moderation_queue_items(
+    limit: int = Query(10, ge=1, le=50),
+    lease_seconds: int = Query(DEFAULT_LEASE_SECONDS, ge=60, le=3600),
+    current_user: User = Depends(require_moderation_access)
+):
+    """Lease the next queue items by priority, then age"""
+    return await claim_moderation_items(current_user.id, limit, lease_seconds)
+
+@router.post("/queue/requeue-expired")
+async def requeue_expired_leases(
+    current_user: User = Depends(require_moderation_access)
+):
+    """Return queue items with expired leases to the pending queue"""
+    requeued = await requeue_expired_moderation_leases()
+    return {"message": "Expired leases requeued", "requeued": requeued}
+
+@router.post("/queue/{item_id}/renew")
+async def renew_moderation_queue_lease(
+    item_id: int,
+    lease_seconds: int = Query(DEFAULT_LEASE_SECONDS, ge=60, le=3600),
+    current_user: User = Depends(require_moderation_access)
+):
+    """Extend the current moderator's lease on a queue item"""
+    if not await renew_moderation_lease(item_id, current_user.id, lease_seconds):
+        raise HTTPException(status_code=409, detail="Lease not held or already expired")
+    return {"message": "Lease renewed successfully"}
+
+@router.post("/queue/{item_id}/release")
+async def release_moderation_queue_lease(
+    item_id: int,
+    current_user: User = Depends(require_moderation_access)
+):
+    """Hand a leased queue item back to the pending queue"""
+    if not await release_moderation_lease(item_id, current_user.id):
+        raise HTTPException(status_code=409, detail="Lease not held by current user")
+    return {"message": "Item released successfully"}
+
 # Peer Review Endpoints
 @router.post("/reviews", response_model=PeerReview)
 async def create_peer_review(
@@ -133,16 +183,20 @@ async def create_moderation_action(
         raise HTTPException(status_code=400, detail="Failed to create moderation action")
     return result
 
-@router.get("/actions", response_model=List[ModerationAction])
+@router.get("/actions", response_model=Union[PaginatedResponse, List[ModerationAction]])
 async def get_moderation_actions(
     moderator_id: Optional[int] = Query(None),
     content_type: Optional[str] = Query(None),
     content_id: Optional[int] = Query(None),
-    limit: int = Query(50, le=100),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing"),
     current_user: User = Depends(require_moderation_access)
 ):
-    """Get moderation actions with optional filters"""
-    return await get_moderation_actions(moderator_id, content_type, content_id, limit)
+    """Get moderation actions with optional filters; pass `cursor` for keyset pages"""
+    actions, next_cursor = await crud_get_moderation_actions_page(moderator_id, content_type, content_id, limit, cursor or None)
+    if cursor is not None:
+        return PaginatedResponse.keyset(actions, limit, next_cursor, "created_at", descending=True)
+    return actions
 
 # Content Flags Endpoints
 @router.post("/flags", response_model=ContentFlag)
@@ -156,13 +210,17 @@ async def create_content_flag(
         raise HTTPException(status_code=400, detail="Failed to create content flag")
     return result
 
-@router.get("/flags", response_model=List[ContentFlag])
+@router.get("/flags", response_model=Union[PaginatedResponse, List[ContentFlag]])
 async def get_content_flags(
     status: Optional[str] = Query(None),
     flag_type: Optional[FlagType] = Query(None),
-    limit: int = Query(50, le=100)
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing")
 ):
-    """Get content flags with optional filters"""
+    """Get content flags with optional filters; pass `cursor` for keyset pages"""
+    if cursor is not None:
+        flags, next_cursor = await crud_get_content_flags_page(status, flag_type, limit, cursor)
+        return PaginatedResponse.keyset(flags, limit, next_cursor, "created_at", descending=True)
     return await crud_get_content_flags(status, flag_type, limit)
 
 @router.patch("/flags/{flag_id}", response_model=ContentFlag)
@@ -233,6 +291,54 @@ async def reject_content_endpoint(
         raise HTTPException(status_code=400, detail="Failed to reject content")
     return {"message": "Content rejected successfully"}
 
+@router.post("/bulk-approve")
+async def bulk_approve_content_endpoint(
+    request: BulkApproveContentRequest,
+    current_user: User = Depends(require_moderation_access)
+):
+    """Approve many content items in one request"""
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No items to approve")
+    if len(request.items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} items can be approved per request")
+    try:
+        approved = await bulk_approve_content(
+            [(item.content_type, item.content_id) for item in request.items],
+            current_user.id,
+            request.reason
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to approve content: {str(e)}")
+    return {
+        "message": "Content approved successfully",
+        "approved": approved,
+        "processed": sum(len(ids) for ids in approved.values())
+    }
+
+@router.post("/bulk-reject")
+async def bulk_reject_content_endpoint(
+    request: BulkRejectContentRequest,
+    current_user: User = Depends(require_moderation_access)
+):
+    """Reject many content items in one request"""
+    if not request.items:
+        raise HTTPException(status_code=400, detail="No items to reject")
+    if len(request.items) > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ITEMS} items can be rejected per request")
+    try:
+        rejected = await bulk_reject_content(
+            [(item.content_type, item.content_id) for item in request.items],
+            current_user.id,
+            request.reason
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Failed to reject content: {str(e)}")
+    return {
+        "message": "Content rejected successfully",
+        "rejected": rejected,
+        "processed": sum(len(ids) for ids in rejected.values())
+    }
+
 # Peer Review Workflow Endpoints (No Assignment - All Editors Can Review)
 @router.get("/pending-revisions")
 async def get_pending_revisions(
@@ -300,16 +406,16 @@ async def flag_content_endpoint(
 async def get_moderation_dashboard_stats():
     """Get moderation dashboard statistics"""
     try:
-        # Get counts for different statuses
-        pending_queue = await get_moderation_queue_items(ModerationStatus.PENDING, limit=1000)
-        in_review_queue = await get_moderation_queue_items(ModerationStatus.IN_REVIEW, limit=1000)
-        pending_flags = await crud_get_content_flags(status="pending", limit=1000)
+        # Count-only queries for different statuses
+        pending_count = await count_moderation_queue_items(ModerationStatus.PENDING)
+        in_review_count = await count_moderation_queue_items(ModerationStatus.IN_REVIEW)
+        pending_flags_count = await count_content_flags(status="pending")
         
         return {
-            "pending_moderation": len(pending_queue),
-            "in_review": len(in_review_queue),
-            "pending_flags": len(pending_flags),
-            "total_queue_items": len(pending_queue) + len(in_review_queue)
+            "pending_moderation": pending_count,
+            "in_review": in_review_count,
+            "pending_flags": pending_flags_count,
+            "total_queue_items": pending_count + in_review_count
         }
     except Exception as e:
         # If moderation tables don't exist, return empty stats
@@ -328,4 +434,5 @@ async def get_recent_moderation_actions(
     current_user: User = Depends(require_moderation_access)
 ):
     """Get recent moderation actions"""
-    return await get_moderation_actions(limit=limit)
+    actions, _ = await crud_get_moderation_actions_page(limit=limit)
+    return actions
@@ -1,18 +1,32 @@
 # routers/monitoring.py
-from fastapi import APIRouter, Response, HTTPException, Depends
+from fastapi import APIRouter, Response, HTTPException, Depends, Query
 from fastapi.responses import PlainTextResponse
+import asyncio
 import logging
 import json
 from typing import Dict, Any
 
 from monitoring.health_checks import health_checker, HealthStatus
 from monitoring.metrics import metrics
+from monitoring.profiler import ProfilerBusy, sampler, slow_requests, to_collapsed
+from events.outbox import get_outbox_stats
 from auth.dependencies import get_current_user
+from auth.security import password_pool
+from ratelimit.limiter import limiter
+from config import settings
+from utils.logging_config import get_logging_stats
+from tracing.tracer import tracer
 from models import UserRead
 
 router = APIRouter()
 logger = logging.getLogger("afropedia.monitoring")
 
+def require_admin_permission(current_user: UserRead = Depends(get_current_user)):
+    """Require admin permission"""
+    if current_user.role not in ["admin"]:
+        raise HTTPException(status_code=403, detail="Admin permission required")
+    return current_user
+
 @router.get("/health", tags=["Monitoring"])
 async def health_check():
     """
@@ -20,8 +34,8 @@ async def health_check():
     Returns simple status without detailed information.
     """
     try:
-        # Run a quick health check
-        basic_health = await health_checker.check_database_health()
+        # Latest sampled result; probes never query the database themselves
+        basic_health = await health_checker.get_check("database")
         
         if basic_health.status in [HealthStatus.HEALTHY, HealthStatus.DEGRADED]:
             return {
@@ -69,8 +83,8 @@ async def readiness_check():
     Returns 200 if the service is ready to receive traffic.
     """
     try:
-        # Check critical dependencies
-        db_health = await health_checker.check_database_health()
+        # Check critical dependencies (from the background snapshot)
+        db_health = await health_checker.get_check("database")
         
         if db_health.status in [HealthStatus.HEALTHY, HealthStatus.DEGRADED]:
             return {"status": "ready", "timestamp": db_health.timestamp}
@@ -105,10 +119,11 @@ async def liveness_check():
 async def prometheus_metrics():
     """
     Prometheus-compatible metrics endpoint.
-    Returns metrics in Prometheus exposition format.
+    Returns metrics in Prometheus exposition format, merged across workers.
     """
     try:
-        return metrics.get_prometheus_metrics()
+        body = await asyncio.to_thread(metrics.get_prometheus_metrics)
+        return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
     except Exception as e:
         logger.error(f"Metrics export failed: {e}")
         raise HTTPException(status_code=500, detail="Metrics export failed")
@@ -119,7 +134,7 @@ async def json_metrics():
     JSON format metrics for custom monitoring systems.
     """
     try:
-        return metrics.get_metrics_summary()
+        return await asyncio.to_thread(metrics.get_metrics_summary)
     except Exception as e:
         logger.error(f"JSON metrics export failed: {e}")
         raise HTTPException(status_code=500, detail="Metrics export failed")
@@ -131,7 +146,7 @@ async def service_status():
     Public endpoint for status pages.
     """
     try:
-        basic_health = await health_checker.check_database_health()
+        basic_health = await health_checker.get_check("database")
         app_health = health_checker.check_application_health()
         
         return {
@@ -155,16 +170,20 @@ async def service_status():
 
 # Admin-only endpoints for detailed monitoring
 @router.get("/admin/health", tags=["Admin Monitoring"])
-async def admin_health_check(current_user: UserRead = Depends(get_current_user)):
+async def admin_health_check(
+    refresh: bool = False,
+    current_user: UserRead = Depends(get_current_user)
+):
     """
     Admin-only detailed health information.
+    Pass refresh=true to rerun every check instead of reading the snapshot.
     Requires authentication.
     """
     # Check if user is admin (you might want to add role checking)
     logger.info(f"Admin health check requested by user {current_user.id}")
     
     try:
-        return await health_checker.run_all_checks()
+        return await health_checker.run_all_checks(fresh=refresh)
     except Exception as e:
         logger.error(f"Admin health check failed: {e}")
         raise HTTPException(status_code=500, detail="Health check failed")
@@ -178,11 +197,96 @@ async def admin_metrics(current_user: UserRead = Depends(get_current_user)):
     logger.info(f"Admin metrics requested by user {current_user.id}")
     
     try:
-        return metrics.get_metrics_summary()
+        return await asyncio.to_thread(metrics.get_metrics_summary)
     except Exception as e:
         logger.error(f"Admin metrics failed: {e}")
         raise HTTPException(status_code=500, detail="Metrics retrieval failed")
 
+@router.get("/admin/outbox", tags=["Admin Monitoring"])
+async def admin_outbox_stats(current_user: UserRead = Depends(require_admin_permission)):
+    """
+    Admin-only event outbox backlog by status.
+    Requires admin permission.
+    """
+    try:
+        return await asyncio.to_thread(get_outbox_stats)
+    except Exception as e:
+        logger.error(f"Outbox stats failed: {e}")
+        raise HTTPException(status_code=500, detail="Outbox stats retrieval failed")
+
+@router.get("/admin/password-pool", tags=["Admin Monitoring"])
+async def admin_password_pool_stats(current_user: UserRead = Depends(require_admin_permission)):
+    """
+    Admin-only password hashing pool queue depth and timings.
+    Requires admin permission.
+    """
+    return password_pool.stats()
+
+@router.get("/admin/rate-limits", tags=["Admin Monitoring"])
+async def admin_rate_limit_stats(current_user: UserRead = Depends(require_admin_permission)):
+    """
+    Admin-only rate limit budgets and allowed/limited/error counts.
+    Requires admin permission.
+    """
+    return limiter.stats()
+
+@router.get("/admin/logging", tags=["Admin Monitoring"])
+async def admin_logging_stats(current_user: UserRead = Depends(require_admin_permission)):
+    """
+    Admin-only log queue depth and records dropped under load.
+    Requires admin permission.
+    """
+    return get_logging_stats()
+
+@router.get("/admin/tracing", tags=["Admin Monitoring"])
+async def admin_tracing_stats(current_user: UserRead = Depends(require_admin_permission)):
+    """
+    Admin-only span export queue depth and spans exported or dropped.
+    Requires admin permission.
+    """
+    return tracer.stats()
+
+@router.get("/admin/profile", tags=["Admin Monitoring"])
+async def admin_profile(
+    seconds: float = Query(10.0, gt=0),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+    format: str = Query("collapsed", pattern="^(collapsed|json)$"),
+    current_user: UserRead = Depends(require_admin_permission)
+):
+    """
+    Admin-only sampling profile of this worker over a time window.
+    Returns collapsed stacks (flamegraph.pl, speedscope) or JSON.
+    Requires admin permission.
+    """
+    if seconds > settings.profiler_max_seconds:
+        raise HTTPException(status_code=400, detail=f"Profiling window is limited to {settings.profiler_max_seconds} seconds")
+
+    logger.info(f"Profile of {seconds}s requested by user {current_user.id}")
+    try:
+        profile = await asyncio.to_thread(sampler.profile, seconds, interval_ms)
+    except ProfilerBusy:
+        raise HTTPException(status_code=409, detail="A profile is already running")
+
+    if format == "json":
+        stacks = profile.pop("stacks")
+        profile["stacks"] = [{"stack": stack, "count": count} for stack, count in stacks.most_common()]
+        return profile
+    return PlainTextResponse(to_collapsed(profile["stacks"]))
+
+@router.get("/admin/slow-requests", tags=["Admin Monitoring"])
+async def admin_slow_requests(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: UserRead = Depends(require_admin_permission)
+):
+    """
+    Admin-only stack samples and query traces of recent slow requests on this worker.
+    Requires admin permission.
+    """
+    return {
+        "threshold_ms": slow_requests.threshold_ms,
+        "captures": slow_requests.recent(limit)
+    }
+
 @router.get("/ping", tags=["Monitoring"])
 async def ping():
     """
@@ -1,23 +1,25 @@
 # routers/music.py
 from fastapi import (
-    APIRouter, Depends, HTTPException, status, UploadFile, File, Form
+    APIRouter, Depends, HTTPException, status, UploadFile, File, Form, Query
 )
 from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List, Optional, Annotated # Use Annotated for Form metadata in newer FastAPI
+from typing import List, Optional, Annotated, Union # Use Annotated for Form metadata in newer FastAPI
 
-from models import MusicMetadataSchema, MusicMetadataCreate # Import schemas
+from models import MusicMetadataSchema, MusicMetadataCreate, PaginatedResponse # Import schemas
 from supabase_crud import (
     get_all_music_metadata_supabase, 
+    get_music_metadata_page_supabase, 
     get_music_metadata_by_id_supabase, 
     get_music_content_by_id_supabase,
     create_music_content_supabase,
     create_music_metadata_supabase
 )
+from ratelimit.limiter import rate_limit
 
 router = APIRouter()
 
-@router.post("/upload", status_code=status.HTTP_201_CREATED) # Using /upload instead of /upload-music
+@router.post("/upload", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("upload"))]) # Using /upload instead of /upload-music
 async def upload_music(
     # Use Annotated for clearer Form field definitions
     title: Annotated[str, Form()],
@@ -85,12 +87,16 @@ async def stream_music(music_id: int):
     return StreamingResponse(iter([audio_data]), headers=headers, media_type="audio/mpeg")
 
 
-@router.get("/", response_model=List[MusicMetadataSchema])
+@router.get("/", response_model=Union[PaginatedResponse, List[MusicMetadataSchema]])
 async def list_music(
     skip: int = 0,
-    limit: int = 100
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing")
 ):
-    """Retrieves a list of music metadata entries."""
+    """Retrieves a list of music metadata entries; pass `cursor` for keyset pages."""
+    if cursor is not None:
+        music_list, next_cursor = await get_music_metadata_page_supabase(limit=limit, cursor=cursor)
+        return PaginatedResponse.keyset([MusicMetadataSchema.model_validate(music) for music in music_list], limit, next_cursor)
     music_list = await get_all_music_metadata_supabase(skip=skip, limit=limit)
     # Validate each item against the response schema
     return [MusicMetadataSchema.model_validate(music) for music in music_list]
@@ -1,9 +1,12 @@
 # routers/peer_review.py - Advanced Peer Review API Routes
-from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks
-from typing import List, Optional, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, Query, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
+from typing import List, Optional, Dict, Any, Union
 from datetime import datetime, timedelta
+import asyncio
+import json
 from auth.dependencies import get_current_user
-from models import User
+from models import User, PaginatedResponse
 from peer_review_models import (
     PeerReview, PeerReviewCreate, PeerReviewUpdate, PeerReviewRead,
     ReviewAssignment, ReviewAssignmentCreate, ReviewAssignmentUpdate, ReviewAssignmentRead,
@@ -14,13 +17,19 @@ from peer_review_models import (
 )
 from crud.peer_review_crud import (
     create_peer_review, get_peer_review_by_id, get_peer_reviews_for_revision,
-    get_peer_reviews_by_reviewer, update_peer_review, start_review, complete_review,
-    create_review_assignment, get_pending_assignments, accept_assignment, decline_assignment,
+    get_peer_reviews_by_reviewer, get_peer_reviews_by_reviewer_page, update_peer_review, start_review, complete_review,
+    create_review_assignment, get_pending_assignments, get_overdue_assignments, accept_assignment, decline_assignment,
     create_review_comment, get_review_comments,
-    get_reviewer_metrics, get_review_analytics,
+    get_reviewer_metrics, get_review_analytics, rebuild_review_rollups,
     create_review_template, get_review_templates,
     assign_reviewers_to_revision, get_review_consensus
 )
+from review_assignment_service import ReviewAssignmentService
+from events.pubsub import get_broker, user_channel, REVIEWERS_CHANNEL
+from events.notifications import notify_reviewers
+
+# Seconds between keep-alive comments on idle notification streams
+STREAM_KEEPALIVE_SECONDS = 15
 
 router = APIRouter()
 
@@ -70,15 +79,19 @@ async def get_revision_reviews(
     """Get all peer reviews for a specific revision"""
     return await get_peer_reviews_for_revision(revision_id, include_comments)
 
-@router.get("/reviews/reviewer/{reviewer_id}", response_model=List[PeerReviewRead])
+@router.get("/reviews/reviewer/{reviewer_id}", response_model=Union[PaginatedResponse, List[PeerReviewRead]])
 async def get_reviewer_reviews(
     reviewer_id: int,
     status: Optional[ReviewStatus] = Query(None),
-    limit: int = Query(50, le=100),
+    limit: int = Query(50, ge=1, le=100),
     offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing"),
     current_user: User = Depends(require_reviewer_permission)
 ):
-    """Get peer reviews by a specific reviewer"""
+    """Get peer reviews by a specific reviewer, newest first; pass `cursor` for keyset pages"""
+    if cursor is not None:
+        reviews, next_cursor = await get_peer_reviews_by_reviewer_page(reviewer_id, status, limit, cursor)
+        return PaginatedResponse.keyset(reviews, limit, next_cursor, "created_at", descending=True)
     return await get_peer_reviews_by_reviewer(reviewer_id, status, limit, offset)
 
 @router.patch("/reviews/{review_id}", response_model=PeerReviewRead)
@@ -117,6 +130,11 @@ async def complete_peer_review(
     success = await complete_review(review_id, status, overall_score, criteria_scores, feedback)
     if not success:
         raise HTTPException(status_code=404, detail="Peer review not found")
+    await notify_reviewers("review.completed", {
+        "review_id": review_id,
+        "status": status.value,
+        "reviewer_id": current_user.id
+    })
     return {"message": "Review completed successfully"}
 
 # Review Assignment System
@@ -217,14 +235,24 @@ async def get_reviewer_metrics_endpoint(
 
 @router.get("/analytics", response_model=ReviewAnalytics)
 async def get_review_analytics_endpoint(
+    trend_days: int = Query(30, ge=1, le=365),
     current_user: User = Depends(require_admin_permission)
 ):
     """Get comprehensive review analytics"""
-    result = await get_review_analytics()
+    result = await get_review_analytics(trend_days)
     if not result:
         raise HTTPException(status_code=404, detail="Analytics not available")
     return result
 
+@router.post("/analytics/rebuild")
+async def rebuild_review_analytics_endpoint(
+    current_user: User = Depends(require_admin_permission)
+):
+    """Recompute review analytics rollups from all peer reviews"""
+    if not await rebuild_review_rollups():
+        raise HTTPException(status_code=500, detail="Failed to rebuild review analytics")
+    return {"message": "Review analytics rebuilt successfully"}
+
 # Advanced Workflow Endpoints
 @router.post("/assign-multiple")
 async def assign_multiple_reviewers(
@@ -237,13 +265,44 @@ async def assign_multiple_reviewers(
 ):
     """Assign multiple reviewers to a revision"""
     assignments = await assign_reviewers_to_revision(
-        revision_id, reviewer_ids, priority, due_date, instructions
+        revision_id, reviewer_ids, priority, due_date, instructions, assigned_by=current_user.id
     )
     return {
         "message": f"Assigned {len(assignments)} reviewers",
         "assignments": assignments
     }
 
+@router.post("/assign-auto")
+async def auto_assign_reviewers(
+    reviewers_per_revision: int = Query(3, ge=1, le=10),
+    batch_size: int = Query(100, ge=1, le=500),
+    max_open_assignments: int = Query(10, ge=1, le=100),
+    priority: ReviewPriority = ReviewPriority.NORMAL,
+    required_level: ReviewerLevel = ReviewerLevel.JUNIOR,
+    due_in_days: Optional[int] = Query(7, ge=1, le=90),
+    dry_run: bool = Query(False),
+    current_user: User = Depends(require_admin_permission)
+):
+    """Automatically assign reviewers across the pending review backlog"""
+    try:
+        assignments = await ReviewAssignmentService.assign_pending_backlog(
+            assigned_by=current_user.id,
+            reviewers_per_revision=reviewers_per_revision,
+            batch_size=batch_size,
+            max_open_assignments=max_open_assignments,
+            priority=priority,
+            required_level=required_level,
+            due_in_days=due_in_days,
+            dry_run=dry_run
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Automatic assignment failed: {str(e)}")
+    return {
+        "message": f"{'Planned' if dry_run else 'Assigned'} {len(assignments)} review assignments",
+        "dry_run": dry_run,
+        "assignments": assignments
+    }
+
 @router.get("/consensus/{revision_id}")
 async def get_review_consensus_endpoint(
     revision_id: int,
@@ -346,19 +405,60 @@ async def get_review_notifications(
         # Get pending assignments
         pending_assignments = await get_pending_assignments(current_user.id)
         
-        # Get overdue reviews (simplified)
-        overdue_reviews = []  # Would need actual query for overdue reviews
+        # Get overdue reviews
+        overdue_reviews = await get_overdue_assignments(current_user.id)
+        
+        notifications = [
+            {
+                "type": "assignment",
+                "message": f"You have {len(pending_assignments)} pending review assignments",
+                "priority": "high" if len(pending_assignments) > 5 else "normal"
+            }
+        ]
+        if overdue_reviews:
+            notifications.append({
+                "type": "overdue",
+                "message": f"You have {len(overdue_reviews)} overdue review assignments",
+                "priority": "high"
+            })
         
         return {
             "pending_assignments": len(pending_assignments),
             "overdue_reviews": len(overdue_reviews),
-            "notifications": [
-                {
-                    "type": "assignment",
-                    "message": f"You have {len(pending_assignments)} pending review assignments",
-                    "priority": "high" if len(pending_assignments) > 5 else "normal"
-                }
-            ]
+            "notifications": notifications
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get notifications: {str(e)}")
+
+def _sse(event_type: str, data: Any) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+
+@router.get("/notifications/stream")
+async def stream_review_notifications(
+    request: Request,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream assignment, review-completion and moderation events as Server-Sent Events"""
+    pending_assignments = await get_pending_assignments(current_user.id)
+    overdue_reviews = await get_overdue_assignments(current_user.id)
+    
+    async def event_stream():
+        async with get_broker().subscribe(user_channel(current_user.id), REVIEWERS_CHANNEL) as subscription:
+            yield _sse("snapshot", {
+                "pending_assignments": len(pending_assignments),
+                "overdue_reviews": len(overdue_reviews)
+            })
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(subscription.get(), timeout=STREAM_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _sse(message["type"], message)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
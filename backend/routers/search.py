@@ -6,6 +6,7 @@ from typing import List, Dict, Any # Import Dict, Any for search results
 from crud import article_crud
 from database import get_session
 from supabase_crud import search_articles_fts_supabase, suggest_article_titles_supabase
+from ratelimit.limiter import rate_limit
 
 router = APIRouter()
 
@@ -16,7 +17,7 @@ router = APIRouter()
 #     rank: float
 #     snippet: Optional[str] = None
 
-@router.get("/results", response_model=List[Dict[str, Any]]) # Using Dict for flexibility
+@router.get("/results", response_model=List[Dict[str, Any]], dependencies=[Depends(rate_limit("search"))]) # Using Dict for flexibility
 async def search_content(
     *,
     q: str = Query(..., min_length=1, description="Search query for full-text search") # Add validation
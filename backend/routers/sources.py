@@ -1,18 +1,22 @@
 # routers/sources.py
 from fastapi import APIRouter, HTTPException, Depends, Body
 from typing import List, Optional
-from models import Source, SourceCreate, SourceRead, SourceUpdate, Reference, ReferenceCreate, ReferenceRead, ReferenceUpdate, UserRead
+from models import Source, SourceCreate, SourceRead, SourceUpdate, Reference, ReferenceCreate, ReferenceRead, ReferenceUpdate, ReferenceListItem, UserRead
 from auth.dependencies import get_current_user
 from supabase_crud import (
     create_source_supabase, get_source_by_id_supabase, get_sources_by_article_supabase,
-    update_source_supabase, delete_source_supabase, create_reference_supabase,
-    get_references_by_article_supabase, update_reference_supabase, delete_reference_supabase,
-    renumber_references_supabase
+    update_source_supabase, delete_source_supabase, add_reference_supabase,
+    get_references_by_article_supabase, get_reference_by_id_supabase, update_reference_supabase,
+    delete_reference_supabase, replace_references_supabase
 )
 from datetime import datetime
 
 router = APIRouter()
 
+def _reference_read(ref: dict) -> ReferenceRead:
+    """Build a ReferenceRead from a reference row with its source embedded"""
+    return ReferenceRead(**{**ref, "source": SourceRead(**ref["source"])})
+
 # --- Source Endpoints ---
 @router.get("/", response_model=List[SourceRead])
 async def get_sources(
@@ -186,58 +190,23 @@ async def create_reference(
     reference: ReferenceCreate,
     current_user: UserRead = Depends(get_current_user)
 ):
-    """Create a new reference for an article"""
-    # Get the next reference number for this article
-    existing_refs = await get_references_by_article_supabase(article_id)
-    next_ref_number = len(existing_refs) + 1
-    
+    """Create a new reference for an article, numbered after its existing ones"""
     reference_data = {
-        "article_id": article_id,
         "source_id": reference.source_id,
-        "reference_number": next_ref_number,
         "context": reference.context,
         "page_number": reference.page_number,
         "section": reference.section,
-        "created_by": current_user.id,
-        "created_at": datetime.utcnow().isoformat()
+        "created_by": current_user.id
     }
     
-    created_reference = await create_reference_supabase(reference_data)
+    # The number is assigned under the article's row lock, so concurrent adds never collide
+    created_reference = await add_reference_supabase(article_id, reference_data)
     if not created_reference:
         raise HTTPException(status_code=500, detail="Failed to create reference")
-    
-    # Get the source data
-    source = await get_source_by_id_supabase(reference.source_id)
-    if not source:
+    if not created_reference.get("source"):
         raise HTTPException(status_code=404, detail="Source not found")
     
-    return ReferenceRead(
-        id=created_reference["id"],
-        article_id=created_reference["article_id"],
-        source_id=created_reference["source_id"],
-        reference_number=created_reference["reference_number"],
-        context=created_reference["context"],
-        page_number=created_reference["page_number"],
-        section=created_reference["section"],
-        created_at=created_reference["created_at"],
-        created_by=created_reference["created_by"],
-        source=SourceRead(
-            id=source["id"],
-            title=source["title"],
-            url=source["url"],
-            author=source["author"],
-            publication=source["publication"],
-            publication_date=source["publication_date"],
-            access_date=source["access_date"],
-            source_type=source["source_type"],
-            isbn=source["isbn"],
-            doi=source["doi"],
-            description=source["description"],
-            created_at=source["created_at"],
-            updated_at=source["updated_at"],
-            created_by=source["created_by"]
-        )
-    )
+    return _reference_read(created_reference)
 
 @router.get("/articles/{article_id}/references/", response_model=List[ReferenceRead])
 async def get_article_references(
@@ -246,39 +215,29 @@ async def get_article_references(
 ):
     """Get all references for an article"""
     references = await get_references_by_article_supabase(article_id)
+    return [_reference_read(ref) for ref in references]
+
+@router.put("/articles/{article_id}/references/", response_model=List[ReferenceRead])
+async def replace_article_references(
+    article_id: int,
+    references: List[ReferenceListItem],
+    current_user: UserRead = Depends(get_current_user)
+):
+    """
+    Replace an article's full reference list in one transaction.
+    Entries are numbered by their position; entries with the id of one of
+    the article's references update it, the others are added, and
+    references left out of the list are deleted.
+    """
+    replaced = await replace_references_supabase(
+        article_id,
+        [ref.model_dump() for ref in references],
+        current_user.id
+    )
+    if replaced is None:
+        raise HTTPException(status_code=500, detail="Failed to update references")
     
-    result = []
-    for ref in references:
-        source_data = ref.get("source", {})
-        result.append(ReferenceRead(
-            id=ref["id"],
-            article_id=ref["article_id"],
-            source_id=ref["source_id"],
-            reference_number=ref["reference_number"],
-            context=ref["context"],
-            page_number=ref["page_number"],
-            section=ref["section"],
-            created_at=ref["created_at"],
-            created_by=ref["created_by"],
-            source=SourceRead(
-                id=source_data["id"],
-                title=source_data["title"],
-                url=source_data["url"],
-                author=source_data["author"],
-                publication=source_data["publication"],
-                publication_date=source_data["publication_date"],
-                access_date=source_data["access_date"],
-                source_type=source_data["source_type"],
-                isbn=source_data["isbn"],
-                doi=source_data["doi"],
-                description=source_data["description"],
-                created_at=source_data["created_at"],
-                updated_at=source_data["updated_at"],
-                created_by=source_data["created_by"]
-            )
-        ))
-    
-    return result
+    return [_reference_read(ref) for ref in replaced]
 
 @router.put("/references/{reference_id}/", response_model=ReferenceRead)
 async def update_reference(
@@ -287,10 +246,6 @@ async def update_reference(
     current_user: UserRead = Depends(get_current_user)
 ):
     """Update a reference"""
-    # Get existing reference
-    existing_refs = await get_references_by_article_supabase(0)  # We need a different approach
-    # For now, we'll implement this later with a proper get_reference_by_id function
-    
     update_data = {}
     if reference_update.source_id is not None:
         update_data["source_id"] = reference_update.source_id
@@ -307,53 +262,26 @@ async def update_reference(
     if not updated_reference:
         raise HTTPException(status_code=500, detail="Failed to update reference")
     
-    # Get the source data
-    source = await get_source_by_id_supabase(updated_reference["source_id"])
-    if not source:
+    # Re-read with the source embedded
+    reference = await get_reference_by_id_supabase(reference_id)
+    if not reference or not reference.get("source"):
         raise HTTPException(status_code=404, detail="Source not found")
     
-    return ReferenceRead(
-        id=updated_reference["id"],
-        article_id=updated_reference["article_id"],
-        source_id=updated_reference["source_id"],
-        reference_number=updated_reference["reference_number"],
-        context=updated_reference["context"],
-        page_number=updated_reference["page_number"],
-        section=updated_reference["section"],
-        created_at=updated_reference["created_at"],
-        created_by=updated_reference["created_by"],
-        source=SourceRead(
-            id=source["id"],
-            title=source["title"],
-            url=source["url"],
-            author=source["author"],
-            publication=source["publication"],
-            publication_date=source["publication_date"],
-            access_date=source["access_date"],
-            source_type=source["source_type"],
-            isbn=source["isbn"],
-            doi=source["doi"],
-            description=source["description"],
-            created_at=source["created_at"],
-            updated_at=source["updated_at"],
-            created_by=source["created_by"]
-        )
-    )
+    return _reference_read(reference)
 
 @router.delete("/references/{reference_id}/")
 async def delete_reference(
     reference_id: int,
     current_user: UserRead = Depends(get_current_user)
 ):
-    """Delete a reference"""
-    # Get the reference to find the article_id
-    # For now, we'll implement this later with a proper get_reference_by_id function
+    """Delete a reference and renumber the remaining ones"""
+    existing_reference = await get_reference_by_id_supabase(reference_id)
+    if not existing_reference:
+        raise HTTPException(status_code=404, detail="Reference not found")
     
-    success = await delete_reference_supabase(reference_id)
-    if not success:
+    # Deletion and renumbering happen in one transaction
+    article_id = await delete_reference_supabase(reference_id)
+    if article_id is None:
         raise HTTPException(status_code=500, detail="Failed to delete reference")
     
-    # Renumber remaining references
-    # await renumber_references_supabase(article_id)
-    
     return {"message": "Reference deleted successfully"}
@@ -1,24 +1,26 @@
 # routers/video.py
 from fastapi import (
-    APIRouter, Depends, HTTPException, status, UploadFile, File
+    APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 )
 from fastapi.responses import StreamingResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
-from typing import List, Annotated 
+from typing import List, Annotated, Optional, Union
 
-from models import VideoMetadataSchema, VideoMetadataCreate 
+from models import VideoMetadataSchema, VideoMetadataCreate, PaginatedResponse
 from supabase_crud import (
     get_all_video_metadata_supabase, 
+    get_video_metadata_page_supabase, 
     get_video_metadata_by_id_supabase, 
     get_video_content_by_id_supabase,
     create_video_content_supabase,
     create_video_metadata_supabase
 )
 from datetime import datetime, timezone
+from ratelimit.limiter import rate_limit
 
 router = APIRouter()
 
-@router.post("/upload", status_code=status.HTTP_201_CREATED)
+@router.post("/upload", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("upload"))])
 async def upload_video(
     file: Annotated[UploadFile, File()],
 ):
@@ -75,11 +77,15 @@ async def stream_video(video_id: int):
     return StreamingResponse(iter([video_data]), headers=headers, media_type="video/mp4")
 
 
-@router.get("/", response_model=List[VideoMetadataSchema])
+@router.get("/", response_model=Union[PaginatedResponse, List[VideoMetadataSchema]])
 async def list_videos(
     skip: int = 0,
-    limit: int = 100
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="Cursor from pagination.next_cursor; send it empty for the first page of a cursor listing")
 ):
-    """Retrieves a list of video metadata entries."""
+    """Retrieves a list of video metadata entries; pass `cursor` for keyset pages."""
+    if cursor is not None:
+        videos, next_cursor = await get_video_metadata_page_supabase(limit=limit, cursor=cursor)
+        return PaginatedResponse.keyset([VideoMetadataSchema.model_validate(video) for video in videos], limit, next_cursor)
     videos = await get_all_video_metadata_supabase(skip=skip, limit=limit)
     return [VideoMetadataSchema.model_validate(video) for video in videos]
\ No newline at end of file
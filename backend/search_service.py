@@ -1,10 +1,14 @@
 # search_service.py
 import os
 from typing import List, Dict, Any, Optional
-from meilisearch import Client
-from meilisearch.index import Index
 import asyncio
 from supabase_client import supabase
+from tracing.tracer import traced
+from utils.pagination import keyset_page
+from utils.reference_parser import clean_reference_markup
+
+# Articles per page when rebuilding the whole index
+REINDEX_PAGE_SIZE = 200
 
 class MeiliSearchService:
     def __init__(self):
@@ -12,10 +16,18 @@ class MeiliSearchService:
         self.meili_url = os.getenv("MEILI_URL", "http://localhost:7700")
         self.meili_key = os.getenv("MEILI_MASTER_KEY", "masterKey")
         
-        # Initialize MeiliSearch client
-        self.client = Client(self.meili_url, self.meili_key)
+        self._client = None
         self.articles_index = "articles"
         self.books_index = "books"
+
+    @property
+    def client(self):
+        """MeiliSearch client, created on first use so importing this module stays cheap"""
+        if self._client is None:
+            from meilisearch import Client
+            # Search spans stay local: this client has no per-request headers to carry a traceparent
+            self._client = Client(self.meili_url, self.meili_key)
+        return self._client
         
     async def initialize_indexes(self):
         """Initialize MeiliSearch indexes with proper settings"""
@@ -105,47 +117,101 @@ class MeiliSearchService:
             print(f"❌ Error initializing MeiliSearch indexes: {e}")
             return False
     
+    @traced("search index_articles", kind="client", **{"search.system": "meilisearch"})
     async def index_articles(self):
-        """Index all articles from Supabase to MeiliSearch"""
+        """Index all articles from Supabase to MeiliSearch, with their current revision text"""
         try:
-            # Get all articles with simplified query
-            result = supabase.table("article").select("id, title, created_at, updated_at").execute()
+            articles_index = self.client.index(self.articles_index)
+            indexed = 0
+            cursor = None
+            while True:
+                # One page of articles and one bulk revision lookup per round trip
+                query = supabase.table("article").select("id, title, created_at, updated_at, current_revision_id")
+                articles, cursor = keyset_page(query, REINDEX_PAGE_SIZE, cursor)
+                self._attach_content(articles)
+                if articles:
+                    articles_index.add_documents([self._article_document(article) for article in articles])
+                    indexed += len(articles)
+                if not cursor:
+                    break
             
-            articles = result.data or []
-            if not articles:
+            if not indexed:
                 print("No articles found to index")
                 return False
             
-            # Transform articles for MeiliSearch
-            documents = []
-            for article in articles:
-                title = article.get('title', '').replace('_', ' ')
-                
-                # Create searchable document with basic info
-                doc = {
-                    'id': article['id'],
-                    'title': title,
-                    'content': f"Article about {title}",  # Placeholder content
-                    'summary': f"Learn about {title} in this comprehensive article.",
-                    'author': 'Afropedia Community',
-                    'created_at': article.get('created_at'),
-                    'updated_at': article.get('updated_at'),
-                    'category': 'article',
-                    'tags': self._extract_tags(title, '')
-                }
-                documents.append(doc)
+            print(f"✅ Indexed {indexed} articles to MeiliSearch")
+            return True
             
-            # Index documents
+        except Exception as e:
+            print(f"❌ Error indexing articles: {e}")
+            return False
+    
+    def _attach_content(self, articles: List[Dict[str, Any]]) -> None:
+        """Set `content` on article rows from their current revisions in one query"""
+        revision_ids = [article["current_revision_id"] for article in articles if article.get("current_revision_id")]
+        if not revision_ids:
+            return
+        result = supabase.table("revision").select("id, content").in_("id", revision_ids).execute()
+        contents = {revision["id"]: revision["content"] for revision in result.data or []}
+        for article in articles:
+            if article.get("current_revision_id") in contents:
+                article["content"] = contents[article["current_revision_id"]]
+    
+    @traced("search index_article", kind="client", **{"search.system": "meilisearch"})
+    async def index_article(self, article_id: int) -> bool:
+        """Index (or re-index) a single article from Supabase to MeiliSearch"""
+        try:
+            result = supabase.table("article").select("id, title, created_at, updated_at, current_revision_id").eq("id", article_id).execute()
             articles_index = self.client.index(self.articles_index)
-            articles_index.add_documents(documents)
             
-            print(f"✅ Indexed {len(documents)} articles to MeiliSearch")
+            if not result.data:
+                # Article no longer exists, drop it from the index
+                articles_index.delete_document(article_id)
+                return True
+            
+            article = result.data[0]
+            self._attach_content([article])
+            
+            articles_index.add_documents([self._article_document(article)])
             return True
             
         except Exception as e:
-            print(f"❌ Error indexing articles: {e}")
+            print(f"❌ Error indexing article {article_id}: {e}")
             return False
     
+    @traced("search index_article_batch", kind="client", **{"search.system": "meilisearch"})
+    async def index_article_batch(self, articles: List[Dict[str, Any]]) -> bool:
+        """Index a batch of article rows (id, title, created_at, updated_at, optionally content and current_revision_id) in one request"""
+        try:
+            if articles:
+                self.client.index(self.articles_index).add_documents([self._article_document(article) for article in articles])
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error indexing article batch: {e}")
+            return False
+    
+    def _article_document(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """Create a searchable document for an article row, with its text when the row carries content"""
+        title = article.get('title', '').replace('_', ' ')
+        text = ''
+        if article.get('content'):
+            # Reference markup is noise to search; the parse is shared with validation through the revision cache
+            text = clean_reference_markup(article['content'], article.get('current_revision_id'))
+        
+        return {
+            'id': article['id'],
+            'title': title,
+            'content': text or f"Article about {title}",  # Placeholder when the revision text was not loaded
+            'summary': f"Learn about {title} in this comprehensive article.",
+            'author': 'Afropedia Community',
+            'created_at': article.get('created_at'),
+            'updated_at': article.get('updated_at'),
+            'category': 'article',
+            'tags': self._extract_tags(title, text)
+        }
+    
+    @traced("search index_books", kind="client", **{"search.system": "meilisearch"})
     async def index_books(self):
         """Index all books from Supabase to MeiliSearch"""
         try:
@@ -204,6 +270,7 @@ class MeiliSearchService:
         
         return found_tags[:10]  # Limit to 10 tags
     
+    @traced("search articles", kind="client", **{"search.system": "meilisearch"})
     async def search_articles(self, query: str, limit: int = 20, filters: Optional[Dict] = None) -> Dict[str, Any]:
         """Search articles using MeiliSearch"""
         try:
@@ -233,6 +300,7 @@ class MeiliSearchService:
             print(f"❌ Error searching articles: {e}")
             return {'hits': [], 'totalHits': 0, 'query': query, 'processingTimeMs': 0}
     
+    @traced("search books", kind="client", **{"search.system": "meilisearch"})
     async def search_books(self, query: str, limit: int = 20, filters: Optional[Dict] = None) -> Dict[str, Any]:
         """Search books using MeiliSearch"""
         try:
@@ -262,6 +330,7 @@ class MeiliSearchService:
             print(f"❌ Error searching books: {e}")
             return {'hits': [], 'totalHits': 0, 'query': query, 'processingTimeMs': 0}
     
+    @traced("search suggestions", kind="client", **{"search.system": "meilisearch"})
     async def get_suggestions(self, query: str, limit: int = 10) -> List[str]:
         """Get search suggestions based on query"""
         try:
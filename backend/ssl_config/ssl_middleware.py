@@ -0,0 +1,120 @@
+# ssl/ssl_middleware.py
+from starlette.datastructures import URL
+from starlette.responses import RedirectResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import logging
+
+logger = logging.getLogger("afropedia.ssl")
+
+def _forwarded_proto(scope: Scope) -> str:
+    for name, value in scope.get("headers", []):
+        if name == b"x-forwarded-proto":
+            return value.decode("latin-1").lower()
+    return ""
+
+def _is_https(scope: Scope) -> bool:
+    return scope.get("scheme") == "https" or _forwarded_proto(scope) == "https"
+
+class HTTPSRedirectMiddleware:
+    """Pure ASGI middleware to redirect HTTP requests to HTTPS in production."""
+
+    def __init__(self, app: ASGIApp, enabled: bool = True, permanent: bool = True):
+        self.app = app
+        self.enabled = enabled
+        self.status_code = 301 if permanent else 302
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Already HTTPS, directly or behind a reverse proxy
+        if not self.enabled or scope["type"] != "http" or _is_https(scope):
+            await self.app(scope, receive, send)
+            return
+
+        # Redirect to HTTPS
+        url = URL(scope=scope)
+        https_url = url.replace(scheme="https")
+        client = scope.get("client")
+
+        logger.info(
+            f"Redirecting HTTP to HTTPS: {url} -> {https_url}",
+            extra={
+                "original_url": str(url),
+                "redirect_url": str(https_url),
+                "client_ip": client[0] if client else "unknown",
+            }
+        )
+
+        response = RedirectResponse(url=str(https_url), status_code=self.status_code)
+        await response(scope, receive, send)
+
+class SecurityHeadersMiddleware:
+    """Pure ASGI middleware to add security headers for HTTPS and general security.
+
+    The header list is encoded once at startup and appended to the
+    response start message, so the body is never touched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        hsts_max_age: int = 31536000,  # 1 year
+        hsts_include_subdomains: bool = True,
+        hsts_preload: bool = True,
+        content_type_nosniff: bool = True,
+        frame_options: str = "DENY",
+        xss_protection: bool = True,
+        referrer_policy: str = "strict-origin-when-cross-origin",
+        csp_policy: str = None
+    ):
+        self.app = app
+        self.hsts_max_age = hsts_max_age
+        self.hsts_include_subdomains = hsts_include_subdomains
+        self.hsts_preload = hsts_preload
+        self.content_type_nosniff = content_type_nosniff
+        self.frame_options = frame_options
+        self.xss_protection = xss_protection
+        self.referrer_policy = referrer_policy
+        self.csp_policy = csp_policy or "default-src 'self'; script-src 'self' 'unsafe-inline'; style-src 'self' 'unsafe-inline';"
+
+        hsts_value = f"max-age={self.hsts_max_age}"
+        if self.hsts_include_subdomains:
+            hsts_value += "; includeSubDomains"
+        if self.hsts_preload:
+            hsts_value += "; preload"
+
+        headers = {}
+        if self.content_type_nosniff:
+            headers["x-content-type-options"] = "nosniff"
+        if self.frame_options:
+            headers["x-frame-options"] = self.frame_options
+        if self.xss_protection:
+            headers["x-xss-protection"] = "1; mode=block"
+        if self.referrer_policy:
+            headers["referrer-policy"] = self.referrer_policy
+        if self.csp_policy:
+            headers["content-security-policy"] = self.csp_policy
+
+        # Add additional security headers
+        headers["x-permitted-cross-domain-policies"] = "none"
+        headers["x-download-options"] = "noopen"
+        headers["x-dns-prefetch-control"] = "off"
+
+        self.headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in headers.items()]
+        # Only sent for HTTPS requests
+        self.hsts_header = (b"strict-transport-security", hsts_value.encode("latin-1"))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        added = self.headers + [self.hsts_header] if _is_https(scope) else self.headers
+        names = {name for name, _ in added}
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Security headers replace any the handler set, as before
+                headers = [(name, value) for name, value in message.get("headers", []) if name.lower() not in names]
+                message["headers"] = headers + added
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
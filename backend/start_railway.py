@@ -1,56 +1,122 @@
 #!/usr/bin/env python3
 """
-Railway startup script for Afropedia Backend
-Handles PORT environment variable and other Railway-specific configurations
+Production startup script for Afropedia Backend
+Handles PORT and worker sizing, then runs uvicorn in-process so SIGTERM
+reaches the server directly and in-flight requests are drained
 """
 
+import importlib.util
+import math
 import os
 import sys
-import subprocess
 from pathlib import Path
 
+def available_cpus() -> int:
+    """CPUs this process may actually use (affinity mask and cgroup quota)"""
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+
+    # Containers often see every host core but are throttled to a cgroup quota
+    try:
+        quota, period = Path("/sys/fs/cgroup/cpu.max").read_text().split()
+        if quota != "max":
+            cpus = min(cpus, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cpus)
+
+def shared_state_configured() -> bool:
+    """Whether SSE notifications and rate-limit budgets are shared between workers"""
+    from events.pubsub import is_shared_url
+    try:
+        from config import settings
+        urls = (settings.event_broker_url, settings.rate_limit_storage_url)
+    except Exception:
+        urls = (os.getenv("EVENT_BROKER_URL", "memory://"), os.getenv("RATE_LIMIT_STORAGE_URL", "memory://"))
+    return all(is_shared_url(url) for url in urls)
+
+def worker_count() -> int:
+    """One async worker per usable core, unless WEB_CONCURRENCY says otherwise.
+
+    Without a Redis event broker and rate-limit store every worker keeps its
+    own SSE subscribers and budgets, so sizing from CPUs falls back to one.
+    """
+    shared = shared_state_configured()
+    configured = os.getenv("WEB_CONCURRENCY")
+    if configured:
+        try:
+            workers = max(1, int(configured))
+            if workers > 1 and not shared:
+                print("=" * 72)
+                print(f"WARNING: WEB_CONCURRENCY={workers} without EVENT_BROKER_URL and RATE_LIMIT_STORAGE_URL on Redis.")
+                print("SSE clients will miss notifications published by other workers and")
+                print(f"every rate limit is enforced per worker ({workers}x the configured budget).")
+                print("=" * 72)
+            return workers
+        except ValueError:
+            print(f"Warning: Invalid WEB_CONCURRENCY value '{configured}', sizing from CPUs")
+    if not shared:
+        print("Using 1 worker: set EVENT_BROKER_URL and RATE_LIMIT_STORAGE_URL to redis:// URLs to scale out")
+        return 1
+    return available_cpus()
+
 def main():
-    """Start the FastAPI application with Railway-specific configuration."""
-    
+    """Start the FastAPI application with production configuration."""
+
     # Get port from Railway environment variable, default to 8000
     port = os.getenv("PORT", "8000")
-    
+
     # Ensure port is an integer
     try:
         port = int(port)
     except ValueError:
         print(f"Warning: Invalid PORT value '{port}', using default 8000")
         port = 8000
-    
+
     # Set other Railway-specific environment variables
     os.environ.setdefault("ENVIRONMENT", "production")
     os.environ.setdefault("LOG_LEVEL", "INFO")
     os.environ.setdefault("LOG_FORMAT", "json")
-    
+
     # Ensure logs directory exists
     logs_dir = Path("logs")
     logs_dir.mkdir(exist_ok=True)
-    
+
+    workers = worker_count()
+    if workers > 1:
+        # Workers append to one log file; size rotation in each of them would clobber the others
+        os.environ.setdefault("LOG_ROTATION", "external")
+        # Each worker keeps its own metrics; they meet in this directory at scrape time
+        metrics_dir = Path(os.environ.setdefault("METRICS_MULTIPROCESS_DIR", "/tmp/afropedia-metrics"))
+        metrics_dir.mkdir(parents=True, exist_ok=True)
+        for stale in metrics_dir.glob("metrics-*.json"):
+            stale.unlink(missing_ok=True)
+    # uvicorn[standard] ships both; fall back to the pure-Python versions if they are missing
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    graceful_timeout = int(os.getenv("GRACEFUL_SHUTDOWN_SECONDS", "30"))
+
     print(f"Starting Afropedia Backend on port {port}")
     print(f"Environment: {os.getenv('ENVIRONMENT')}")
     print(f"Log level: {os.getenv('LOG_LEVEL')}")
-    
-    # Start uvicorn with proper configuration
-    cmd = [
-        sys.executable, "-m", "uvicorn",
-        "main:app",
-        "--host", "0.0.0.0",
-        "--port", str(port),
-        "--workers", "1",  # Railway free tier works best with 1 worker
-        "--log-level", "info",
-        "--access-log"
-    ]
-    
+    print(f"Workers: {workers} (loop={loop}, http={http}, graceful shutdown {graceful_timeout}s)")
+
+    import uvicorn
+
     try:
-        subprocess.run(cmd, check=True)
-    except subprocess.CalledProcessError as e:
-        print(f"Error starting application: {e}")
-        sys.exit(1)
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=port,
+            workers=workers,
+            loop=loop,
+            http=http,
+            log_level="info",
+            access_log=True,
+            timeout_graceful_shutdown=graceful_timeout,
+        )
     except KeyboardInterrupt:
         print("Application stopped by user")
         sys.exit(0)
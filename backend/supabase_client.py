@@ -1,9 +1,13 @@
-from supabase import create_client, Client
 import os
 import ssl
+import threading
 import certifi
+from typing import TYPE_CHECKING
 from dotenv import load_dotenv
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 # Load environment variables first
 load_dotenv()
 
@@ -15,6 +19,9 @@ os.environ['CURL_CA_BUNDLE'] = certifi.where()
 # Handle SSL certificate verification
 def create_supabase_client():
     """Create Supabase client with proper SSL certificate handling"""
+    # Imported here: the supabase package pulls in httpx, gotrue, postgrest, storage and realtime
+    from supabase import create_client
+
     supabase_url = os.getenv("SUPABASE_URL")
     supabase_key = os.getenv("SUPABASE_KEY")
     
@@ -56,5 +63,39 @@ def create_supabase_client():
         else:
             raise e
 
-# Initialize Supabase client
-supabase: Client = create_supabase_client()
+_client = None
+_client_lock = threading.Lock()
+
+def get_supabase_client() -> "Client":
+    """Return the shared Supabase client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = create_supabase_client()
+    return _client
+
+class LazySupabaseClient:
+    """Stands in for the client so importing this module stays cheap.
+
+    Attribute access (`supabase.table(...)`, `supabase.rpc(...)`) builds the
+    real client on first use and delegates to it from then on. Table and
+    RPC queries go through utils.query_tracing so each request's database
+    work is timed and counted.
+    """
+
+    def table(self, name: str):
+        from utils.query_tracing import traced_table
+        return traced_table(get_supabase_client(), name)
+
+    from_ = table
+
+    def rpc(self, function: str, params: dict = None, **kwargs):
+        from utils.query_tracing import traced_rpc
+        return traced_rpc(get_supabase_client(), function, params, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(get_supabase_client(), name)
+
+# Shared Supabase client, created lazily
+supabase: "Client" = LazySupabaseClient()
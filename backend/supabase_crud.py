@@ -4,8 +4,10 @@ Fixed Supabase CRUD with proper revision loading
 """
 
 from supabase_client import supabase
+from tracing.tracer import traced
 from models import Article, ArticleCreate, ArticleRead, Book, BookCreate, BookRead, User, Revision
-from typing import List, Optional
+from utils.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_page
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
 async def get_article_by_title_supabase(title: str) -> Optional[Article]:
@@ -65,24 +67,77 @@ async def get_article_by_title_supabase(title: str) -> Optional[Article]:
         print(f"Error getting article by title: {e}")
         return None
 
+def _article_read(article_data: dict) -> ArticleRead:
+    return ArticleRead(
+        id=article_data["id"],
+        title=article_data["title"],
+        created_at=article_data["created_at"],
+        updated_at=article_data["updated_at"]
+    )
+
 # Keep other functions the same
 async def get_articles_supabase(skip: int = 0, limit: int = 100) -> List[ArticleRead]:
-    """Get articles from Supabase"""
+    """Get articles from Supabase (offset paging; prefer get_articles_page_supabase for deep pages)"""
     try:
-        result = supabase.table("article").select("*").range(skip, skip + limit - 1).execute()
-        articles = []
-        for article_data in result.data:
-            articles.append(ArticleRead(
-                id=article_data["id"],
-                title=article_data["title"],
-                created_at=article_data["created_at"],
-                updated_at=article_data["updated_at"]
-            ))
-        return articles
+        result = supabase.table("article").select("*").order("id").range(skip, skip + limit - 1).execute()
+        return [_article_read(article_data) for article_data in result.data]
     except Exception as e:
         print(f"Error getting articles: {e}")
         return []
 
+async def get_articles_page_supabase(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "id"
+) -> Tuple[List[ArticleRead], Optional[str]]:
+    """Get one keyset page of articles from Supabase, with the cursor for the next page"""
+    try:
+        rows, next_cursor = keyset_page(supabase.table("article").select("*"), limit, cursor, sort)
+        return [_article_read(article_data) for article_data in rows], next_cursor
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"Error getting articles page: {e}")
+        return [], None
+
+async def get_user_articles_page_supabase(
+    user_id: int,
+    scope: str = "authored",
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    offset: int = 0
+) -> Tuple[List[dict], Optional[str]]:
+    """Get a user's articles, most recently updated first, in one indexed query.
+
+    `scope` is "authored" (the current revision is theirs) or "contributed"
+    (any revision is theirs). Rows carry the user's revision count and
+    latest contribution time.
+    """
+    try:
+        params = {"p_user_id": user_id, "p_scope": scope, "p_limit": limit + 1, "p_offset": offset}
+        if cursor:
+            params["p_after_updated_at"], params["p_after_id"] = decode_cursor(cursor, "updated_at")
+        result = supabase.rpc("get_user_articles", params).execute()
+        rows = result.data or []
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        return rows, encode_cursor("updated_at", rows[-1]["updated_at"], rows[-1]["id"])
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"Error getting user articles: {e}")
+        return [], None
+
+async def count_user_articles_supabase(user_id: int) -> Dict[str, int]:
+    """Count a user's authored articles, contributed articles and revisions"""
+    try:
+        result = supabase.rpc("count_user_articles", {"p_user_id": user_id}).execute()
+        return result.data or {"authored": 0, "contributed": 0, "revisions": 0}
+    except Exception as e:
+        print(f"Error counting user articles: {e}")
+        return {"authored": 0, "contributed": 0, "revisions": 0}
+
 async def create_article_supabase(article_data: ArticleCreate, user_id: int) -> Optional[Article]:
     """Create article in Supabase"""
     try:
@@ -156,29 +211,44 @@ async def create_article_supabase(article_data: ArticleCreate, user_id: int) ->
         print(f"Error creating article: {e}")
         return None
 
+def _book_read(book_data: dict) -> BookRead:
+    return BookRead(
+        id=book_data["id"],
+        title=book_data["title"],
+        author=book_data["author"],
+        published_date=book_data.get("published_date"),
+        isbn=book_data.get("isbn"),
+        genre=book_data.get("genre"),
+        summary=book_data.get("summary"),
+        cover_image=book_data.get("cover_image"),
+        created_at=book_data["created_at"],
+        updated_at=book_data["updated_at"]
+    )
+
 async def get_books_supabase(skip: int = 0, limit: int = 100) -> List[BookRead]:
-    """Get books from Supabase"""
+    """Get books from Supabase (offset paging; prefer get_books_page_supabase for deep pages)"""
     try:
-        result = supabase.table("book").select("*").range(skip, skip + limit - 1).execute()
-        books = []
-        for book_data in result.data:
-            books.append(BookRead(
-                id=book_data["id"],
-                title=book_data["title"],
-                author=book_data["author"],
-                published_date=book_data.get("published_date"),
-                isbn=book_data.get("isbn"),
-                genre=book_data.get("genre"),
-                summary=book_data.get("summary"),
-                cover_image=book_data.get("cover_image"),
-                created_at=book_data["created_at"],
-                updated_at=book_data["updated_at"]
-            ))
-        return books
+        result = supabase.table("book").select("*").order("id").range(skip, skip + limit - 1).execute()
+        return [_book_read(book_data) for book_data in result.data]
     except Exception as e:
         print(f"Error getting books: {e}")
         return []
 
+async def get_books_page_supabase(
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    sort: str = "id"
+) -> Tuple[List[BookRead], Optional[str]]:
+    """Get one keyset page of books from Supabase, with the cursor for the next page"""
+    try:
+        rows, next_cursor = keyset_page(supabase.table("book").select("*"), limit, cursor, sort)
+        return [_book_read(book_data) for book_data in rows], next_cursor
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"Error getting books page: {e}")
+        return [], None
+
 async def create_book_supabase(book_data: BookCreate) -> Optional[Book]:
     """Create book in Supabase"""
     try:
@@ -260,12 +330,22 @@ async def delete_book_supabase(book_id: int) -> bool:
 async def get_all_music_metadata_supabase(skip: int = 0, limit: int = 100):
     """Get all music metadata from Supabase"""
     try:
-        result = supabase.table("music_metadata").select("*").range(skip, skip + limit - 1).execute()
+        result = supabase.table("music_metadata").select("*").order("id").range(skip, skip + limit - 1).execute()
         return result.data or []
     except Exception as e:
         print(f"Error getting music metadata: {e}")
         return []
 
+async def get_music_metadata_page_supabase(limit: int = 100, cursor: Optional[str] = None):
+    """Get one keyset page of music metadata from Supabase, with the cursor for the next page"""
+    try:
+        return keyset_page(supabase.table("music_metadata").select("*"), limit, cursor)
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"Error getting music metadata page: {e}")
+        return [], None
+
 async def get_music_metadata_by_id_supabase(music_id: int):
     """Get music metadata by ID from Supabase"""
     try:
@@ -277,6 +357,7 @@ async def get_music_metadata_by_id_supabase(music_id: int):
         print(f"Error getting music metadata by ID: {e}")
         return None
 
+@traced("media read music_content")
 async def get_music_content_by_id_supabase(content_id: int):
     """Get music content by content ID from Supabase"""
     try:
@@ -380,12 +461,22 @@ async def create_video_metadata_supabase(content_id: int, filename: str, timesta
 async def get_all_video_metadata_supabase(skip: int = 0, limit: int = 100):
     """Get all video metadata from Supabase"""
     try:
-        result = supabase.table("videos").select("*").range(skip, skip + limit - 1).execute()
+        result = supabase.table("videos").select("*").order("id").range(skip, skip + limit - 1).execute()
         return result.data or []
     except Exception as e:
         print(f"Error getting video metadata: {e}")
         return []
 
+async def get_video_metadata_page_supabase(limit: int = 100, cursor: Optional[str] = None):
+    """Get one keyset page of video metadata from Supabase, with the cursor for the next page"""
+    try:
+        return keyset_page(supabase.table("videos").select("*"), limit, cursor)
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"Error getting video metadata page: {e}")
+        return [], None
+
 async def get_video_metadata_by_id_supabase(video_id: int):
     """Get video metadata by ID from Supabase"""
     try:
@@ -397,6 +488,7 @@ async def get_video_metadata_by_id_supabase(video_id: int):
         print(f"Error getting video metadata by ID: {e}")
         return None
 
+@traced("media read video_content")
 async def get_video_content_by_id_supabase(content_id: int):
     """Get video content by content ID from Supabase"""
     try:
@@ -520,6 +612,7 @@ async def get_image_metadata_by_id_supabase(metadata_id: int):
         print(f"Error getting image metadata: {e}")
         return None
 
+@traced("media read image_content")
 async def get_image_content_by_metadata_id_supabase(metadata_id: int):
     """Get image content by metadata ID from Supabase"""
     try:
@@ -562,12 +655,22 @@ async def get_image_content_by_metadata_id_supabase(metadata_id: int):
 async def get_all_image_metadata_supabase(skip: int = 0, limit: int = 50):
     """Get all image metadata from Supabase"""
     try:
-        result = supabase.table("image_metadata").select("*").range(skip, skip + limit - 1).execute()
+        result = supabase.table("image_metadata").select("*").order("id").range(skip, skip + limit - 1).execute()
         return result.data or []
     except Exception as e:
         print(f"Error getting all image metadata: {e}")
         return []
 
+async def get_image_metadata_page_supabase(limit: int = 50, cursor: Optional[str] = None):
+    """Get one keyset page of image metadata from Supabase, with the cursor for the next page"""
+    try:
+        return keyset_page(supabase.table("image_metadata").select("*"), limit, cursor)
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        print(f"Error getting image metadata page: {e}")
+        return [], None
+
 async def delete_image_supabase(metadata_id: int):
     """Delete image and its metadata from Supabase"""
     try:
@@ -1008,13 +1111,9 @@ async def update_source_supabase(source_id: int, source_data: dict) -> Optional[
         return None
 
 async def delete_source_supabase(source_id: int) -> bool:
-    """Delete a source"""
+    """Delete a source with its references, renumbering the articles that cited it"""
     try:
-        # First delete all references to this source
-        supabase.table("reference").delete().eq("source_id", source_id).execute()
-        
-        # Then delete the source
-        result = supabase.table("source").delete().eq("id", source_id).execute()
+        supabase.rpc("delete_source_and_renumber", {"p_source_id": source_id}).execute()
         return True
     except Exception as e:
         print(f"Error deleting source: {e}")
@@ -1032,6 +1131,46 @@ async def create_reference_supabase(reference_data: dict) -> Optional[dict]:
         print(f"Error creating reference: {e}")
         return None
 
+async def add_reference_supabase(article_id: int, reference_data: dict) -> Optional[dict]:
+    """Append a reference to an article with the next free number; returns it with its source"""
+    try:
+        result = supabase.rpc("add_article_reference", {
+            "p_article_id": article_id,
+            "p_source_id": reference_data["source_id"],
+            "p_context": reference_data.get("context"),
+            "p_page_number": reference_data.get("page_number"),
+            "p_section": reference_data.get("section"),
+            "p_created_by": reference_data.get("created_by")
+        }).execute()
+        return result.data or None
+    except Exception as e:
+        print(f"Error adding reference: {e}")
+        return None
+
+async def replace_references_supabase(article_id: int, references: List[dict], user_id: int) -> Optional[List[dict]]:
+    """Replace an article's full reference list in one transaction; returns the new list with sources"""
+    try:
+        result = supabase.rpc("replace_article_references", {
+            "p_article_id": article_id,
+            "p_references": references,
+            "p_user_id": user_id
+        }).execute()
+        return result.data or []
+    except Exception as e:
+        print(f"Error replacing references: {e}")
+        return None
+
+async def get_reference_by_id_supabase(reference_id: int) -> Optional[dict]:
+    """Get a reference by ID with its source"""
+    try:
+        result = supabase.table("reference").select("*, source(*)").eq("id", reference_id).execute()
+        if result.data:
+            return result.data[0]
+        return None
+    except Exception as e:
+        print(f"Error getting reference: {e}")
+        return None
+
 async def get_references_by_article_supabase(article_id: int) -> List[dict]:
     """Get all references for an article"""
     try:
@@ -1054,27 +1193,19 @@ async def update_reference_supabase(reference_id: int, reference_data: dict) ->
         print(f"Error updating reference: {e}")
         return None
 
-async def delete_reference_supabase(reference_id: int) -> bool:
-    """Delete a reference"""
+async def delete_reference_supabase(reference_id: int) -> Optional[int]:
+    """Delete a reference and renumber the rest of its article; returns the article ID"""
     try:
-        result = supabase.table("reference").delete().eq("id", reference_id).execute()
-        return True
+        result = supabase.rpc("delete_article_reference", {"p_reference_id": reference_id}).execute()
+        return result.data
     except Exception as e:
         print(f"Error deleting reference: {e}")
-        return False
+        return None
 
 async def renumber_references_supabase(article_id: int) -> bool:
-    """Renumber references for an article after deletion"""
+    """Close the gaps in an article's reference numbers, keeping their order"""
     try:
-        # Get all references for the article ordered by creation time
-        result = supabase.table("reference").select("*").eq("article_id", article_id).order("created_at").execute()
-        if not result.data:
-            return True
-            
-        # Renumber them sequentially
-        for i, ref in enumerate(result.data, 1):
-            supabase.table("reference").update({"reference_number": i}).eq("id", ref["id"]).execute()
-        
+        supabase.rpc("renumber_article_references", {"p_article_id": article_id}).execute()
         return True
     except Exception as e:
         print(f"Error renumbering references: {e}")
@@ -0,0 +1,83 @@
+"""
+Title Catalog - in-memory article and book titles for fuzzy search and suggestions
+"""
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Tuple, Dict, Any
+from supabase_client import supabase
+from events.handlers import cache_invalidation_handler
+from config import settings
+
+logger = logging.getLogger("afropedia.search")
+
+@dataclass(frozen=True)
+class TitleSnapshot:
+    """One consistent load of the titles; replaced whole, never modified"""
+    articles: Tuple[Dict[str, Any], ...] = ()
+    titles: Tuple[str, ...] = ()
+    lowered_titles: Tuple[str, ...] = ()
+
+class TitleCatalog:
+    """Snapshot of article and book titles, rebuilt at most every `ttl_seconds`.
+
+    Enhanced search scores every title on each query; keeping the titles in
+    memory (with lower-cased copies precomputed) replaces a full table scan
+    per request. Article changes published through the event outbox mark
+    the snapshot stale so edits show up without waiting for the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0):
+        self.ttl_seconds = ttl_seconds
+        self.snapshot = TitleSnapshot()
+        self._loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    @property
+    def is_stale(self) -> bool:
+        return time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def invalidate(self) -> None:
+        self._loaded_at = 0.0
+
+    def _load(self) -> None:
+        article_rows = supabase.table("article").select("id, title, created_at, updated_at").execute().data or []
+        book_rows = supabase.table("book").select("title").execute().data or []
+
+        articles = []
+        for row in article_rows:
+            title = (row.get("title") or "").replace("_", " ")
+            articles.append({**row, "title": title, "title_lower": title.lower()})
+
+        titles = tuple([article["title"] for article in articles] + [row["title"] for row in book_rows if row.get("title")])
+        # A single assignment, so readers never pair titles from one load with another's
+        self.snapshot = TitleSnapshot(
+            articles=tuple(articles),
+            titles=titles,
+            lowered_titles=tuple(title.lower() for title in titles)
+        )
+        self._loaded_at = time.monotonic()
+
+    async def refresh(self, only_if_stale: bool = False) -> bool:
+        """Rebuild the snapshot; on failure the previous snapshot keeps serving"""
+        async with self._lock:
+            # Requests that queued behind a rebuild reuse its result
+            if only_if_stale and not self.is_stale:
+                return True
+            try:
+                await asyncio.to_thread(self._load)
+                return True
+            except Exception as e:
+                logger.error(f"Error loading title catalog: {e}")
+                return False
+
+    async def ensure_fresh(self) -> TitleSnapshot:
+        """The current snapshot, rebuilt first if it is stale"""
+        if self.is_stale:
+            await self.refresh(only_if_stale=True)
+        return self.snapshot
+
+title_catalog = TitleCatalog(ttl_seconds=settings.title_catalog_ttl_seconds)
+
+cache_invalidation_handler.register("article", lambda event: title_catalog.invalidate())
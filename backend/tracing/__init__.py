@@ -0,0 +1 @@
+# tracing/__init__.py
@@ -0,0 +1,115 @@
+# tracing/exporters.py
+import json
+import logging
+import queue
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("afropedia.tracing")
+
+class SpanExporter:
+    """Export contract: receives finished spans (OTLP-style dicts) in batches off the request path"""
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+class ConsoleSpanExporter(SpanExporter):
+    """One JSON line per span on stderr, for local debugging"""
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        for span in spans:
+            sys.stderr.write(json.dumps(span, default=str) + "\n")
+        sys.stderr.flush()
+
+class FileSpanExporter(SpanExporter):
+    """Appends one JSON line per span to a file"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    def export(self, spans: List[Dict[str, Any]]) -> None:
+        self._file.write("".join(json.dumps(span, default=str) + "\n" for span in spans))
+        self._file.flush()
+
+    def shutdown(self) -> None:
+        self._file.close()
+
+# Exporter factories by name; deployments can register their own (e.g. an OTLP shipper)
+EXPORTERS: Dict[str, Callable[..., SpanExporter]] = {
+    "console": lambda **options: ConsoleSpanExporter(),
+    "file": lambda path="logs/traces.jsonl", **options: FileSpanExporter(path),
+}
+
+def register_exporter(name: str, factory: Callable[..., SpanExporter]) -> None:
+    EXPORTERS[name] = factory
+
+def create_exporter(name: str, **options) -> Optional[SpanExporter]:
+    if not name or name == "none":
+        return None
+    if name not in EXPORTERS:
+        raise ValueError(f"Unknown span exporter '{name}' (available: {', '.join(sorted(EXPORTERS))})")
+    return EXPORTERS[name](**options)
+
+class BatchSpanProcessor:
+    """Queues finished spans and exports them from a background thread.
+
+    Like the logging queue, a full queue drops spans rather than making a
+    request wait on the exporter.
+    """
+
+    def __init__(self, exporter: SpanExporter, max_queue_size: int = 2048, batch_size: int = 256, flush_interval: float = 1.0):
+        self.exporter = exporter
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self.dropped = 0
+        self.exported = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def on_end(self, span: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _export(self, batch: List[Dict[str, Any]]) -> None:
+        try:
+            self.exporter.export(batch)
+            self.exported += len(batch)
+        except Exception as e:
+            logger.warning(f"Span export failed, dropping {len(batch)} spans: {e}")
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            while True:
+                batch = self._drain()
+                if not batch:
+                    break
+                self._export(batch)
+
+    def shutdown(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+        batch = self._drain()
+        while batch:
+            self._export(batch)
+            batch = self._drain()
+        self.exporter.shutdown()
@@ -0,0 +1,243 @@
+# tracing/tracer.py
+import contextvars
+import functools
+import inspect
+import os
+import random
+import re
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from tracing.exporters import BatchSpanProcessor, create_exporter
+
+# W3C trace context: version-traceid-parentid-flags
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+# (trace_id, span_id, sampled, tracestate) of a remote parent
+SpanContext = Tuple[str, str, bool, Optional[str]]
+
+def parse_traceparent(header: Optional[str], tracestate: Optional[str] = None) -> Optional[SpanContext]:
+    if not header:
+        return None
+    match = TRACEPARENT.match(header.strip().lower())
+    if not match or match.group(1) == "0" * 32 or match.group(2) == "0" * 16:
+        return None
+    # tracestate is opaque vendor data: passed on unchanged, dropped when the traceparent is invalid
+    return match.group(1), match.group(2), bool(int(match.group(3), 16) & 1), (tracestate or "").strip() or None
+
+class Span:
+    """A timed operation; fields follow the OpenTelemetry span model"""
+
+    __slots__ = ("tracer", "name", "kind", "trace_id", "span_id", "parent_span_id", "sampled", "tracestate",
+                 "attributes", "start_ns", "end_ns", "status", "status_message", "events")
+
+    def __init__(self, tracer: "Tracer", name: str, kind: str, trace_id: str, parent_span_id: Optional[str],
+                 sampled: bool, attributes: Optional[Dict[str, Any]] = None, tracestate: Optional[str] = None):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.sampled = sampled
+        self.tracestate = tracestate
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+        self.status = "UNSET"
+        self.status_message = None
+        self.events = []
+
+    @property
+    def traceparent(self) -> str:
+        """Header value for propagating this span to a downstream service"""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def set_status(self, status: str, message: Optional[str] = None) -> None:
+        self.status = status
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        self.events.append({
+            "name": "exception",
+            "time_unix_nano": time.time_ns(),
+            "attributes": {"exception.type": type(exc).__name__, "exception.message": str(exc)},
+        })
+        self.set_status("ERROR", str(exc))
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            if self.sampled:
+                self.tracer._export(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round((self.end_ns - self.start_ns) / 1e6, 3),
+            "status": {"code": self.status, "message": self.status_message},
+            "attributes": self.attributes,
+            "events": self.events,
+            "resource": self.tracer.resource,
+        }
+
+class _NoopSpan:
+    """Stands in when tracing is disabled so instrumented code needs no checks"""
+
+    trace_id = None
+    span_id = None
+    sampled = False
+    traceparent = None
+    tracestate = None
+
+    def set_attribute(self, key, value): pass
+    def update_name(self, name): pass
+    def set_status(self, status, message=None): pass
+    def record_exception(self, exc): pass
+    def end(self): pass
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("afropedia_current_span", default=None)
+
+def current_span():
+    return _current_span.get() or NOOP_SPAN
+
+def inject_trace_context(carrier: Dict[str, Any], span=None) -> None:
+    """Write W3C traceparent/tracestate for `span` (default: the current span) into a header or payload dict"""
+    span = span or current_span()
+    if span.traceparent is None:
+        return
+    carrier["traceparent"] = span.traceparent
+    if span.tracestate:
+        carrier["tracestate"] = span.tracestate
+
+class Tracer:
+    """Creates spans, tracks the active one per context and hands finished ones to the exporter.
+
+    Disabled by default; `configure` turns it on. New traces are sampled at
+    `sample_rate`; requests arriving with a traceparent keep the caller's
+    sampling decision.
+    """
+
+    def __init__(self, service_name: str = "afropedia-api"):
+        self.enabled = False
+        self.sample_rate = 1.0
+        self.resource = {"service.name": service_name}
+        self.processor: Optional[BatchSpanProcessor] = None
+
+    def configure(self, enabled: bool, exporter: str = "console", sample_rate: float = 1.0,
+                  service_name: Optional[str] = None, **exporter_options) -> None:
+        self.shutdown()
+        self.sample_rate = sample_rate
+        if service_name:
+            self.resource = {"service.name": service_name}
+        span_exporter = create_exporter(exporter, **exporter_options) if enabled else None
+        self.processor = BatchSpanProcessor(span_exporter) if span_exporter else None
+        self.enabled = self.processor is not None
+
+    def _export(self, span: Span) -> None:
+        if self.processor is not None:
+            self.processor.on_end(span.to_dict())
+
+    @contextmanager
+    def start_span(self, name: str, kind: str = "internal", attributes: Optional[Dict[str, Any]] = None,
+                   parent: Optional[SpanContext] = None) -> Iterator[Any]:
+        """Run the block inside a new span, a child of `parent` or of the current span"""
+        if not self.enabled:
+            yield NOOP_SPAN
+            return
+
+        if parent is not None:
+            trace_id, parent_span_id, sampled, tracestate = parent
+        else:
+            active = _current_span.get()
+            if active is not None:
+                trace_id, parent_span_id, sampled, tracestate = active.trace_id, active.span_id, active.sampled, active.tracestate
+            else:
+                trace_id, parent_span_id, sampled, tracestate = os.urandom(16).hex(), None, random.random() < self.sample_rate, None
+
+        span = Span(self, name, kind, trace_id, parent_span_id, sampled, attributes, tracestate)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+    def stats(self) -> Dict[str, Any]:
+        if self.processor is None:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "sample_rate": self.sample_rate,
+            "queued": self.processor.queue.qsize(),
+            "exported": self.processor.exported,
+            "dropped": self.processor.dropped,
+        }
+
+    def shutdown(self) -> None:
+        """Flush queued spans and stop the exporter thread"""
+        if self.processor is not None:
+            self.processor.shutdown()
+            self.processor = None
+        self.enabled = False
+
+# Global tracer; configured from settings at app startup
+tracer = Tracer()
+
+def traced(name: str, kind: str = "internal", **attributes):
+    """Decorator: run each call of a sync or async function in a span"""
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_span(name, kind, attributes):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with tracer.start_span(name, kind, attributes):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+class TracedEndpoint:
+    """Wraps a route's ASGI app in a span covering dependencies, the handler and serialization"""
+
+    def __init__(self, app, path: str, endpoint_name: str):
+        self.app = app
+        self.path = path
+        self.endpoint_name = endpoint_name
+
+    async def __call__(self, scope, receive, send):
+        with tracer.start_span(
+            f"handler {self.endpoint_name}",
+            attributes={"http.route": self.path, "code.function": self.endpoint_name}
+        ):
+            await self.app(scope, receive, send)
+
+def instrument_routes(routes) -> None:
+    """Give every endpoint route a handler span (call after the routers are included)"""
+    for route in routes:
+        endpoint = getattr(route, "endpoint", None)
+        if endpoint is None or not hasattr(route, "app") or isinstance(route.app, TracedEndpoint):
+            continue
+        route.app = TracedEndpoint(route.app, route.path, getattr(endpoint, "__name__", "endpoint"))
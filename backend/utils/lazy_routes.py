@@ -0,0 +1,41 @@
+# utils/lazy_routes.py
+import importlib
+import logging
+import threading
+import time
+
+from tracing.tracer import instrument_routes, tracer
+
+logger = logging.getLogger("afropedia.startup")
+
+class LazyRouterApp:
+    """ASGI app that imports a router module on its first request.
+
+    Mounted in place of `include_router` for rarely used routers so their
+    imports stay off the cold-start path. Routes served this way do not
+    appear in the OpenAPI schema.
+    """
+
+    def __init__(self, module_path: str, attribute: str = "router"):
+        self.module_path = module_path
+        self.attribute = attribute
+        self._router = None
+        self._lock = threading.Lock()
+
+    def load(self):
+        if self._router is None:
+            with self._lock:
+                if self._router is None:
+                    started = time.perf_counter()
+                    module = importlib.import_module(self.module_path)
+                    router = getattr(module, self.attribute)
+                    if tracer.enabled:
+                        instrument_routes(router.routes)
+                    self._router = router
+                    logger.info(
+                        f"Loaded {self.module_path} on demand in {(time.perf_counter() - started) * 1000:.1f}ms"
+                    )
+        return self._router
+
+    async def __call__(self, scope, receive, send):
+        await self.load()(scope, receive, send)
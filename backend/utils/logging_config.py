@@ -1,17 +1,38 @@
 # utils/logging_config.py
+import atexit
+import copy
 import logging
+import logging.handlers
+import queue
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
 import json
 from typing import Dict, Any, Optional
 
+try:
+    import orjson
+except ImportError:  # Optional: falls back to the standard library serializer
+    orjson = None
+
+def _dumps(payload: Dict[str, Any]) -> str:
+    if orjson is not None:
+        return orjson.dumps(payload, default=str).decode("utf-8")
+    return json.dumps(payload, default=str)
+
+# Extra attributes copied into JSON records when a log call provides them
+EXTRA_FIELDS = (
+    "user_id", "request_id", "endpoint", "method", "path", "status_code", "duration_ms",
+    "client_ip", "user_agent", "headers", "query_params", "pattern", "exception_type",
+    "db_queries", "db_time_ms", "trace_id", "table", "operation", "rows", "query_shape", "query_count",
+)
+
 class JSONFormatter(logging.Formatter):
     """Custom JSON formatter for structured logging."""
-    
+
     def format(self, record: logging.LogRecord) -> str:
         log_entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat().replace("+00:00", "Z"),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -19,78 +40,143 @@ class JSONFormatter(logging.Formatter):
             "function": record.funcName,
             "line": record.lineno,
         }
-        
-        # Add exception info if present
+
+        # Add exception info if present (pre-rendered when the record came through the queue)
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
-        
+        elif record.exc_text:
+            log_entry["exception"] = record.exc_text
+
         # Add extra fields if present
-        if hasattr(record, 'user_id'):
-            log_entry["user_id"] = record.user_id
-        if hasattr(record, 'request_id'):
-            log_entry["request_id"] = record.request_id
-        if hasattr(record, 'endpoint'):
-            log_entry["endpoint"] = record.endpoint
-        if hasattr(record, 'method'):
-            log_entry["method"] = record.method
-        if hasattr(record, 'status_code'):
-            log_entry["status_code"] = record.status_code
+        for field in EXTRA_FIELDS:
+            if field in record.__dict__:
+                log_entry[field] = record.__dict__[field]
         if hasattr(record, 'duration'):
             log_entry["duration_ms"] = record.duration
-            
-        return json.dumps(log_entry)
+
+        return _dumps(log_entry)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the listener falls behind"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._exception_formatter = logging.Formatter()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message and traceback now; formatting itself happens on the listener thread
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[DroppingQueueHandler] = None
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background listener"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+def get_logging_stats() -> Dict[str, Any]:
+    if _queue_handler is None:
+        return {"queued": 0, "dropped": 0}
+    return {"queued": _queue_handler.queue.qsize(), "dropped": _queue_handler.dropped}
 
 def setup_logging(
     log_level: str = "INFO",
     log_file: Optional[str] = None,
-    enable_json: bool = True
+    enable_json: bool = True,
+    queue_size: int = 10000,
+    max_bytes: int = 10 * 1024 * 1024,
+    backup_count: int = 5,
+    rotate: bool = True
 ) -> None:
-    """Configure application logging."""
-    
+    """Configure application logging.
+
+    Log calls only enqueue the record; a background listener thread formats
+    it and writes to stdout and the log file, so request handlers never wait
+    on serialization or disk I/O.
+
+    With `rotate` the file is rotated by size. That is only safe for a single
+    process: several workers sharing one file would each rotate it and clobber
+    each other's output. Multi-worker deployments pass rotate=False, which
+    appends through a WatchedFileHandler and leaves rotation to logrotate or
+    the platform (the handler reopens the file once it has been moved).
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
     # Create logs directory if it doesn't exist
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    # Configure root logger
-    root_logger = logging.getLogger()
-    root_logger.setLevel(getattr(logging, log_level.upper()))
-    
-    # Clear existing handlers
-    root_logger.handlers.clear()
-    
-    # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(getattr(logging, log_level.upper()))
-    
+
+    level = getattr(logging, log_level.upper())
+
     if enable_json:
         console_formatter = JSONFormatter()
     else:
         console_formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
-    
+
+    # Console handler
+    console_handler = logging.StreamHandler(sys.stdout)
+    console_handler.setLevel(level)
     console_handler.setFormatter(console_formatter)
-    root_logger.addHandler(console_handler)
-    
-    # File handler (if specified)
+    handlers = [console_handler]
+
+    # File handler (if specified), rotated by size or externally
     if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(getattr(logging, log_level.upper()))
+        if rotate:
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
+            )
+        else:
+            file_handler = logging.handlers.WatchedFileHandler(log_file, encoding="utf-8")
+        file_handler.setLevel(level)
         file_handler.setFormatter(JSONFormatter() if enable_json else console_formatter)
-        root_logger.addHandler(file_handler)
-    
+        handlers.append(file_handler)
+
+    # Configure root logger to hand records to the listener thread
+    root_logger = logging.getLogger()
+    root_logger.setLevel(level)
+    root_logger.handlers.clear()
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+    root_logger.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
     # Configure specific loggers
     logging.getLogger("uvicorn.access").setLevel(logging.INFO)
     logging.getLogger("uvicorn.error").setLevel(logging.INFO)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
-    
+
     logging.info("Logging configured successfully", extra={
         "log_level": log_level,
         "log_file": log_file,
-        "json_format": enable_json
+        "log_rotation": "size" if rotate else "external",
+        "json_format": enable_json,
+        "orjson": orjson is not None
     })
 
+atexit.register(stop_logging)
+
 # Application loggers
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance for a specific module."""
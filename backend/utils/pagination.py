@@ -0,0 +1,74 @@
+# utils/pagination.py
+import base64
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.error_handlers import ValidationError
+
+class InvalidCursor(ValidationError):
+    """Raised for cursors that were not issued by `encode_cursor` for the same sort (400)"""
+
+    def __init__(self, message: str):
+        super().__init__(message=message, details={"parameter": "cursor"})
+
+def encode_cursor(sort_column: str, sort_value: Any, row_id: int) -> str:
+    """Opaque cursor pointing just past the row with (sort_value, row_id)"""
+    payload = json.dumps([sort_column, sort_value, row_id], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str, sort_column: str) -> Tuple[Any, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        column, sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise InvalidCursor("Malformed pagination cursor")
+    if column != sort_column or not isinstance(row_id, int):
+        raise InvalidCursor("Pagination cursor does not match this listing's sort order")
+    return sort_value, row_id
+
+def _filter_value(value: Any) -> str:
+    # Quote values so commas, colons and parentheses (timestamps, titles) survive PostgREST's or= syntax
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    return '"' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+def keyset_page(
+    query: Any,
+    limit: int,
+    cursor: Optional[str] = None,
+    sort_column: str = "id",
+    descending: bool = False
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Fetch one page of `query` ordered by (sort_column, id).
+
+    Rather than skipping rows with OFFSET, the cursor's last-seen key is
+    turned into a range condition (a bound on the sort column plus the
+    tie-break on id), so with an index on (sort_column, id) every page is an
+    index range scan no matter how deep it is. One extra row is fetched to tell whether a next
+    page exists. Returns the rows and the next cursor (None on the last page).
+    """
+    comparison = "lt" if descending else "gt"
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor, sort_column)
+        if sort_column == "id":
+            query = query.filter("id", comparison, last_id)
+        else:
+            value = _filter_value(sort_value)
+            # The or_ alone gives the planner no range on (sort_column, id); this
+            # redundant bound lets it start the index scan at the cursor
+            query = query.filter(sort_column, "lte" if descending else "gte", sort_value)
+            query = query.or_(
+                f"{sort_column}.{comparison}.{value},"
+                f"and({sort_column}.eq.{value},id.{comparison}.{last_id})"
+            )
+
+    if sort_column != "id":
+        query = query.order(sort_column, desc=descending)
+    result = query.order("id", desc=descending).limit(limit + 1).execute()
+
+    rows = result.data or []
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(sort_column, last.get(sort_column), last["id"])
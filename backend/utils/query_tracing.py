@@ -0,0 +1,171 @@
+# utils/query_tracing.py
+import contextvars
+import logging
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from config import settings
+from monitoring.metrics import metrics
+from tracing.tracer import inject_trace_context, tracer
+
+logger = logging.getLogger("afropedia.database")
+
+# Builder methods that decide what kind of statement is sent
+OPERATIONS = {"select", "insert", "update", "upsert", "delete"}
+
+class RequestQueryTrace:
+    """Queries issued while serving one request"""
+
+    __slots__ = ("request_id", "queries", "shapes", "db_time")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.queries: List[dict] = []
+        self.shapes: Counter = Counter()
+        self.db_time = 0.0
+
+    def add(self, query: dict) -> None:
+        self.queries.append(query)
+        self.shapes[query["shape"]] += 1
+        self.db_time += query["duration_ms"]
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Query shapes sent more than `threshold` times: usually a query inside a loop"""
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+_current_trace: contextvars.ContextVar[Optional[RequestQueryTrace]] = contextvars.ContextVar(
+    "afropedia_query_trace", default=None
+)
+
+def start_request_trace(request_id: str) -> contextvars.Token:
+    """Collect queries for the current request (contextvars follow it into threads)"""
+    return _current_trace.set(RequestQueryTrace(request_id))
+
+def end_request_trace(token: contextvars.Token) -> None:
+    _current_trace.reset(token)
+
+def current_trace() -> Optional[RequestQueryTrace]:
+    return _current_trace.get()
+
+def finish_request_trace(route: str) -> Optional[RequestQueryTrace]:
+    """Record per-route query metrics for the current request and flag repeated query shapes"""
+    trace = _current_trace.get()
+    if trace is None:
+        return None
+
+    labels = {"endpoint": route}
+    metrics.record_histogram("db_queries_per_request", len(trace.queries), labels)
+    metrics.record_histogram("db_time_per_request_seconds", trace.db_time / 1000, labels)
+
+    for shape, count in trace.repeated_shapes(settings.query_repeat_warning_threshold):
+        metrics.increment_counter("db_repeated_query_warnings_total", labels={"endpoint": route})
+        logger.warning(
+            f"Possible N+1: {route} ran the same query {count} times",
+            extra={"request_id": trace.request_id, "endpoint": route, "query_shape": shape, "query_count": count}
+        )
+    return trace
+
+def _row_count(result: Any) -> int:
+    count = getattr(result, "count", None)
+    if count is not None:
+        return count
+    data = getattr(result, "data", None)
+    if isinstance(data, list):
+        return len(data)
+    return 0 if data is None else 1
+
+def _traced_execute(table: str, operation: str, shape: str, execute: Callable[[], Any],
+                    headers: Optional[Dict[str, str]] = None) -> Any:
+    with tracer.start_span(
+        f"{operation} {table}",
+        kind="client",
+        attributes={"db.system": "postgresql", "db.operation": operation, "db.sql.table": table, "db.query_shape": shape}
+    ) as span:
+        if headers is not None:
+            # PostgREST exposes these as request.headers, where outbox triggers pick them up
+            inject_trace_context(headers, span)
+        result = _timed_execute(table, operation, shape, execute)
+        span.set_attribute("db.rows", _row_count(result))
+        return result
+
+def _timed_execute(table: str, operation: str, shape: str, execute: Callable[[], Any]) -> Any:
+    started = time.perf_counter()
+    result = None
+    try:
+        result = execute()
+        return result
+    finally:
+        duration_ms = round((time.perf_counter() - started) * 1000, 2)
+        rows = _row_count(result) if result is not None else 0
+        metrics.record_histogram("db_query_duration_seconds", duration_ms / 1000, {"table": table, "operation": operation})
+        if result is None:
+            metrics.increment_counter("db_query_errors_total", labels={"table": table, "operation": operation})
+
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add({"table": table, "operation": operation, "shape": shape, "duration_ms": duration_ms, "rows": rows})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                f"Query {operation} {table}: {rows} rows in {duration_ms}ms",
+                extra={
+                    "request_id": trace.request_id if trace else None,
+                    "table": table,
+                    "operation": operation,
+                    "query_shape": shape,
+                    "duration_ms": duration_ms,
+                    "rows": rows,
+                }
+            )
+
+class TracedQuery:
+    """Wraps a postgrest request builder and times its `execute()`.
+
+    Every chained call (`.select()`, `.eq()`, `.order()`, ...) is forwarded
+    to the real builder and the result wrapped again, noting the method and
+    column but never the values. Two queries that differ only in their
+    values therefore share a shape, which is what N+1 detection counts.
+    """
+
+    __slots__ = ("_builder", "_table", "_operation", "_shape")
+
+    def __init__(self, builder: Any, table: str, operation: str, shape: Tuple[str, ...]):
+        self._builder = builder
+        self._table = table
+        self._operation = operation
+        self._shape = shape
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self._builder, name)
+        if hasattr(attribute, "execute"):
+            # Properties such as `.not_` return a builder directly
+            return TracedQuery(attribute, self._table, self._operation, self._shape + (name,))
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            result = attribute(*args, **kwargs)
+            if not hasattr(result, "execute"):
+                return result
+            operation = name if name in OPERATIONS else self._operation
+            if name in ("insert", "update", "upsert") or not args or not isinstance(args[0], str):
+                part = name
+            else:
+                part = f"{name}({args[0]})"
+            return TracedQuery(result, self._table, operation, self._shape + (part,))
+
+        return call
+
+    def execute(self) -> Any:
+        shape = f"{self._table}: " + ".".join(self._shape)
+        return _traced_execute(
+            self._table, self._operation, shape, self._builder.execute, getattr(self._builder, "headers", None)
+        )
+
+def traced_table(client: Any, name: str) -> Any:
+    builder = client.table(name)
+    return TracedQuery(builder, name, "select", ()) if settings.query_tracing_enabled else builder
+
+def traced_rpc(client: Any, function: str, params: Optional[dict] = None, **kwargs) -> Any:
+    builder = client.rpc(function, params or {}, **kwargs)
+    return TracedQuery(builder, function, "rpc", ("rpc",)) if settings.query_tracing_enabled else builder
@@ -1,85 +1,148 @@
 # utils/reference_parser.py
 import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import List, Dict, Tuple, Optional
 from datetime import datetime
 
-def parse_references_from_markdown(content: str) -> List[Dict]:
+from config import settings
+
+# One alternation for every supported markup, so content is scanned once:
+#   [^1] footnote style, {{ref|1}} template style, [1] or [1][2] bracket runs
+REFERENCE_TOKEN = re.compile(r'\[\^(?P<footnote>\d+)\]|\{\{ref\|(?P<template>\d+)\}\}|(?P<bracket>(?:\[\d+\])+)')
+
+# Characters of surrounding text kept as a reference's context on each side
+CONTEXT_CHARS = 50
+
+@dataclass
+class ParsedReferences:
+    """Result of one scan of a revision's content"""
+    references: List[Dict]
+    spans: List[Tuple[int, int]]  # Markup to strip, in order and non-overlapping
+    content: str
+    _clean: Optional[str] = field(default=None, repr=False)
+
+    @property
+    def numbers(self) -> List[int]:
+        return [ref['reference_number'] for ref in self.references]
+
+    @property
+    def clean_content(self) -> str:
+        """Content with the markup removed, built from the recorded spans"""
+        if self._clean is None:
+            parts = []
+            last = 0
+            for start, end in self.spans:
+                parts.append(self.content[last:start])
+                last = end
+            parts.append(self.content[last:])
+            self._clean = "".join(parts)
+        return self._clean
+
+def scan_references(content: str) -> ParsedReferences:
     """
-    Parse Wikipedia-style references from markdown content.
-    
-    Supports formats like:
-    - [1] or [1][2] (multiple references)
-    - [^1] (footnote style)
-    - {{ref|1}} (template style)
+    Extract bracket, footnote and template references in a single pass.
     
-    Returns a list of reference dictionaries with:
-    - reference_number: The number in the text
-    - context: The surrounding text
-    - position: Character position in content
+    References come out in position order; every number of a [1][2] run
+    shares the run's position and context.
     """
     references = []
+    spans = []
+    length = len(content)
     
-    # Pattern 1: [1] or [1][2] format
-    pattern1 = r'\[(\d+)\](?:\[(\d+)\])*'
-    for match in re.finditer(pattern1, content):
-        ref_numbers = [match.group(1)]
-        if match.group(2):
-            ref_numbers.extend(match.group(2).split(']['))
+    for match in REFERENCE_TOKEN.finditer(content):
+        start, end = match.span()
+        spans.append((start, end))
+        context = content[max(0, start - CONTEXT_CHARS):min(length, end + CONTEXT_CHARS)].strip()
         
-        for ref_num in ref_numbers:
-            # Get context around the reference (50 chars before and after)
-            start = max(0, match.start() - 50)
-            end = min(len(content), match.end() + 50)
-            context = content[start:end]
-            
+        kind = match.lastgroup
+        if kind == 'bracket':
+            numbers = match.group('bracket')[1:-1].split('][')
+        else:
+            numbers = [match.group(kind)]
+        
+        for ref_num in numbers:
             references.append({
                 'reference_number': int(ref_num),
-                'context': context.strip(),
-                'position': match.start(),
-                'type': 'bracket'
+                'context': context,
+                'position': start,
+                'type': kind
             })
     
-    # Pattern 2: [^1] footnote style
-    pattern2 = r'\[\^(\d+)\]'
-    for match in re.finditer(pattern2, content):
-        ref_num = match.group(1)
-        start = max(0, match.start() - 50)
-        end = min(len(content), match.end() + 50)
-        context = content[start:end]
-        
-        references.append({
-            'reference_number': int(ref_num),
-            'context': context.strip(),
-            'position': match.start(),
-            'type': 'footnote'
-        })
-    
-    # Pattern 3: {{ref|1}} template style
-    pattern3 = r'\{\{ref\|(\d+)\}\}'
-    for match in re.finditer(pattern3, content):
-        ref_num = match.group(1)
-        start = max(0, match.start() - 50)
-        end = min(len(content), match.end() + 50)
-        context = content[start:end]
+    return ParsedReferences(references=references, spans=spans, content=content)
+
+class RevisionReferenceCache:
+    """Size-bounded LRU of parsed revisions.
+
+    Revisions are never edited in place, so an entry stays valid for as
+    long as it is cached; saving an article creates a new revision ID.
+    """
+
+    def __init__(self, max_size: int = 512):
+        self.max_size = max_size
+        self._entries: "OrderedDict[int, ParsedReferences]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, revision_id: int, content: str) -> ParsedReferences:
+        with self._lock:
+            parsed = self._entries.get(revision_id)
+            # The content check guards against a caller pairing an ID with other text
+            if parsed is not None and (parsed.content is content or parsed.content == content):
+                self._entries.move_to_end(revision_id)
+                self.hits += 1
+                return parsed
+            self.misses += 1
         
-        references.append({
-            'reference_number': int(ref_num),
-            'context': context.strip(),
-            'position': match.start(),
-            'type': 'template'
-        })
+        parsed = scan_references(content)
+        with self._lock:
+            self._entries[revision_id] = parsed
+            self._entries.move_to_end(revision_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return parsed
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+revision_references = RevisionReferenceCache(settings.reference_cache_size)
+
+def parse_content(content: str, revision_id: Optional[int] = None) -> ParsedReferences:
+    """Scan content, reusing the cached result when it belongs to a known revision"""
+    if revision_id is None:
+        return scan_references(content)
+    return revision_references.get(revision_id, content)
+
+def parse_references_from_markdown(content: str, revision_id: Optional[int] = None) -> List[Dict]:
+    """
+    Parse Wikipedia-style references from markdown content.
+    
+    Supports formats like:
+    - [1] or [1][2] (multiple references)
+    - [^1] (footnote style)
+    - {{ref|1}} (template style)
     
-    # Sort by position in content
-    references.sort(key=lambda x: x['position'])
+    Returns a list of reference dictionaries with:
+    - reference_number: The number in the text
+    - context: The surrounding text
+    - position: Character position in content
     
-    return references
+    Pass the revision ID the content belongs to so repeated calls reuse one scan.
+    """
+    return parse_content(content, revision_id).references
 
-def extract_reference_numbers(content: str) -> List[int]:
+def extract_reference_numbers(content: str, revision_id: Optional[int] = None) -> List[int]:
     """Extract all reference numbers from content"""
-    references = parse_references_from_markdown(content)
-    return [ref['reference_number'] for ref in references]
+    return parse_content(content, revision_id).numbers
 
-def validate_references(content: str, existing_references: List[Dict]) -> Dict:
+def validate_references(content: str, existing_references: List[Dict], revision_id: Optional[int] = None) -> Dict:
     """
     Validate that all references in content have corresponding source entries.
     
@@ -89,11 +152,11 @@ def validate_references(content: str, existing_references: List[Dict]) -> Dict:
     - extra_refs: List[int] - source numbers that aren't referenced
     - errors: List[str] - validation error messages
     """
-    content_refs = set(extract_reference_numbers(content))
+    content_refs = set(extract_reference_numbers(content, revision_id))
     existing_refs = set(ref.get('reference_number', 0) for ref in existing_references)
     
-    missing_refs = list(content_refs - existing_refs)
-    extra_refs = list(existing_refs - content_refs)
+    missing_refs = sorted(content_refs - existing_refs)
+    extra_refs = sorted(existing_refs - content_refs)
     
     errors = []
     if missing_refs:
@@ -181,17 +244,8 @@ def generate_references_section(references: List[Dict]) -> str:
     
     return section
 
-def clean_reference_markup(content: str) -> str:
+def clean_reference_markup(content: str, revision_id: Optional[int] = None) -> str:
     """
     Remove reference markup from content for clean display.
     """
-    # Remove [1] style references
-    content = re.sub(r'\[\d+\](?:\[\d+\])*', '', content)
-    
-    # Remove [^1] footnote references
-    content = re.sub(r'\[\^\d+\]', '', content)
-    
-    # Remove {{ref|1}} template references
-    content = re.sub(r'\{\{ref\|\d+\}\}', '', content)
-    
-    return content
+    return parse_content(content, revision_id).clean_content